@@ -0,0 +1,186 @@
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from queue import SimpleQueue
+from threading import Event, Thread
+from time import perf_counter
+from urllib.parse import parse_qs
+
+import orjson
+
+DEFAULT_LOG_BATCH_SIZE = 100
+DEFAULT_LOG_FLUSH_INTERVAL = 1.0
+LOG_FORMAT = "%(asctime)s %(message)s"
+LOG_DATE_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+logger = logging.getLogger(__name__)
+
+
+class AccessRecord:
+    """Per-request counters filled in while the request is being handled."""
+
+    def __init__(self):
+        self.database_time = 0.0
+        self.rows = 0
+        self.serialization_time = 0.0
+
+
+access_record: ContextVar[AccessRecord | None] = ContextVar("access_record", default=None)
+
+
+@contextmanager
+def track_time(counter: str, timer: Callable[[], float]=perf_counter) -> Iterator[None]:
+    # The record is shared by reference, so time spent in copied contexts (threads, streaming tasks) is counted too
+    record = access_record.get()
+    started_at = timer()
+    try:
+        yield
+    finally:
+        if record is not None:
+            setattr(record, counter, getattr(record, counter) + timer() - started_at)
+
+
+def track_database_time() -> AbstractContextManager[None]:
+    return track_time("database_time")
+
+
+def track_serialization_time() -> AbstractContextManager[None]:
+    return track_time("serialization_time")
+
+
+def count_rows(count: int):
+    record = access_record.get()
+    if record is not None:
+        record.rows += count
+
+
+class BatchingHandler(MemoryHandler):
+    """
+    Buffers records and writes them to `target` in batches.
+
+    The buffer is flushed when `capacity` records are collected and every
+    `flush_interval` seconds from a background thread.
+    """
+
+    def __init__(self, target: logging.Handler, capacity: int=DEFAULT_LOG_BATCH_SIZE,
+                 flush_interval: float=DEFAULT_LOG_FLUSH_INTERVAL):
+        if capacity < 1:
+            raise ValueError("Log batch size must be positive.")
+        if flush_interval <= 0:
+            raise ValueError("Log flush interval must be positive.")
+
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self.__flush_interval = flush_interval
+        self.__stopped = Event()
+        self.__flusher = Thread(target=self.__flush_periodically, name="log-flusher", daemon=True)
+        self.__flusher.start()
+
+    def __flush_periodically(self):
+        while not self.__stopped.wait(self.__flush_interval):
+            self.flush()
+
+    def close(self):
+        self.__stopped.set()
+        self.__flusher.join()
+        super().close()
+
+
+def start_logging(log_file_path: str, batch_size: int=DEFAULT_LOG_BATCH_SIZE,
+                  flush_interval: float=DEFAULT_LOG_FLUSH_INTERVAL) -> QueueListener:
+    """
+    Route the root logger through a queue, so the event loop never writes to the log file itself.
+    """
+    file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    batching_handler = BatchingHandler(file_handler, capacity=batch_size, flush_interval=flush_interval)
+
+    log_queue = SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # The queue side only merges the message arguments, timestamps are added by the file handler
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, batching_handler)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: QueueListener):
+    """
+    Detach the queue from the root logger, so a later `start_logging` does not write into it,
+    and write the remaining records out.
+    """
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            root_logger.removeHandler(handler)
+            handler.close()
+
+    listener.stop()
+    for handler in listener.handlers:
+        # Closing a MemoryHandler flushes it and then drops its target
+        target = handler.target if isinstance(handler, MemoryHandler) else None
+        handler.close()
+        if target is not None:
+            target.close()
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware writing one JSON access record per HTTP request and
+    adding its timings to `metrics`.
+
+    Latency is measured until the last body chunk is sent, so streamed
+    exports include the time spent producing their batches.
+    """
+
+    def __init__(self, app, metrics=None, timer: Callable[[], float]=perf_counter):
+        self.app = app
+        self.__metrics = metrics
+        self.__timer = timer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        record = AccessRecord()
+        token = access_record.set(record)
+        response_status = None
+
+        async def send_with_status(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        started_at = self.__timer()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            latency = self.__timer() - started_at
+            access_record.reset(token)
+            if self.__metrics is not None:
+                self.__metrics.observe(scope, response_status, latency, record)
+            if logger.isEnabledFor(logging.INFO):
+                self.__log(scope, response_status, latency, record)
+
+    @staticmethod
+    def __log(scope, response_status: int | None, latency: float, record: AccessRecord):
+        client = scope.get("client")
+        logger.info(orjson.dumps({
+            "client": client[0] if client is not None else None,
+            "method": scope["method"],
+            "path": scope["path"],
+            "params": parse_qs(scope["query_string"].decode("latin-1")),
+            # No response was started if the application raised
+            "status": response_status if response_status is not None else 500,
+            "latency_ms": round(latency * 1000, 3),
+            "db_time_ms": round(record.database_time * 1000, 3),
+            "rows": record.rows,
+            "serialization_ms": round(record.serialization_time * 1000, 3),
+        }).decode())
@@ -1,14 +1,60 @@
+import logging
+from asyncio import get_running_loop
+from bisect import bisect_right
+from collections.abc import AsyncIterator, Callable, Collection
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 from enum import StrEnum
+from functools import lru_cache
+from itertools import count
 from os import getenv
+from pathlib import Path
 from tempfile import TemporaryDirectory
+from time import monotonic
+from uuid import uuid4
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import and_, create_engine, func, select
+from sqlalchemy import (
+    Float,
+    Integer,
+    MetaData,
+    and_,
+    bindparam,
+    case,
+    cast,
+    create_engine,
+    delete,
+    event,
+    false,
+    func,
+    insert,
+    inspect,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateSchema, DropSchema
 
-from .DataBaseModels import Base, Districts, Regions, Statistics
+from .AccessLog import count_rows, track_database_time
+from .DataBaseModels import (
+    Base,
+    DatasetInfo,
+    DistrictRollups,
+    Districts,
+    FeatureSummaries,
+    FeatureValues,
+    Regions,
+    Statistics,
+    YearRollups,
+)
+from .PoolMetrics import PoolMetrics
 
 MIN_YEAR = 2014
 MAX_YEAR = 2026
@@ -16,6 +62,38 @@ BORDER_YEAR = 2024
 
 MIN_ID = 1
 MIN_FILTER_VALUE = 0
+MAX_BATCH_IDS = 100
+
+DEFAULT_THREAD_POOL_SIZE = 4
+DEFAULT_STREAM_BATCH_SIZE = 1000
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_RECYCLE = -1
+DEFAULT_STATEMENT_CACHE_SIZE = 100
+QUERY_CACHE_SIZE = 256
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+
+# Placeholder schema of the source tables in DataBase.copy_from
+SOURCE_SCHEMA = "source"
+
+# Shared by all databases of the process, so a database switched in never repeats the generation of the previous one
+GENERATIONS = count(1)
+
+# Seconds the dataset version stamp is kept, another process may load data into the same database meanwhile
+DATASET_INFO_TTL = 1.0
+
+# Indexes replaced by newer ones, dropped by migrate
+OBSOLETE_INDEXES = ("ix_statistics_year_region_id",)
+UNIQUE_STATISTICS_INDEX = "uq_statistics_year_region_id"
+
+# Quantiles as (numerator, denominator), the lower of the two nearest values is taken
+QUANTILES = {
+    "lower_quartile": (1, 4),
+    "median": (1, 2),
+    "upper_quartile": (3, 4),
+}
+
+logger = logging.getLogger(__name__)
 
 
 class AggregationType(StrEnum):
@@ -44,45 +122,508 @@ class AreaType(StrEnum):
     DISTRICT = "district"
 
 
+class LoadMode(StrEnum):
+
+    ORM = "orm"
+    BULK = "bulk"
+
+
+CSV_COLUMNS = {
+    "Округ": "district_name",
+    "Регион": "region_name",
+    "Год": "year",
+    "Инвестиции": ColumnName.INVESTMENTS.value,
+    "ВРП": ColumnName.GRP.value,
+    "Население": ColumnName.POPULATION.value,
+    "Безработица": ColumnName.UNEMPLOYMENT.value,
+    "Средняя_ЗП": ColumnName.AVERAGE_SALARY.value,
+    "Преступления": ColumnName.CRIMES.value,
+    "Оборот_розницы": ColumnName.RETAIL_TURNOVER.value,
+    "Денежные_доходы": ColumnName.CASH_EXPENSES.value,
+    "Научные_исследования": ColumnName.SCIENTIFIC_RESEARCH.value
+}
+STATISTICS_COLUMNS = ["district_id", "region_id", "year", *(col.value for col in ColumnName)]
+STATISTICS_KEY = ["region_id", "year"]
+INTEGER_COLUMNS = ["district_id", "region_id", "year", ColumnName.POPULATION.value]
+
+
 class DataBase:
     __SYNC_PATH_BASE = "sqlite:///"
     __ASYNC_PATH_BASE = "postgresql+asyncpg://"
 
-    def __init__(self, is_sync: bool=True, detail: bool=False):
+    def __init__(self, is_sync: bool=True, detail: bool=False, thread_pool_size: int=DEFAULT_THREAD_POOL_SIZE,
+                 read_only: bool=False, snapshot_path: str | None=None, schema: str | None=None):
+        """
+        Args:
+            is_sync (bool): Use a temporary SQLite file instead of PostgreSQL
+            detail (bool): Echo database queries
+            thread_pool_size (int): Number of worker threads running sync queries;
+                0 runs them directly on the event loop
+            read_only (bool): Open PostgreSQL sessions as read-only, for workers serving a prepared database;
+                a SQLite snapshot is opened immutable and memory-mapped
+            snapshot_path (str | None): SQLite snapshot file used instead of a temporary one
+            schema (str | None): PostgreSQL schema of the tables instead of the default one, e.g. for staging a load
+        """
         self.__is_sync = is_sync
+        self.__schema = schema
+        self.__executor = None
+        self.__generation = next(GENERATIONS)
+        self.__dataset_info = None
+        self.__temp_db_dir = None
         if self.__is_sync:
-            self.__temp_db_dir = TemporaryDirectory()
-            self.__engine = create_engine(
-                DataBase.__SYNC_PATH_BASE + self.__temp_db_dir.name + "/temp.db",
-                echo=detail
-            )
+            if thread_pool_size < 0:
+                raise ValueError("Thread pool size must not be negative.")
+            if schema is not None:
+                raise ValueError("Schemas are only supported by PostgreSQL.")
+
+            if snapshot_path is None:
+                if read_only:
+                    raise ValueError("A temporary SQLite database can not be opened read-only.")
+                self.__temp_db_dir = TemporaryDirectory()
+                url = DataBase.__SYNC_PATH_BASE + self.__temp_db_dir.name + "/temp.db"
+            elif read_only:
+                snapshot = Path(snapshot_path).resolve()
+                if not snapshot.is_file():
+                    raise ValueError(f"Snapshot {snapshot_path} does not exist, build it from a data file first.")
+                # The file is never written while it is served, so SQLite can skip locking and change detection
+                url = DataBase.__SYNC_PATH_BASE + snapshot.as_uri() + "?mode=ro&immutable=1&uri=true"
+            else:
+                url = DataBase.__SYNC_PATH_BASE + snapshot_path
+
+            # Every worker thread reads through its own pooled connection
+            self.__engine = create_engine(url, echo=detail, pool_size=max(thread_pool_size, 1))
+            if snapshot_path is not None and read_only:
+                event.listen(self.__engine, "connect", DataBase.__configure_snapshot_connection)
             self.__session = sessionmaker(self.__engine)
+            if thread_pool_size > 0:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=thread_pool_size,
+                    thread_name_prefix="sqlite"
+                )
         else:
             user = getenv("POSTGRES_USER", "<Postgres user>")
             password = getenv("POSTGRES_PASSWORD", "<Postgres user password>")
             host = getenv("POSTGRES_HOST", "<Postgres host>")
             port = getenv("POSTGRES_PORT", "<Postgres port>")
             db = getenv("POSTGRES_DB", "<Postgres db>")
+            statement_cache_size = int(getenv("POSTGRES_STATEMENT_CACHE_SIZE", DEFAULT_STATEMENT_CACHE_SIZE))
             self.__engine = create_async_engine(
-                DataBase.__ASYNC_PATH_BASE + f"{user}:{password}@{host}:{port}/{db}",
-                echo=detail
+                DataBase.__ASYNC_PATH_BASE + f"{user}:{password}@{host}:{port}/{db}"
+                f"?prepared_statement_cache_size={statement_cache_size}",
+                echo=detail,
+                pool_size=int(getenv("POSTGRES_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                max_overflow=int(getenv("POSTGRES_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)),
+                pool_recycle=int(getenv("POSTGRES_POOL_RECYCLE", DEFAULT_POOL_RECYCLE)),
+                pool_pre_ping=getenv("POSTGRES_POOL_PRE_PING", "false").lower() in ("1", "true", "yes"),
+                connect_args={"server_settings": {"default_transaction_read_only": "on"}} if read_only else {}
             )
+            if schema is not None:
+                self.__engine = self.__engine.execution_options(schema_translate_map={None: schema})
             self.__session = async_sessionmaker(self.__engine)
 
+        self.__pool_metrics = PoolMetrics(self.__engine if self.__is_sync else self.__engine.sync_engine)
+
+    @staticmethod
+    def __configure_snapshot_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA mmap_size = {DEFAULT_MMAP_SIZE}")
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    @property
+    def pool_metrics(self) -> PoolMetrics:
+        return self.__pool_metrics
+
+    @property
+    def schema(self) -> str | None:
+        return self.__schema
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter increased every time the stored data changes, by another process
+        as soon as get_dataset_info notices it.
+        """
+        return self.__generation
+
+    async def get_dataset_info(self) -> dict[str, str | datetime] | None:
+        """
+        Version stamp written with every data load. It is kept until this process changes the data,
+        and for at most DATASET_INFO_TTL seconds, so most requests check it without a query
+        and loads by other processes are seen right after: they change the generation too.
+        """
+        generation = self.__generation
+        read_at = monotonic()
+        if self.__dataset_info is not None:
+            cached_generation, cached_at, dataset_info = self.__dataset_info
+            if cached_generation == generation and read_at - cached_at < DATASET_INFO_TTL:
+                return dataset_info
+
+        query = select(DatasetInfo.version, DatasetInfo.updated_at)
+        try:
+            result = await self.__exec_query(query)
+            dataset_info = dict(result.mappings().one())
+        except Exception:
+            # Empty database or a schema from before the table was added (see migrate)
+            dataset_info = None
+        else:
+            if dataset_info["updated_at"].tzinfo is None:
+                # SQLite does not keep the time zone, the stamp is always written in UTC
+                dataset_info["updated_at"] = dataset_info["updated_at"].replace(tzinfo=UTC)
+
+        previous = self.__dataset_info
+        if previous is not None and previous[0] == generation and previous[2] != dataset_info:
+            # Another process changed the data, responses built from the previous data are outdated
+            generation = self.__generation = next(GENERATIONS)
+        self.__dataset_info = (generation, read_at, dataset_info)
+        return dataset_info
+
     async def reset(self):
         if self.__is_sync:
             Base.metadata.drop_all(self.__engine)
             Base.metadata.create_all(self.__engine)
         else:
             async with self.__engine.begin() as conn:
+                if self.__schema is not None:
+                    await conn.execute(CreateSchema(self.__schema, if_not_exists=True))
                 await conn.run_sync(Base.metadata.drop_all)
                 await conn.run_sync(Base.metadata.create_all)
 
+        self.__generation = next(GENERATIONS)
+
+    async def create_tables(self):
+        """Create the tables that do not exist yet, existing tables and their data are kept"""
+        if self.__is_sync:
+            Base.metadata.create_all(self.__engine, checkfirst=True)
+        else:
+            async with self.__engine.begin() as conn:
+                if self.__schema is not None:
+                    await conn.execute(CreateSchema(self.__schema, if_not_exists=True))
+                await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+
+    async def get_missing_tables(self) -> list[str]:
+        """Tables not created yet, e.g. derived tables added after the database was created"""
+        def get_missing(conn) -> list[str]:
+            inspector = inspect(conn)
+            return [
+                table.name for table in Base.metadata.sorted_tables
+                if not inspector.has_table(table.name, schema=self.__schema)
+            ]
+
+        if self.__is_sync:
+            with self.__engine.connect() as conn:
+                return get_missing(conn)
+        async with self.__engine.connect() as conn:
+            return await conn.run_sync(get_missing)
+
+    async def drop(self):
+        """Drop all tables, along with the schema if there is one"""
+        if self.__is_sync:
+            Base.metadata.drop_all(self.__engine)
+        else:
+            async with self.__engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                if self.__schema is not None:
+                    await conn.execute(DropSchema(self.__schema, if_exists=True))
+
+        self.__generation = next(GENERATIONS)
+
+    async def copy_from(self, source: "DataBase"):
+        """
+        Replace all data with the data of another PostgreSQL schema of the same database.
+        It is done in one transaction, so readers are served the previous data until it commits.
+        """
+        if self.__is_sync or source.__is_sync:
+            raise ValueError("Data can only be copied between PostgreSQL schemas.")
+
+        def copy(conn):
+            conn.execution_options(schema_translate_map={None: self.__schema, SOURCE_SCHEMA: source.__schema})
+            source_metadata = MetaData()
+            for model_table in reversed(Base.metadata.sorted_tables):
+                conn.execute(delete(model_table))
+            for model_table in Base.metadata.sorted_tables:
+                source_table = model_table.to_metadata(source_metadata, schema=SOURCE_SCHEMA)
+                conn.execute(insert(model_table).from_select(model_table.columns.keys(), select(source_table)))
+
+                # Copied ids are not drawn from the sequences, they continue after the largest one
+                id_column = model_table.autoincrement_column
+                if id_column is not None:
+                    table_name = model_table.name if self.__schema is None else f"{self.__schema}.{model_table.name}"
+                    sequence = func.pg_get_serial_sequence(table_name, id_column.name)
+                    conn.execute(select(func.setval(sequence, func.coalesce(func.max(id_column), 0) + 1, false())))
+
+        async with self.__engine.begin() as conn:
+            await conn.run_sync(copy)
+
+        self.__generation = next(GENERATIONS)
+
+    async def migrate(self, merge_duplicates: bool=False):
+        """
+        Bring an existing database up to the current schema: create missing tables and missing
+        indexes of existing tables, then rebuild derived tables. Stored statistics are kept,
+        safe to run repeatedly and against a database that is serving requests.
+
+        Args:
+            merge_duplicates (bool): Databases loaded before statistics had a unique region and year may
+                repeat them; delete all but the latest row of each, like an upsert does, instead of failing
+        """
+        def create_missing(conn):
+            Base.metadata.create_all(conn, checkfirst=True)
+            statistics_indexes = inspect(conn).get_indexes(Statistics.__tablename__, schema=self.__schema)
+            if UNIQUE_STATISTICS_INDEX not in {index["name"] for index in statistics_indexes}:
+                DataBase.__merge_duplicate_statistics(conn, merge_duplicates)
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+            for index_name in OBSOLETE_INDEXES:
+                if self.__schema is not None:
+                    index_name = f"{self.__schema}.{index_name}"
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+
+        if self.__is_sync:
+            with self.__engine.begin() as conn:
+                create_missing(conn)
+        else:
+            async with self.__engine.begin() as conn:
+                await conn.run_sync(create_missing)
+
+        await self.refresh_derived_data()
+
+    @staticmethod
+    def __merge_duplicate_statistics(conn, merge_duplicates: bool):
+        latest_ids = select(func.max(Statistics.id)).group_by(*(getattr(Statistics, key) for key in STATISTICS_KEY))
+        is_repeated = Statistics.id.not_in(latest_ids)
+        repeated = conn.execute(select(func.count()).select_from(Statistics).where(is_repeated)).scalar_one()
+        if repeated == 0:
+            return
+        if not merge_duplicates:
+            raise ValueError(
+                f"{repeated} statistics rows repeat a region and year, so the unique index can not be created. "
+                "Migrate with merge_duplicates (--merge-duplicates) to keep only the latest row of each, "
+                "or reset the database and load it again."
+            )
+
+        conn.execute(delete(Statistics).where(is_repeated))
+        logger.warning(f"Deleted {repeated} repeated statistics rows, kept the latest one of every region and year")
+
+    @staticmethod
+    def __get_rollup_queries(years: Collection[int] | None=None):
+        feature_names = [col.value for col in ColumnName]
+        condition = true() if years is None else Statistics.year.in_(years)
+        queries = []
+        for aggregation_type in AggregationType:
+            aggr_columns = [
+                DataBase.__aggregate_feature(getattr(Statistics, col_name), aggregation_type)
+                for col_name in feature_names
+            ]
+            district_query = (
+                select(Statistics.district_id, Statistics.year, literal(aggregation_type.value), *aggr_columns)
+                .filter(condition)
+                .group_by(Statistics.district_id, Statistics.year)
+            )
+            year_query = (
+                select(literal(aggregation_type.value), Statistics.year, *aggr_columns)
+                .filter(condition)
+                .group_by(Statistics.year)
+            )
+            queries.append(
+                insert(DistrictRollups)
+                .from_select(["district_id", "year", "aggregation_type", *feature_names], district_query)
+            )
+            queries.append(
+                insert(YearRollups)
+                .from_select(["aggregation_type", "year", *feature_names], year_query)
+            )
+        return queries
+
+    @staticmethod
+    def __get_feature_source(feature: str, area_type: AreaType, aggregation_type: AggregationType | None):
+        if area_type is AreaType.REGION:
+            return Statistics.region_id, Statistics.year, cast(getattr(Statistics, feature), Float), true()
+
+        return (
+            DistrictRollups.district_id,
+            DistrictRollups.year,
+            getattr(DistrictRollups, feature),
+            DistrictRollups.aggregation_type == aggregation_type.value
+        )
+
+    @staticmethod
+    def __get_feature_values_query(feature: str, area_type: AreaType, aggregation_type: AggregationType | None,
+                                   years: Collection[int] | None=None):
+        area_id, year, value, condition = DataBase.__get_feature_source(feature, area_type, aggregation_type)
+
+        prev_value = func.lag(value).over(partition_by=area_id, order_by=year)
+        query = (
+            select(
+                literal(feature),
+                literal(area_type.value),
+                null() if aggregation_type is None else literal(aggregation_type.value),
+                area_id,
+                year.label("year"),
+                value,
+                ((value / func.nullif(prev_value, 0)) - 1) * 100
+            )
+            .filter(condition)
+        )
+        if years is not None:
+            # The previous years still feed the window, only its output is limited
+            values = query.subquery()
+            query = select(*values.c).filter(values.c.year.in_(years))
+
+        return insert(FeatureValues).from_select(
+            ["feature", "area_type", "aggregation_type", "area_id", "year", "feature_value", "feature_ratio"],
+            query
+        )
+
+    @staticmethod
+    def __get_feature_summaries_query(feature: str, area_type: AreaType, aggregation_type: AggregationType | None,
+                                      years: Collection[int] | None=None):
+        _, year, value, condition = DataBase.__get_feature_source(feature, area_type, aggregation_type)
+        if years is not None:
+            condition = and_(condition, year.in_(years))
+        totals = (
+            select(
+                year.label("year"),
+                func.count().label("rows_count"),
+                func.count(value).label("values_count"),
+                func.min(value).label("min_value"),
+                func.max(value).label("max_value")
+            )
+            .filter(condition)
+            .group_by(year)
+            .subquery()
+        )
+        ranked = (
+            select(
+                year.label("year"),
+                value.label("feature_value"),
+                func.row_number().over(partition_by=year, order_by=value.asc().nulls_last()).label("position")
+            )
+            .filter(condition)
+            .subquery()
+        )
+
+        # Integer division keeps the quantile positions identical on SQLite and PostgreSQL
+        positions = {
+            quantile: numerator * (totals.c.values_count - 1) // denominator + 1
+            for quantile, (numerator, denominator) in QUANTILES.items()
+        }
+        quantiles = (
+            select(
+                ranked.c.year,
+                *[
+                    func.min(case((ranked.c.position == position, ranked.c.feature_value))).label(quantile)
+                    for quantile, position in positions.items()
+                ]
+            )
+            .join(totals, totals.c.year == ranked.c.year)
+            .filter(ranked.c.feature_value.is_not(None), or_(*(ranked.c.position == p for p in positions.values())))
+            .group_by(ranked.c.year)
+            .subquery()
+        )
+        query = (
+            select(
+                literal(feature),
+                literal(area_type.value),
+                null() if aggregation_type is None else literal(aggregation_type.value),
+                totals.c.year,
+                totals.c.values_count,
+                totals.c.rows_count - totals.c.values_count,
+                totals.c.min_value,
+                totals.c.max_value,
+                *[getattr(quantiles.c, quantile) for quantile in QUANTILES]
+            )
+            .outerjoin(quantiles, quantiles.c.year == totals.c.year)
+        )
+
+        return insert(FeatureSummaries).from_select(
+            [
+                "feature", "area_type", "aggregation_type", "year", "values_count", "null_count",
+                "min_value", "max_value", *QUANTILES.keys()
+            ],
+            query
+        )
+
+    @staticmethod
+    def __get_ratio_years(conn, years: Collection[int]) -> set[int]:
+        """Years whose ratios depend on the given ones: themselves and the next stored year of each"""
+        all_years = list(conn.execute(select(Statistics.year).distinct().order_by(Statistics.year)).scalars())
+        ratio_years = set(years)
+        for year in years:
+            index = bisect_right(all_years, year)
+            if index < len(all_years):
+                ratio_years.add(all_years[index])
+        return ratio_years
+
+    @staticmethod
+    def __refresh_derived_data(conn, years: Collection[int] | None=None):
+        def delete_years(model, years: Collection[int] | None):
+            query = delete(model)
+            conn.execute(query if years is None else query.where(model.year.in_(years)))
+
+        delete_years(DistrictRollups, years)
+        delete_years(YearRollups, years)
+        for query in DataBase.__get_rollup_queries(years):
+            conn.execute(query)
+
+        conn.execute(delete(DatasetInfo))
+        conn.execute(insert(DatasetInfo).values(version=uuid4().hex, updated_at=datetime.now(UTC)))
+
+        # Year-over-year ratios are computed once here instead of a LAG window on every request
+        ratio_years = None if years is None else DataBase.__get_ratio_years(conn, years)
+        delete_years(FeatureValues, ratio_years)
+        delete_years(FeatureSummaries, years)
+        for col in ColumnName:
+            sources = [(AreaType.REGION, None), *((AreaType.DISTRICT, aggregation) for aggregation in AggregationType)]
+            for area_type, aggregation_type in sources:
+                conn.execute(DataBase.__get_feature_values_query(col.value, area_type, aggregation_type, ratio_years))
+                conn.execute(DataBase.__get_feature_summaries_query(col.value, area_type, aggregation_type, years))
+
+    async def refresh_derived_data(self, years: Collection[int] | None=None):
+        """
+        Rebuild tables precomputed from statistics; called after every data load.
+
+        Args:
+            years (Collection[int] | None): Only rebuild these years, after an upsert touched them
+        """
+        if self.__is_sync:
+            with self.__engine.begin() as conn:
+                DataBase.__refresh_derived_data(conn, years)
+        else:
+            async with self.__engine.begin() as conn:
+                await conn.run_sync(DataBase.__refresh_derived_data, years)
+
+        self.__generation = next(GENERATIONS)
+
+    async def optimize(self):
+        """
+        Collect planner statistics and compact the file; run once after a load,
+        before the database is served read-only as a snapshot.
+        """
+        if self.__is_sync:
+            # VACUUM can not run inside a transaction
+            with self.__engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.exec_driver_sql("ANALYZE")
+                conn.exec_driver_sql("VACUUM")
+        else:
+            async with self.__engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.exec_driver_sql("VACUUM ANALYZE")
+
+    async def dispose(self):
+        """Close pooled connections; PostgreSQL connections can only be closed on the event loop, before close"""
+        if not self.__is_sync:
+            await self.__engine.dispose()
+
     def close(self):
-        self.__engine.dispose()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
 
         if self.__is_sync:
-            self.__temp_db_dir.cleanup()
+            self.__engine.dispose()
+            if self.__temp_db_dir is not None:
+                self.__temp_db_dir.cleanup()
 
     @staticmethod
     def __aggregate_feature(orm_feature, aggregation_type: str):
@@ -96,20 +637,90 @@ class DataBase:
         else:
             return func.min(orm_feature)
 
-    def __exec_sync(self, query):
-        with self.__session() as session:
-            return session.execute(query)
+    @staticmethod
+    def __rollup_feature(rollup_model, feature: str, aggregation_type: str):
+        # Rollups store every feature as float; min/max/sum of integer features are integers again
+        orm_feature = getattr(rollup_model, feature)
+        if feature in INTEGER_COLUMNS and AggregationType(aggregation_type) is not AggregationType.AVG:
+            return cast(orm_feature, Integer).label(feature)
+        return orm_feature
+
+    def __exec_sync(self, query, params: dict | None):
+        # Rows are fetched here, so the cursor never leaves the thread that opened it
+        with self.__pool_metrics.track_wait(), self.__session() as session:
+            return session.execute(query, params).freeze()
 
-    async def __exec_async(self, query):
-        async with self.__session() as session:
-            return await session.execute(query)
+    def __start_stream_sync(self, session, query, params: dict | None):
+        with self.__pool_metrics.track_wait():
+            return session.execute(query, params)
+
+    async def __exec_async(self, query, params: dict | None):
+        # Plain connections skip the ORM session bookkeeping, queries only select columns
+        with self.__pool_metrics.track_wait():
+            async with self.__engine.connect() as conn:
+                result = await conn.execute(query, params)
+                return result.freeze()
+
+    async def __run_sync(self, function, *args):
+        if self.__executor is None:
+            return function(*args)
+        return await get_running_loop().run_in_executor(self.__executor, function, *args)
+
+    async def __exec_query(self, query, params: dict | None=None):
+        with track_database_time():
+            if self.__is_sync:
+                frozen_result = await self.__run_sync(self.__exec_sync, query, params)
+            else:
+                frozen_result = await self.__exec_async(query, params)
+        count_rows(len(frozen_result.data))
+        return frozen_result()
 
-    async def __exec_query(self, query):
+    async def __stream_query(self, query, params: dict | None, batch_size: int) -> AsyncIterator[dict[str, list]]:
+        query = query.execution_options(yield_per=batch_size)
         if self.__is_sync:
-            return self.__exec_sync(query)
-        return await self.__exec_async(query)
+            # SQLite connections are opened with check_same_thread=False, batches are fetched one at a time
+            with self.__session() as session:
+                with track_database_time():
+                    result = await self.__run_sync(self.__start_stream_sync, session, query, params)
+                keys = list(result.keys())
+                while True:
+                    with track_database_time():
+                        rows = await self.__run_sync(result.fetchmany, batch_size)
+                    if len(rows) == 0:
+                        return
+                    count_rows(len(rows))
+                    yield DataBase.__rows_to_columns(keys, rows)
+
+        # The generator may be resumed from another task, so the wait is tracked around the checkout only
+        with track_database_time(), self.__pool_metrics.track_wait():
+            conn = await self.__engine.connect()
+        try:
+            with track_database_time():
+                result = await conn.stream(query, params)
+            keys = list(result.keys())
+            partitions = result.partitions(batch_size)
+            while True:
+                with track_database_time():
+                    rows = await anext(partitions, None)
+                if rows is None:
+                    return
+                count_rows(len(rows))
+                yield DataBase.__rows_to_columns(keys, rows)
+        finally:
+            await conn.close()
+
+    @staticmethod
+    def __rows_to_columns(keys: list[str], rows: list) -> dict[str, list]:
+        if len(rows) == 0:
+            return {}
+        return dict(zip(keys, map(list, zip(*rows))))
 
-    async def load_data(self, path: str):
+    @staticmethod
+    def __to_columns(result) -> dict[str, list]:
+        return DataBase.__rows_to_columns(list(result.keys()), result.all())
+
+    async def load_data(self, path: str, mode: LoadMode=LoadMode.BULK, chunk_size: int | None=None,
+                        on_progress: Callable[[int], None] | None=None, upsert: bool=False):
         """
         Load data into the database from a CSV file with columns:
         Округ,
@@ -125,209 +736,359 @@ class DataBase:
         Денежные_доходы,
         Научные_исследования
 
+        Regions and districts already in the database keep their ids.
+
         Args:
             path (str): Path to CSV file
+            mode (LoadMode): Insert rows through ORM objects or through bulk Core/COPY statements
+            chunk_size (int | None): Read and commit the file by chunks of this many rows instead of all at once
+            on_progress (Callable[[int], None] | None): Called with the number of loaded rows after every commit
+            upsert (bool): Replace the stored rows of the same region and year instead of failing on them,
+                and rebuild derived data only for the years in the file; bulk mode only
         """
-        df = pd.read_csv(path)
-        df.replace({np.nan: None}, inplace=True)
-
-        statistic_instances = []
-        region_instances = []
-        district_instances = []
-        regions = {}
-        districts = {}
-        new_region_id = 1
-        new_district_id = 1
-        prev_region = None
-        prev_region_id = None
-        prev_district = None
-        prev_district_id = None
-        for row in df.itertuples():
-            district = row.Округ
-            region = row.Регион
-
-            if district != prev_district:
-                if district in districts:
-                    district_id = districts[district]
-                else:
-                    districts[district] = new_district_id
-                    district_id = new_district_id
-                    new_district_id += 1
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be positive.")
 
-                    district_instances.append(Districts(district_name=district))
+        mode = LoadMode(mode)
+        if upsert and mode is not LoadMode.BULK:
+            raise ValueError("Upserts are only supported by the bulk load mode.")
 
-                prev_district = district
-                prev_district_id = district_id
+        chunks = [pd.read_csv(path)] if chunk_size is None else pd.read_csv(path, chunksize=chunk_size)
+
+        # Names are mapped to ids across all chunks and earlier loads, so every area is inserted only once
+        regions = await self.__get_area_ids(Regions.region_name, Regions.id)
+        districts = await self.__get_area_ids(Districts.district_name, Districts.id)
+        years = set()
+        loaded_rows = 0
+        for chunk in chunks:
+            if mode is LoadMode.ORM:
+                await self.__load_orm(chunk, regions, districts)
             else:
-                district_id = prev_district_id
+                await self.__load_bulk(chunk, regions, districts, upsert)
 
-            if region != prev_region:
-                if region in regions:
-                    region_id = regions[region]
-                else:
-                    regions[region] = new_region_id
-                    region_id = new_region_id
-                    new_region_id += 1
+            years.update(int(year) for year in chunk["Год"].unique())
+            loaded_rows += len(chunk)
+            logger.info(f"Loaded {loaded_rows} rows from {path}")
+            if on_progress is not None:
+                on_progress(loaded_rows)
 
-                    region_instances.append(Regions(region_name=region))
+        await self.refresh_derived_data(years if upsert else None)
 
-                prev_region = region
-                prev_region_id = region_id
-            else:
-                region_id = prev_region_id
-
-            obj = Statistics(
-                district_id=district_id,
-                region_id=region_id,
-                year=row.Год,
-                investments=row.Инвестиции,
-                grp=row.ВРП,
-                population=row.Население,
-                unemployment=row.Безработица,
-                average_salary=row.Средняя_ЗП,
-                crimes=row.Преступления,
-                retail_turnover=row.Оборот_розницы,
-                cash_expenses=row.Денежные_доходы,
-                scientific_research=row.Научные_исследования
-            )
-            statistic_instances.append(obj)
+    async def __get_area_ids(self, name_column, id_column) -> dict[str, int]:
+        result = await self.__exec_query(select(name_column, id_column))
+        return dict(result.tuples().all())
+
+    async def __load_orm(self, df: pd.DataFrame, regions: dict[str, int], districts: dict[str, int]):
+        df = df.replace({np.nan: None})
+
+        # New areas are flushed before the statistics rows, which then reference the ids the database assigned
+        region_instances = {
+            name: Regions(region_name=name) for name in df["Регион"].unique() if name not in regions
+        }
+        district_instances = {
+            name: Districts(district_name=name) for name in df["Округ"].unique() if name not in districts
+        }
+
+        def get_statistic_instances() -> list[Statistics]:
+            regions.update((name, region.id) for name, region in region_instances.items())
+            districts.update((name, district.id) for name, district in district_instances.items())
+            return [
+                Statistics(
+                    district_id=districts[row.Округ],
+                    region_id=regions[row.Регион],
+                    year=row.Год,
+                    investments=row.Инвестиции,
+                    grp=row.ВРП,
+                    population=row.Население,
+                    unemployment=row.Безработица,
+                    average_salary=row.Средняя_ЗП,
+                    crimes=row.Преступления,
+                    retail_turnover=row.Оборот_розницы,
+                    cash_expenses=row.Денежные_доходы,
+                    scientific_research=row.Научные_исследования
+                )
+                for row in df.itertuples()
+            ]
 
         if self.__is_sync:
             with self.__session() as session:
-                session.add_all(region_instances)
-                session.add_all(district_instances)
-                session.add_all(statistic_instances)
+                session.add_all(region_instances.values())
+                session.add_all(district_instances.values())
+                session.flush()
+                session.add_all(get_statistic_instances())
 
                 session.commit()
         else:
             async with self.__session() as session:
-                session.add_all(region_instances)
-                session.add_all(district_instances)
-                session.add_all(statistic_instances)
+                session.add_all(region_instances.values())
+                session.add_all(district_instances.values())
+                await session.flush()
+                session.add_all(get_statistic_instances())
 
                 await session.commit()
 
     @staticmethod
-    def __get_region_info_query(id: int, year: int):
+    def __to_statistics_frame(df: pd.DataFrame, region_ids: np.ndarray, district_ids: np.ndarray) -> pd.DataFrame:
+        frame = df.rename(columns=CSV_COLUMNS)
+        frame["region_id"] = region_ids
+        frame["district_id"] = district_ids
+        frame = frame[STATISTICS_COLUMNS]
+        frame = frame.astype({col: "Int64" for col in INTEGER_COLUMNS})
+
+        # Drivers expect plain Python values: int/float objects and None instead of NaN
+        return frame.astype(object).where(frame.notna(), None)
+
+    @staticmethod
+    def __factorize_areas(names: pd.Series, known_ids: dict[str, int]) -> tuple[np.ndarray, pd.Index, list[str]]:
+        codes, uniques = pd.factorize(names)
+        return codes, uniques, [name for name in uniques if name not in known_ids]
+
+    @staticmethod
+    def __area_ids(codes: np.ndarray, uniques: pd.Index, known_ids: dict[str, int]) -> np.ndarray:
+        return np.array([known_ids[name] for name in uniques])[codes]
+
+    @staticmethod
+    def __get_upsert_query(is_sync: bool):
+        query = (sqlite_insert if is_sync else postgresql_insert)(Statistics)
+        return query.on_conflict_do_update(
+            index_elements=STATISTICS_KEY,
+            set_={col: query.excluded[col] for col in STATISTICS_COLUMNS if col not in STATISTICS_KEY}
+        )
+
+    async def __load_bulk(self, df: pd.DataFrame, regions: dict[str, int], districts: dict[str, int],
+                          upsert: bool=False):
+        region_codes, region_names, new_regions = DataBase.__factorize_areas(df["Регион"], regions)
+        district_codes, district_names, new_districts = DataBase.__factorize_areas(df["Округ"], districts)
+
+        region_query = insert(Regions).returning(Regions.id, sort_by_parameter_order=True)
+        district_query = insert(Districts).returning(Districts.id, sort_by_parameter_order=True)
+        region_params = [{"region_name": name} for name in new_regions]
+        district_params = [{"district_name": name} for name in new_districts]
+
+        if self.__is_sync:
+            with self.__engine.begin() as conn:
+                if new_regions:
+                    regions.update(zip(new_regions, conn.execute(region_query, region_params).scalars()))
+                if new_districts:
+                    districts.update(zip(new_districts, conn.execute(district_query, district_params).scalars()))
+
+                frame = DataBase.__to_statistics_frame(
+                    df,
+                    DataBase.__area_ids(region_codes, region_names, regions),
+                    DataBase.__area_ids(district_codes, district_names, districts)
+                )
+                if upsert:
+                    # The last row of a region and year in the file wins
+                    frame = frame.drop_duplicates(STATISTICS_KEY, keep="last")
+                    conn.execute(DataBase.__get_upsert_query(self.__is_sync), frame.to_dict("records"))
+                else:
+                    conn.execute(insert(Statistics), frame.to_dict("records"))
+        else:
+            async with self.__engine.begin() as conn:
+                if new_regions:
+                    result = await conn.execute(region_query, region_params)
+                    regions.update(zip(new_regions, result.scalars()))
+                if new_districts:
+                    result = await conn.execute(district_query, district_params)
+                    districts.update(zip(new_districts, result.scalars()))
+
+                frame = DataBase.__to_statistics_frame(
+                    df,
+                    DataBase.__area_ids(region_codes, region_names, regions),
+                    DataBase.__area_ids(district_codes, district_names, districts)
+                )
+                if upsert:
+                    # COPY can not resolve conflicts, the last row of a region and year in the file wins
+                    frame = frame.drop_duplicates(STATISTICS_KEY, keep="last")
+                    await conn.execute(DataBase.__get_upsert_query(self.__is_sync), frame.to_dict("records"))
+                else:
+                    raw_connection = await conn.get_raw_connection()
+                    await raw_connection.driver_connection.copy_records_to_table(
+                        Statistics.__tablename__,
+                        records=frame.itertuples(index=False, name=None),
+                        columns=STATISTICS_COLUMNS,
+                        schema_name=self.__schema
+                    )
+
+    @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_region_info_query():
         columns = [getattr(Statistics, col.value) for col in ColumnName]
         return (
                 select(Regions.region_name, Districts.district_name, *columns)
-                .filter(Statistics.region_id == id, Statistics.year == year)
+                .filter(Statistics.region_id == bindparam("id"), Statistics.year == bindparam("year"))
                 .join(Regions, Regions.id == Statistics.region_id)
                 .join(Districts, Districts.id == Statistics.district_id)
             )
 
     async def get_region_info(self, id: int, year: int) -> dict[str, str | int | float] | None:
-        query = DataBase.__get_region_info_query(id, year)
-        result = await self.__exec_query(query)
+        query = DataBase.__get_region_info_query()
+        result = await self.__exec_query(query, {"id": id, "year": year})
         try:
             return result.mappings().one()
         except Exception:
             return None
 
     @staticmethod
-    def __get_district_info_query(id: int, year: int, aggregation_type: str):
-        columns = [(col, getattr(Statistics, col.value)) for col in ColumnName]
-        aggr_columns = [
-            DataBase.__aggregate_feature(orm_col, aggregation_type)
-            .label(col_name) for col_name, orm_col in columns
-        ]
-
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_regions_info_query():
+        columns = [getattr(Statistics, col.value) for col in ColumnName]
         return (
-                select(Districts.district_name, *aggr_columns)
-                .select_from(Statistics)
-                .filter_by(district_id=id, year=year)
+                select(
+                    Statistics.region_id.label("id"),
+                    Statistics.year,
+                    Regions.region_name,
+                    Districts.district_name,
+                    *columns
+                )
+                .filter(
+                    Statistics.region_id.in_(bindparam("ids", expanding=True)),
+                    Statistics.year.in_(bindparam("years", expanding=True))
+                )
+                .join(Regions, Regions.id == Statistics.region_id)
                 .join(Districts, Districts.id == Statistics.district_id)
-                .group_by(Statistics.district_id, Districts.district_name)
+                .order_by(Statistics.region_id, Statistics.year)
+            )
+
+    async def get_regions_info(self, ids: list[int], years: list[int]) -> list[dict[str, str | int | float]]:
+        query = DataBase.__get_regions_info_query()
+        result = await self.__exec_query(query, {"ids": list(ids), "years": list(years)})
+        return result.mappings().all()
+
+    @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_district_info_query(aggregation_type: str):
+        columns = [DataBase.__rollup_feature(DistrictRollups, col.value, aggregation_type) for col in ColumnName]
+
+        return (
+                select(Districts.district_name, *columns)
+                .join(Districts, Districts.id == DistrictRollups.district_id)
+                .filter(
+                    DistrictRollups.district_id == bindparam("id"),
+                    DistrictRollups.year == bindparam("year"),
+                    DistrictRollups.aggregation_type == AggregationType(aggregation_type).value
+                )
             )
 
     async def get_district_info(self, id: int, year: int, aggregation_type: str) -> dict[str, str | int| float] | None:
-        query = DataBase.__get_district_info_query(id, year, aggregation_type)
-        result = await self.__exec_query(query)
+        query = DataBase.__get_district_info_query(aggregation_type)
+        result = await self.__exec_query(query, {"id": id, "year": year})
         try:
             return result.mappings().one()
         except Exception:
             return None
 
     @staticmethod
-    def __get_feature_info_query(feature: str, year: int, is_by_district: bool,
-                                 aggregation_type: str, use_filter: bool,
-                                 min_value: int, max_value: int):
-        orm_feature = getattr(Statistics, feature)
-
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_area_history_query(is_by_district: bool, aggregation_type: str | None):
         if is_by_district:
-            arrg_orm_feature = DataBase.__aggregate_feature(orm_feature, aggregation_type)
-            sub_query = (
-                select(
-                    Statistics.district_id.label("area_id"),
-                    Districts.district_name.label("area_name"),
-                    Statistics.year,
-                    arrg_orm_feature.label("feature_value")
-                )
-                .group_by(Statistics.district_id, Districts.district_name, Statistics.year)
-                .join(Districts, Districts.id == Statistics.district_id)
-            )
-        else:
-            sub_query = (
-                select(
-                    Statistics.region_id.label("area_id"),
-                    Regions.region_name.label("area_name"),
-                    Statistics.year,
-                    orm_feature.label("feature_value")
+            columns = [DataBase.__rollup_feature(DistrictRollups, col.value, aggregation_type) for col in ColumnName]
+
+            return (
+                select(Districts.district_name.label("area_name"), DistrictRollups.year, *columns)
+                .join(Districts, Districts.id == DistrictRollups.district_id)
+                .filter(
+                    DistrictRollups.district_id == bindparam("id"),
+                    DistrictRollups.aggregation_type == AggregationType(aggregation_type).value
                 )
-                .join(Regions, Regions.id == Statistics.region_id)
+                .order_by(DistrictRollups.year)
             )
 
-        if use_filter:
-            if is_by_district:
-                if min_value is not None:
-                    sub_query = (
-                        sub_query
-                        .having(
-                            arrg_orm_feature >= min_value
-                        )
-                    )
+        columns = [getattr(Statistics, col.value) for col in ColumnName]
+        return (
+            select(Regions.region_name.label("area_name"), Statistics.year, *columns)
+            .join(Regions, Regions.id == Statistics.region_id)
+            .filter(Statistics.region_id == bindparam("id"))
+            .order_by(Statistics.year)
+        )
 
-                if max_value is not None:
-                    sub_query = (
-                        sub_query
-                        .having(
-                            arrg_orm_feature <= max_value
-                        )
-                    )
-            else:
-                if min_value is not None:
-                    sub_query = sub_query.filter(
-                        and_(
-                            orm_feature >= min_value
-                        )
-                    )
+    async def get_area_history(self, id: int, is_by_district: bool=False,
+                               aggregation_type: str | None=None) -> dict[str, list[str | int | float]]:
+        query = DataBase.__get_area_history_query(is_by_district, aggregation_type)
+        result = await self.__exec_query(query, {"id": id})
+        return DataBase.__to_columns(result)
 
-                if max_value is not None:
-                    sub_query = sub_query.filter(
-                        and_(
-                            orm_feature <= max_value
-                        )
-                    )
-        sub_query = sub_query.subquery()
+    @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_feature_summary_query(feature: str, is_by_district: bool, aggregation_type: str | None):
+        if is_by_district:
+            area_type = AreaType.DISTRICT
+            aggregation_condition = FeatureSummaries.aggregation_type == AggregationType(aggregation_type).value
+        else:
+            area_type = AreaType.REGION
+            aggregation_condition = FeatureSummaries.aggregation_type.is_(None)
 
-        prev_feature = (
-            func.lag(sub_query.c["feature_value"])
-            .over(partition_by=sub_query.c.area_name, order_by=sub_query.c.year)
+        return (
+            select(
+                FeatureSummaries.values_count,
+                FeatureSummaries.null_count,
+                FeatureSummaries.min_value,
+                FeatureSummaries.max_value,
+                *[getattr(FeatureSummaries, quantile) for quantile in QUANTILES]
+            )
+            .filter(
+                FeatureSummaries.feature == ColumnName(feature).value,
+                FeatureSummaries.area_type == area_type.value,
+                aggregation_condition,
+                FeatureSummaries.year == bindparam("year")
+            )
         )
 
-        windowed_sub_query = (
+    async def get_feature_summary(self, feature: str, year: int, is_by_district: bool=False,
+                                  aggregation_type: str | None=None) -> dict[str, int | float] | None:
+        query = DataBase.__get_feature_summary_query(feature, is_by_district, aggregation_type)
+        result = await self.__exec_query(query, {"year": year})
+        try:
+            return result.mappings().one()
+        except Exception:
+            return None
+
+    @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_feature_info_query(feature: str, is_by_district: bool, aggregation_type: str,
+                                 use_min_value: bool, use_max_value: bool):
+        if is_by_district:
+            area_name = Districts.district_name
+            area_condition = and_(
+                Districts.id == FeatureValues.area_id,
+                FeatureValues.area_type == AreaType.DISTRICT.value,
+                FeatureValues.aggregation_type == AggregationType(aggregation_type).value
+            )
+        else:
+            area_name = Regions.region_name
+            area_condition = and_(
+                Regions.id == FeatureValues.area_id,
+                FeatureValues.area_type == AreaType.REGION.value,
+                FeatureValues.aggregation_type.is_(None)
+            )
+
+        query = (
             select(
-                sub_query.c["area_id", "area_name", "feature_value", "year"],
-                (((sub_query.c["feature_value"] / prev_feature) - 1) * 100).label("feature_ratio")
-                ).subquery()
+                FeatureValues.area_id,
+                area_name.label("area_name"),
+                FeatureValues.feature_value,
+                FeatureValues.feature_ratio
+            )
+            .join_from(FeatureValues, area_name.class_, area_condition)
+            .filter(FeatureValues.feature == ColumnName(feature).value, FeatureValues.year == bindparam("year"))
+            .order_by(FeatureValues.area_id)
         )
 
-        return (
-            select(windowed_sub_query.c["area_id", "area_name", "feature_value", "feature_ratio"])
-            .filter_by(year=year)
-            .order_by(windowed_sub_query.c.area_id)
-        )
+        if use_min_value:
+            query = query.filter(
+                and_(
+                    FeatureValues.feature_value >= bindparam("min_value")
+                )
+            )
+
+        if use_max_value:
+            query = query.filter(
+                and_(
+                    FeatureValues.feature_value <= bindparam("max_value")
+                )
+            )
+
+        return query
 
     async def get_feature_info(
             self,
@@ -339,37 +1100,92 @@ class DataBase:
             min_value: int,
             max_value: int
         ) -> tuple[str, list[dict[str, str | float]]]:
+        use_min_value = use_filter and min_value is not None
+        use_max_value = use_filter and max_value is not None
         query = DataBase.__get_feature_info_query(
-            feature, year, is_by_district, aggregation_type, use_filter, min_value, max_value
+            feature, is_by_district, aggregation_type, use_min_value, use_max_value
         )
-        result = await self.__exec_query(query)
+        params = {"year": year}
+        if use_min_value:
+            params["min_value"] = min_value
+        if use_max_value:
+            params["max_value"] = max_value
+
+        result = await self.__exec_query(query, params)
         return result.mappings().all()
 
     @staticmethod
-    def __get_statistics_query(required_columns: list[str], year: int,
-                               is_by_district: bool=False, aggregation_type: str=None):
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_statistics_query(required_columns: tuple[str, ...], is_by_district: bool=False,
+                               aggregation_type: str=None):
         if is_by_district:
-            columns = [(col, getattr(Statistics, col)) for col in required_columns]
-            aggr_columns = [
-                DataBase.__aggregate_feature(orm_col, aggregation_type)
-                .label(col_name) for col_name, orm_col in columns
-            ]
+            columns = [DataBase.__rollup_feature(DistrictRollups, col, aggregation_type) for col in required_columns]
+
+            query = (
+                select(
+                    Districts.district_name.label("district_names"),
+                    *columns
+                )
+                .select_from(DistrictRollups)
+                .join(Districts, Districts.id == DistrictRollups.district_id)
+                .filter(
+                    DistrictRollups.year == bindparam("year"),
+                    DistrictRollups.aggregation_type == AggregationType(aggregation_type).value
+                )
+                .order_by(DistrictRollups.district_id)
+            )
+        else:
+            columns = [getattr(Statistics, col) for col in required_columns]
 
             query = (
                 select(
                     Districts.district_name.label("district_names"),
-                    *aggr_columns
+                    Regions.region_name.label("region_names"),
+                    *columns
                 )
                 .select_from(Statistics)
+                .join(Regions, Regions.id == Statistics.region_id)
                 .join(Districts, Districts.id == Statistics.district_id)
-                .filter(Statistics.year == year)
-                .group_by(Statistics.district_id, Districts.district_name)
+                .filter(Statistics.year == bindparam("year"))
+            )
+
+        return query
+
+
+    @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def __get_statistics_range_query(required_columns: tuple[str, ...], use_start_year: bool, use_end_year: bool,
+                                     is_by_district: bool=False, aggregation_type: str=None):
+        model = DistrictRollups if is_by_district else Statistics
+        conditions = []
+        if use_start_year:
+            conditions.append(model.year >= bindparam("start_year"))
+        if use_end_year:
+            conditions.append(model.year <= bindparam("end_year"))
+
+        if is_by_district:
+            columns = [DataBase.__rollup_feature(DistrictRollups, col, aggregation_type) for col in required_columns]
+
+            query = (
+                select(
+                    DistrictRollups.year,
+                    Districts.district_name.label("district_names"),
+                    *columns
+                )
+                .select_from(DistrictRollups)
+                .join(Districts, Districts.id == DistrictRollups.district_id)
+                .filter(
+                    DistrictRollups.aggregation_type == AggregationType(aggregation_type).value,
+                    *conditions
+                )
+                .order_by(DistrictRollups.year, DistrictRollups.district_id)
             )
         else:
             columns = [getattr(Statistics, col) for col in required_columns]
 
             query = (
                 select(
+                    Statistics.year,
                     Districts.district_name.label("district_names"),
                     Regions.region_name.label("region_names"),
                     *columns
@@ -377,46 +1193,83 @@ class DataBase:
                 .select_from(Statistics)
                 .join(Regions, Regions.id == Statistics.region_id)
                 .join(Districts, Districts.id == Statistics.district_id)
-                .filter(Statistics.year == year)
+                .filter(*conditions)
+                .order_by(Statistics.year, Statistics.region_id)
             )
 
         return query
 
-
     async def get_statistic(
             self,
             required_columns: list[str],
             year: int,
             is_by_district: bool=False,
             aggregation_type: str=None
-        ) -> list[dict[str, str | float]]:
-        query = DataBase.__get_statistics_query(required_columns, year, is_by_district, aggregation_type)
-        result = await self.__exec_query(query)
-        return result.mappings().all()
+        ) -> dict[str, list[str | float]]:
+        query = DataBase.__get_statistics_query(tuple(required_columns), is_by_district, aggregation_type)
+        result = await self.__exec_query(query, {"year": year})
+        return DataBase.__to_columns(result)
+
+    async def stream_statistic(
+            self,
+            required_columns: list[str],
+            year: int,
+            is_by_district: bool=False,
+            aggregation_type: str=None,
+            batch_size: int=DEFAULT_STREAM_BATCH_SIZE
+        ) -> AsyncIterator[dict[str, list[str | float]]]:
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+
+        query = DataBase.__get_statistics_query(tuple(required_columns), is_by_district, aggregation_type)
+        async for batch in self.__stream_query(query, {"year": year}, batch_size):
+            yield batch
+
+    async def stream_statistics_range(
+            self,
+            required_columns: list[str],
+            start_year: int | None=None,
+            end_year: int | None=None,
+            is_by_district: bool=False,
+            aggregation_type: str=None,
+            batch_size: int=DEFAULT_STREAM_BATCH_SIZE
+        ) -> AsyncIterator[dict[str, list[str | float]]]:
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+
+        query = DataBase.__get_statistics_range_query(
+            tuple(required_columns), start_year is not None, end_year is not None, is_by_district, aggregation_type
+        )
+        params = {}
+        if start_year is not None:
+            params["start_year"] = start_year
+        if end_year is not None:
+            params["end_year"] = end_year
+
+        async for batch in self.__stream_query(query, params, batch_size):
+            yield batch
 
     @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
     def __get_feature_graphs_query(aggregation_type: str):
-        columns = [(col, getattr(Statistics, col.value)) for col in ColumnName]
-        aggr_columns = [
-            DataBase.__aggregate_feature(orm_col, aggregation_type)
-            .label(col_name) for col_name, orm_col in columns
-        ]
+        columns = [DataBase.__rollup_feature(YearRollups, col.value, aggregation_type) for col in ColumnName]
 
         return (
             select(
-                Statistics.year,
-                *aggr_columns
+                YearRollups.year,
+                *columns
             )
-            .group_by(Statistics.year)
-            .order_by(Statistics.year.asc())
+            .filter(YearRollups.aggregation_type == AggregationType(aggregation_type).value)
+            .order_by(YearRollups.year.asc())
         )
 
-    async def get_feature_graphs(self, aggregation_type: str='avg') -> list[dict[str, int | float]]:
+    async def get_feature_graphs(self, aggregation_type: str='avg') -> dict[str, list[int | float]]:
         query = DataBase.__get_feature_graphs_query(aggregation_type)
         result = await self.__exec_query(query)
-        return result.mappings().all()
+        return DataBase.__to_columns(result)
 
     @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
     def __get_areas_query(are_districts: bool):
         if are_districts:
             return select(Districts.id, Districts.district_name.label("area_name"))
@@ -428,6 +1281,7 @@ class DataBase:
         return result.mappings().all()
 
     @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
     def __get_years_query():
         return select(Statistics.year).distinct().order_by(Statistics.year.asc())
 
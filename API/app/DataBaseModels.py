@@ -1,4 +1,6 @@
-from sqlalchemy import ForeignKey, String
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -9,10 +11,16 @@ class Base(DeclarativeBase):
 class Statistics(Base):
 
     __tablename__ = 'statistics'
+    # (year, region_id) also serves filters by year only, (district_id, year) - by district only.
+    # It is unique, a region has one row per year, and is the conflict target of upserts
+    __table_args__ = (
+        Index("uq_statistics_year_region_id", "year", "region_id", unique=True),
+        Index("ix_statistics_district_id_year", "district_id", "year"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     district_id: Mapped[int] = mapped_column(ForeignKey("districts.id"))
-    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete='CASCADE'))
+    region_id: Mapped[int] = mapped_column(ForeignKey("regions.id", ondelete='CASCADE'), index=True)
     year: Mapped[int]
     investments: Mapped[float]
     grp: Mapped[float | None]
@@ -39,3 +47,81 @@ class Districts(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     district_name: Mapped[str] = mapped_column(String(64))
+
+
+class RollupFeatures:
+
+    investments: Mapped[float | None]
+    grp: Mapped[float | None]
+    population: Mapped[float | None]
+    unemployment: Mapped[float | None]
+    average_salary: Mapped[float | None]
+    crimes: Mapped[float | None]
+    retail_turnover: Mapped[float | None]
+    cash_expenses: Mapped[float | None]
+    scientific_research: Mapped[float | None]
+
+
+class DistrictRollups(RollupFeatures, Base):
+    __tablename__ = 'district_rollups'
+    __table_args__ = (
+        Index("ix_district_rollups_aggregation_type_year", "aggregation_type", "year"),
+    )
+
+    district_id: Mapped[int] = mapped_column(ForeignKey("districts.id", ondelete='CASCADE'), primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+    aggregation_type: Mapped[str] = mapped_column(String(8), primary_key=True)
+
+
+class YearRollups(RollupFeatures, Base):
+    __tablename__ = 'year_rollups'
+
+    aggregation_type: Mapped[str] = mapped_column(String(8), primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+
+
+class FeatureValues(Base):
+
+    __tablename__ = 'feature_values'
+    __table_args__ = (
+        Index("ix_feature_values_lookup", "feature", "area_type", "aggregation_type", "year", "area_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    feature: Mapped[str] = mapped_column(String(32))
+    area_type: Mapped[str] = mapped_column(String(8))
+    aggregation_type: Mapped[str | None] = mapped_column(String(8))
+    area_id: Mapped[int]
+    year: Mapped[int]
+    feature_value: Mapped[float | None]
+    feature_ratio: Mapped[float | None]
+
+
+class FeatureSummaries(Base):
+
+    __tablename__ = 'feature_summaries'
+    __table_args__ = (
+        Index("ix_feature_summaries_lookup", "feature", "area_type", "aggregation_type", "year"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    feature: Mapped[str] = mapped_column(String(32))
+    area_type: Mapped[str] = mapped_column(String(8))
+    aggregation_type: Mapped[str | None] = mapped_column(String(8))
+    year: Mapped[int]
+    values_count: Mapped[int]
+    null_count: Mapped[int]
+    min_value: Mapped[float | None]
+    max_value: Mapped[float | None]
+    lower_quartile: Mapped[float | None]
+    median: Mapped[float | None]
+    upper_quartile: Mapped[float | None]
+
+
+class DatasetInfo(Base):
+
+    __tablename__ = 'dataset_info'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[str] = mapped_column(String(32))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -0,0 +1,129 @@
+import logging
+from asyncio import CancelledError, Event, Task, create_task, sleep
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from enum import StrEnum
+
+from .DataBase import DataBase
+from .MemoryDataBase import MemoryDataBase
+
+DEFAULT_INGESTION_CHUNK_SIZE = 100000
+DEFAULT_DRAIN_TIME = 60.0
+# PostgreSQL schema the data is loaded into before it is copied to the served tables
+STAGING_SCHEMA = "staging"
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionPhase(StrEnum):
+
+    STAGING = "staging"
+    LOADING = "loading"
+    SWITCHING = "switching"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class IngestionCancelled(Exception):
+    """Raised by the progress callback of a job closed before its load is done"""
+
+
+class IngestionJob:
+    """
+    Data load running in the background. The data is loaded into a staging database and
+    requests are served from the current one until the job switches to the new data.
+
+    Progress is written by the loading thread and read by the status endpoint;
+    every field is assigned at once, so no locking is needed.
+    """
+
+    def __init__(self, path: str, drain_time: float=DEFAULT_DRAIN_TIME):
+        """
+        Args:
+            path (str): Loaded data file
+            drain_time (float): Seconds a replaced database is kept open for the requests still using it
+        """
+        self.path = path
+        self.phase = IngestionPhase.STAGING
+        self.rows = 0
+        self.started_at = datetime.now(UTC)
+        self.finished_at = None
+        self.error = None
+        self.__drain_time = drain_time
+        self.__retired: list[DataBase | MemoryDataBase] = []
+        self.__task: Task | None = None
+        self.__cancelled = False
+        self.__loaded = Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self.phase not in (IngestionPhase.DONE, IngestionPhase.FAILED)
+
+    def on_progress(self, rows: int):
+        if self.__cancelled:
+            raise IngestionCancelled(f"Loading {self.path} was stopped")
+        self.phase = IngestionPhase.LOADING
+        self.rows = rows
+
+    def start_switching(self):
+        self.phase = IngestionPhase.SWITCHING
+
+    def retire(self, db: DataBase | MemoryDataBase):
+        """Close a replaced database once the job is done and the requests still using it are finished"""
+        self.__retired.append(db)
+
+    def start(self, load: Callable[["IngestionJob"], Awaitable[None]]):
+        self.__task = create_task(self.__run(load))
+
+    async def __run(self, load: Callable[["IngestionJob"], Awaitable[None]]):
+        try:
+            await load(self)
+        except IngestionCancelled as error:
+            logger.info(str(error))
+            self.error = str(error)
+            self.phase = IngestionPhase.FAILED
+        except Exception as error:
+            logger.exception(f"Loading {self.path} failed")
+            self.error = str(error)
+            self.phase = IngestionPhase.FAILED
+        else:
+            logger.info(f"Loaded {self.rows} rows from {self.path}, switched to the new data")
+            self.phase = IngestionPhase.DONE
+        finally:
+            self.finished_at = datetime.now(UTC)
+            self.__loaded.set()
+
+        if len(self.__retired) != 0:
+            await sleep(self.__drain_time)
+            await self.__close_retired()
+
+    async def __close_retired(self):
+        while len(self.__retired) != 0:
+            db = self.__retired.pop()
+            await db.dispose()
+            db.close()
+
+    async def close(self):
+        """
+        Stop the job and close replaced databases right away, on shutdown. A load running in a thread
+        can not be cancelled, so it is stopped at its next chunk and cleans up what it built before.
+        """
+        if self.__task is not None and not self.__task.done():
+            self.__cancelled = True
+            await self.__loaded.wait()
+            self.__task.cancel()
+            try:
+                await self.__task
+            except CancelledError:
+                pass
+        await self.__close_retired()
+
+    def status(self) -> dict[str, str | int | datetime | None]:
+        return {
+            "phase": self.phase,
+            "path": self.path,
+            "rows": self.rows,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
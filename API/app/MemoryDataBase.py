@@ -0,0 +1,490 @@
+import logging
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from .DataBase import (
+    CSV_COLUMNS,
+    DEFAULT_STREAM_BATCH_SIZE,
+    GENERATIONS,
+    INTEGER_COLUMNS,
+    QUANTILES,
+    AggregationType,
+    ColumnName,
+    LoadMode,
+)
+
+FEATURES = [col.value for col in ColumnName]
+FEATURE_INDEX = {feature: index for index, feature in enumerate(FEATURES)}
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryDataBase:
+    """
+    Columnar in-memory backend with the same interface as DataBase.
+
+    Statistics are kept as NumPy arrays; every aggregate and year-over-year ratio is
+    computed once per load into (area, year, feature) cubes, so queries are plain indexing.
+    """
+
+    def __init__(self):
+        self.__generation = next(GENERATIONS)
+        self.__dataset_info = None
+        self.__clear()
+
+    def __clear(self):
+        self.__region_names = np.empty(0, dtype=object)
+        self.__district_names = np.empty(0, dtype=object)
+        self.__row_region_ids = np.empty(0, dtype=np.int64)
+        self.__row_district_ids = np.empty(0, dtype=np.int64)
+        self.__row_years = np.empty(0, dtype=np.int64)
+        self.__row_features = np.empty((0, len(FEATURES)), dtype=np.float64)
+        self.__refresh_cubes()
+
+    @property
+    def pool_metrics(self) -> None:
+        return None
+
+    @property
+    def generation(self) -> int:
+        """Counter increased every time the stored data changes"""
+        return self.__generation
+
+    async def get_dataset_info(self) -> dict[str, str | datetime] | None:
+        """Version stamp written with every data load"""
+        return self.__dataset_info
+
+    async def reset(self):
+        self.__clear()
+        self.__dataset_info = None
+        self.__generation = next(GENERATIONS)
+
+    async def migrate(self, merge_duplicates: bool=False):
+        # Loads reject repeated regions and years, merge_duplicates is kept for compatibility with DataBase
+        await self.refresh_derived_data()
+
+    async def get_missing_tables(self) -> list[str]:
+        # Nothing is stored between runs, so nothing can be left from an older version
+        return []
+
+    async def refresh_derived_data(self):
+        """Rebuild cubes precomputed from statistics; called after every data load."""
+        self.__refresh_cubes()
+        self.__dataset_info = {"version": uuid4().hex, "updated_at": datetime.now(UTC)}
+        self.__generation = next(GENERATIONS)
+
+    async def dispose(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def load_data(self, path: str, mode: LoadMode=LoadMode.BULK, chunk_size: int | None=None,
+                        on_progress: Callable[[int], None] | None=None, upsert: bool=False):
+        """
+        Load data from a CSV file in the format accepted by DataBase.load_data.
+
+        Args:
+            path (str): Path to CSV file
+            mode (LoadMode): Ignored, kept for compatibility with DataBase
+            chunk_size (int | None): Read the file by chunks of this many rows
+            on_progress (Callable[[int], None] | None): Called with the number of loaded rows after every chunk
+            upsert (bool): Replace the stored rows of the same region and year
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be positive.")
+
+        chunks = [pd.read_csv(path)] if chunk_size is None else pd.read_csv(path, chunksize=chunk_size)
+
+        # Like in DataBase, every load appends rows and areas already loaded keep their ids
+        region_names = list(self.__region_names)
+        district_names = list(self.__district_names)
+        regions = {name: id for id, name in enumerate(region_names, start=1)}
+        districts = {name: id for id, name in enumerate(district_names, start=1)}
+        row_region_ids = [self.__row_region_ids]
+        row_district_ids = [self.__row_district_ids]
+        row_years = [self.__row_years]
+        row_features = [self.__row_features]
+        loaded_rows = 0
+        for chunk in chunks:
+            frame = chunk.rename(columns=CSV_COLUMNS)
+            row_region_ids.append(MemoryDataBase.__area_ids(frame["region_name"], regions, region_names))
+            row_district_ids.append(MemoryDataBase.__area_ids(frame["district_name"], districts, district_names))
+            row_years.append(frame["year"].to_numpy(dtype=np.int64))
+            row_features.append(frame[FEATURES].to_numpy(dtype=np.float64, na_value=np.nan))
+
+            loaded_rows += len(chunk)
+            logger.info(f"Loaded {loaded_rows} rows from {path}")
+            if on_progress is not None:
+                on_progress(loaded_rows)
+
+        row_region_ids = np.concatenate(row_region_ids)
+        row_district_ids = np.concatenate(row_district_ids)
+        row_years = np.concatenate(row_years)
+        row_features = np.concatenate(row_features)
+        keys = pd.DataFrame({"region_id": row_region_ids, "year": row_years})
+        if upsert:
+            # Like an update in place: the last row of a region and year at the position of the first one
+            rows = keys.index.to_series().groupby([keys["region_id"], keys["year"]], sort=False).last().to_numpy()
+            row_region_ids = row_region_ids[rows]
+            row_district_ids = row_district_ids[rows]
+            row_years = row_years[rows]
+            row_features = row_features[rows]
+        elif keys.duplicated().any():
+            # Like the unique key of DataBase, the stored data is left as it was
+            raise ValueError(f"{path} repeats the rows of a region and year, load it with upsert to replace them.")
+
+        self.__region_names = np.array(region_names, dtype=object)
+        self.__district_names = np.array(district_names, dtype=object)
+        self.__row_region_ids = row_region_ids
+        self.__row_district_ids = row_district_ids
+        self.__row_years = row_years
+        self.__row_features = row_features
+
+        await self.refresh_derived_data()
+
+    @staticmethod
+    def __area_ids(names: pd.Series, known_ids: dict[str, int], all_names: list[str]) -> np.ndarray:
+        codes, uniques = pd.factorize(names)
+        for name in uniques:
+            if name not in known_ids:
+                all_names.append(name)
+                known_ids[name] = len(all_names)
+        return np.array([known_ids[name] for name in uniques], dtype=np.int64)[codes]
+
+    @staticmethod
+    def __group_reduce(features: np.ndarray, groups: np.ndarray, group_count: int,
+                       aggregation_type: AggregationType) -> np.ndarray:
+        # NULL-aware like SQL aggregates: NaN values are skipped, groups without values stay NaN
+        counts = np.zeros((group_count, features.shape[1]))
+        np.add.at(counts, groups, ~np.isnan(features))
+
+        if aggregation_type is AggregationType.MIN:
+            result = np.full((group_count, features.shape[1]), np.inf)
+            np.fmin.at(result, groups, features)
+        elif aggregation_type is AggregationType.MAX:
+            result = np.full((group_count, features.shape[1]), -np.inf)
+            np.fmax.at(result, groups, features)
+        else:
+            result = np.zeros((group_count, features.shape[1]))
+            np.add.at(result, groups, np.nan_to_num(features))
+            if aggregation_type is AggregationType.AVG:
+                result = np.divide(result, counts, out=np.zeros_like(result), where=counts != 0)
+
+        result[counts == 0] = np.nan
+        return result
+
+    @staticmethod
+    def __year_ratios(values: np.ndarray, present: np.ndarray) -> np.ndarray:
+        # Ratio to the previous year present for the same area, as LAG over the area's rows does
+        year_count = present.shape[1]
+        last_present = np.maximum.accumulate(np.where(present, np.arange(year_count), -1), axis=1)
+        prev_index = np.full_like(last_present, -1)
+        prev_index[:, 1:] = last_present[:, :-1]
+
+        prev_values = np.take_along_axis(values, np.maximum(prev_index, 0)[:, :, None], axis=1)
+        prev_values[(prev_index < 0)[:, :, None] | (prev_values == 0)] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (values / prev_values - 1) * 100
+
+    def __refresh_cubes(self):
+        self.__years = np.unique(self.__row_years)
+        year_count = len(self.__years)
+        region_count = len(self.__region_names)
+        district_count = len(self.__district_names)
+        year_indexes = np.searchsorted(self.__years, self.__row_years)
+        region_indexes = self.__row_region_ids - 1
+        district_indexes = self.__row_district_ids - 1
+
+        self.__region_rows = np.full((region_count, year_count), -1, dtype=np.int64)
+        self.__region_rows[region_indexes, year_indexes] = np.arange(len(self.__row_years))
+        region_present = self.__region_rows >= 0
+        region_values = np.full((region_count, year_count, len(FEATURES)), np.nan)
+        region_values[region_indexes, year_indexes] = self.__row_features
+        self.__region_ratios = MemoryDataBase.__year_ratios(region_values, region_present)
+        self.__region_values = region_values
+        self.__summaries = {None: MemoryDataBase.__summarize(region_values, region_present)}
+
+        district_groups = district_indexes * year_count + year_indexes
+        district_rows = np.zeros(district_count * year_count, dtype=np.int64)
+        np.add.at(district_rows, district_groups, 1)
+        self.__district_present = (district_rows > 0).reshape(district_count, year_count)
+        self.__district_values = {}
+        self.__district_ratios = {}
+        self.__year_values = {}
+        for aggregation_type in AggregationType:
+            values = MemoryDataBase.__group_reduce(
+                self.__row_features, district_groups, district_count * year_count, aggregation_type
+            ).reshape(district_count, year_count, len(FEATURES))
+            self.__district_values[aggregation_type] = values
+            self.__district_ratios[aggregation_type] = MemoryDataBase.__year_ratios(values, self.__district_present)
+            self.__summaries[aggregation_type] = MemoryDataBase.__summarize(values, self.__district_present)
+            self.__year_values[aggregation_type] = MemoryDataBase.__group_reduce(
+                self.__row_features, year_indexes, year_count, aggregation_type
+            )
+
+    @staticmethod
+    def __summarize(values: np.ndarray, present: np.ndarray) -> list[dict[str, np.ndarray]]:
+        # Per year: counts, extremes and lower nearest quantiles of every feature, as in feature_summaries
+        summaries = []
+        feature_indexes = np.arange(len(FEATURES))
+        for year_index in range(values.shape[1]):
+            year_values = np.sort(values[present[:, year_index], year_index], axis=0)
+            values_count = (~np.isnan(year_values)).sum(axis=0)
+            has_values = values_count > 0
+            last_indexes = np.maximum(values_count - 1, 0)
+            summary = {
+                "values_count": values_count,
+                "null_count": len(year_values) - values_count,
+            }
+            positions = {"min_value": np.zeros_like(last_indexes), "max_value": last_indexes}
+            for quantile, (numerator, denominator) in QUANTILES.items():
+                positions[quantile] = numerator * last_indexes // denominator
+            for name, position in positions.items():
+                if len(year_values) == 0:
+                    summary[name] = np.full(len(FEATURES), np.nan)
+                else:
+                    summary[name] = np.where(has_values, year_values[position, feature_indexes], np.nan)
+            summaries.append(summary)
+        return summaries
+
+    def __year_index(self, year: int) -> int | None:
+        index = int(np.searchsorted(self.__years, year))
+        if index == len(self.__years) or self.__years[index] != year:
+            return None
+        return index
+
+    @staticmethod
+    def __to_python(values: np.ndarray, features: list[str], aggregation_type: str | None=None) -> list[list]:
+        # Mirrors SQL result types: NULL for NaN, integers for integer features unless averaged
+        is_avg = aggregation_type is not None and AggregationType(aggregation_type) is AggregationType.AVG
+        columns = []
+        for index, feature in enumerate(features):
+            column = values[..., index]
+            column_values = np.where(np.isnan(column), None, column).tolist()
+            if feature in INTEGER_COLUMNS and not is_avg:
+                column_values = [None if value is None else int(value) for value in column_values]
+            columns.append(column_values)
+        return columns
+
+    async def get_region_info(self, id: int, year: int) -> dict[str, str | int | float] | None:
+        year_index = self.__year_index(year)
+        if year_index is None or not MemoryDataBase.__is_area(id, self.__region_names):
+            return None
+
+        row = self.__region_rows[id - 1, year_index]
+        if row < 0:
+            return None
+
+        columns = MemoryDataBase.__to_python(self.__row_features[[row]], FEATURES)
+        return {
+            "region_name": self.__region_names[id - 1],
+            "district_name": self.__district_names[self.__row_district_ids[row] - 1],
+            **{feature: column[0] for feature, column in zip(FEATURES, columns)}
+        }
+
+    async def get_regions_info(self, ids: list[int], years: list[int]) -> list[dict[str, str | int | float]]:
+        regions = []
+        for id in sorted(set(ids)):
+            for year in sorted(set(years)):
+                region = await self.get_region_info(id, year)
+                if region is not None:
+                    regions.append({"id": id, "year": year, **region})
+        return regions
+
+    async def get_district_info(self, id: int, year: int, aggregation_type: str) -> dict[str, str | int| float] | None:
+        year_index = self.__year_index(year)
+        if year_index is None or not MemoryDataBase.__is_area(id, self.__district_names):
+            return None
+
+        if not self.__district_present[id - 1, year_index]:
+            return None
+
+        values = self.__district_values[AggregationType(aggregation_type)][[id - 1], year_index]
+        columns = MemoryDataBase.__to_python(values, FEATURES, aggregation_type)
+        return {
+            "district_name": self.__district_names[id - 1],
+            **{feature: column[0] for feature, column in zip(FEATURES, columns)}
+        }
+
+    async def get_area_history(self, id: int, is_by_district: bool=False,
+                               aggregation_type: str | None=None) -> dict[str, list[str | int | float]]:
+        if is_by_district:
+            if not MemoryDataBase.__is_area(id, self.__district_names):
+                return {}
+
+            year_indexes = np.flatnonzero(self.__district_present[id - 1])
+            values = self.__district_values[AggregationType(aggregation_type)][id - 1, year_indexes]
+            area_name = self.__district_names[id - 1]
+        else:
+            if not MemoryDataBase.__is_area(id, self.__region_names):
+                return {}
+
+            year_indexes = np.flatnonzero(self.__region_rows[id - 1] >= 0)
+            values = self.__row_features[self.__region_rows[id - 1, year_indexes]]
+            area_name = self.__region_names[id - 1]
+            aggregation_type = None
+
+        if len(year_indexes) == 0:
+            return {}
+
+        return {
+            "area_name": [area_name] * len(year_indexes),
+            "year": self.__years[year_indexes].tolist(),
+            **dict(zip(FEATURES, MemoryDataBase.__to_python(values, FEATURES, aggregation_type)))
+        }
+
+    async def get_feature_summary(self, feature: str, year: int, is_by_district: bool=False,
+                                  aggregation_type: str | None=None) -> dict[str, int | float] | None:
+        year_index = self.__year_index(year)
+        if year_index is None:
+            return None
+
+        key = AggregationType(aggregation_type) if is_by_district else None
+        summary = self.__summaries[key][year_index]
+        feature_index = FEATURE_INDEX[ColumnName(feature).value]
+        result = {}
+        for name, values in summary.items():
+            value = values[feature_index]
+            if name.endswith("_count"):
+                result[name] = int(value)
+            else:
+                result[name] = None if np.isnan(value) else float(value)
+        return result
+
+    @staticmethod
+    def __is_area(id: int, names: np.ndarray) -> bool:
+        return 1 <= id <= len(names)
+
+    async def get_feature_info(
+            self,
+            feature: str,
+            year: int,
+            is_by_district: bool,
+            aggregation_type: str,
+            use_filter: bool,
+            min_value: int,
+            max_value: int
+        ) -> list[dict[str, str | float]]:
+        year_index = self.__year_index(year)
+        if year_index is None:
+            return []
+
+        feature_index = FEATURE_INDEX[ColumnName(feature).value]
+        if is_by_district:
+            aggregation_type = AggregationType(aggregation_type)
+            names = self.__district_names
+            mask = self.__district_present[:, year_index].copy()
+            values = self.__district_values[aggregation_type][:, year_index, feature_index]
+            ratios = self.__district_ratios[aggregation_type][:, year_index, feature_index]
+        else:
+            names = self.__region_names
+            mask = self.__region_rows[:, year_index] >= 0
+            values = self.__region_values[:, year_index, feature_index]
+            ratios = self.__region_ratios[:, year_index, feature_index]
+
+        if use_filter:
+            if min_value is not None:
+                mask &= values >= min_value
+
+            if max_value is not None:
+                mask &= values <= max_value
+
+        indexes = np.flatnonzero(mask)
+        feature_values, feature_ratios = MemoryDataBase.__to_python(
+            np.stack([values[indexes], ratios[indexes]], axis=-1), ["feature_value", "feature_ratio"]
+        )
+        return [
+            {"area_id": area_id, "area_name": area_name, "feature_value": value, "feature_ratio": ratio}
+            for area_id, area_name, value, ratio
+            in zip((indexes + 1).tolist(), names[indexes].tolist(), feature_values, feature_ratios)
+        ]
+
+    async def get_statistic(
+            self,
+            required_columns: list[str],
+            year: int,
+            is_by_district: bool=False,
+            aggregation_type: str=None
+        ) -> dict[str, list[str | float]]:
+        year_index = self.__year_index(year)
+        if year_index is None:
+            return {}
+
+        features = [ColumnName(col).value for col in required_columns]
+        feature_indexes = [FEATURE_INDEX[feature] for feature in features]
+        if is_by_district:
+            indexes = np.flatnonzero(self.__district_present[:, year_index])
+            values = self.__district_values[AggregationType(aggregation_type)][indexes, year_index][:, feature_indexes]
+            columns = {"district_names": self.__district_names[indexes].tolist()}
+        else:
+            rows = self.__region_rows[:, year_index]
+            rows = rows[rows >= 0]
+            values = self.__row_features[rows][:, feature_indexes]
+            columns = {
+                "district_names": self.__district_names[self.__row_district_ids[rows] - 1].tolist(),
+                "region_names": self.__region_names[self.__row_region_ids[rows] - 1].tolist()
+            }
+            aggregation_type = None
+
+        if len(values) == 0:
+            return {}
+
+        columns.update(zip(features, MemoryDataBase.__to_python(values, features, aggregation_type)))
+        return columns
+
+    async def stream_statistic(
+            self,
+            required_columns: list[str],
+            year: int,
+            is_by_district: bool=False,
+            aggregation_type: str=None,
+            batch_size: int=DEFAULT_STREAM_BATCH_SIZE
+        ) -> AsyncIterator[dict[str, list[str | float]]]:
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+
+        columns = await self.get_statistic(required_columns, year, is_by_district, aggregation_type)
+        rows_count = len(next(iter(columns.values()), []))
+        for start in range(0, rows_count, batch_size):
+            yield {key: values[start:start + batch_size] for key, values in columns.items()}
+
+    async def stream_statistics_range(
+            self,
+            required_columns: list[str],
+            start_year: int | None=None,
+            end_year: int | None=None,
+            is_by_district: bool=False,
+            aggregation_type: str=None,
+            batch_size: int=DEFAULT_STREAM_BATCH_SIZE
+        ) -> AsyncIterator[dict[str, list[str | float]]]:
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+
+        for year in self.__years.tolist():
+            if (start_year is not None and year < start_year) or (end_year is not None and year > end_year):
+                continue
+
+            async for batch in self.stream_statistic(required_columns, year, is_by_district, aggregation_type,
+                                                     batch_size=batch_size):
+                yield {"year": [year] * len(next(iter(batch.values()))), **batch}
+
+    async def get_feature_graphs(self, aggregation_type: str='avg') -> dict[str, list[int | float]]:
+        if len(self.__years) == 0:
+            return {}
+
+        values = self.__year_values[AggregationType(aggregation_type)]
+        columns = {"year": self.__years.tolist()}
+        columns.update(zip(FEATURES, MemoryDataBase.__to_python(values, FEATURES, aggregation_type)))
+        return columns
+
+    async def get_areas(self, are_districts: bool=False) -> list[dict[str, int | str]]:
+        names = self.__district_names if are_districts else self.__region_names
+        return [{"id": id, "area_name": name} for id, name in enumerate(names.tolist(), start=1)]
+
+    async def get_years(self):
+        return self.__years.tolist()
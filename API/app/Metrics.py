@@ -0,0 +1,132 @@
+from bisect import bisect_left
+from collections.abc import Mapping
+from urllib.parse import parse_qs
+
+from .AccessLog import AccessRecord
+from .DataBase import AggregationType
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROWS_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+LABEL_NAMES = ("endpoint", "is_by_district", "aggregation_type")
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+AGGREGATION_TYPES = {aggregation_type.value for aggregation_type in AggregationType}
+
+
+def get_labels(scope, response_status: int | None) -> tuple[str, str, str]:
+    """
+    Metric labels of a request. Unknown routes and parameter values are collapsed,
+    so the number of series stays bounded.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched", "false", ""
+
+    params = parse_qs(scope["query_string"].decode("latin-1"))
+    if response_status is None or response_status >= 400:
+        params = {}
+    is_by_district = params.get("is_by_district", ["false"])[-1].lower() in TRUE_VALUES
+    aggregation_type = params.get("aggregation_type", [""])[-1]
+    if aggregation_type not in AGGREGATION_TYPES:
+        aggregation_type = ""
+    return route.path, str(is_by_district).lower(), aggregation_type
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Histogram:
+    """
+    Cumulative histogram with one series per combination of label values.
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple[int | float, ...],
+                 label_names: tuple[str, ...]=LABEL_NAMES):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.label_names = label_names
+        self.__series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: int | float):
+        series = self.__series.get(labels)
+        if series is None:
+            # Bucket counts, sum, count
+            series = self.__series[labels] = [[0] * len(self.buckets), 0, 0]
+
+        bucket_counts = series[0]
+        index = bisect_left(self.buckets, value)
+        if index < len(bucket_counts):
+            bucket_counts[index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        bucket_label_names = (*self.label_names, "le")
+        for labels, (bucket_counts, total, count) in sorted(self.__series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels(bucket_label_names, (*labels, str(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            bucket_labels = format_labels(bucket_label_names, (*labels, "+Inf"))
+            lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+def render_gauges(prefix: str, description: str, values: Mapping[str, int | float]) -> list[str]:
+    lines = []
+    for key, value in values.items():
+        name = f"{prefix}_{key}"
+        lines += [f"# HELP {name} {description} {key.replace("_", " ")}", f"# TYPE {name} gauge"]
+        lines.append(f"{name} {value}")
+    return lines
+
+
+class Metrics:
+    """
+    Request histograms exposed in the Prometheus text format.
+
+    Observations are made from the event loop only, so no locking is needed.
+    """
+
+    def __init__(self):
+        self.latency = Histogram(
+            "api_request_duration_seconds", "Total request latency in seconds.", LATENCY_BUCKETS
+        )
+        self.database_time = Histogram(
+            "api_database_duration_seconds", "Time spent executing SQL queries per request in seconds.",
+            LATENCY_BUCKETS
+        )
+        self.rows = Histogram(
+            "api_database_rows", "Rows returned by SQL queries per request.", ROWS_BUCKETS
+        )
+        self.serialization_time = Histogram(
+            "api_serialization_duration_seconds", "Time spent serializing the response per request in seconds.",
+            LATENCY_BUCKETS
+        )
+
+    def observe(self, scope, response_status: int | None, latency: float, record: AccessRecord):
+        labels = get_labels(scope, response_status)
+        self.latency.observe(labels, latency)
+        self.database_time.observe(labels, record.database_time)
+        self.rows.observe(labels, record.rows)
+        self.serialization_time.observe(labels, record.serialization_time)
+
+    def render(self, cache_stats: Mapping[str, int] | None=None,
+               pool_stats: Mapping[str, int | float] | None=None) -> str:
+        lines = []
+        for histogram in (self.latency, self.database_time, self.rows, self.serialization_time):
+            lines += histogram.render()
+        if cache_stats is not None:
+            lines += render_gauges("api_response_cache", "Response cache", cache_stats)
+        if pool_stats is not None:
+            lines += render_gauges("api_database_pool", "Database connection pool", pool_stats)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,70 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import Engine, event
+
+connection_requested_at: ContextVar[float | None] = ContextVar("connection_requested_at", default=None)
+
+
+class PoolMetrics:
+    """
+    Connection pool counters collected from SQLAlchemy pool events.
+
+    Wait time is measured from `track_wait` being entered until the pool hands out
+    a connection, so it includes time spent opening new connections.
+    """
+
+    def __init__(self, engine: Engine, timer: Callable[[], float]=perf_counter):
+        self.__pool = engine.pool
+        self.__timer = timer
+        self.__lock = Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+        event.listen(self.__pool, "connect", self.__on_connect)
+        event.listen(self.__pool, "checkout", self.__on_checkout)
+        event.listen(self.__pool, "checkin", self.__on_checkin)
+
+    @contextmanager
+    def track_wait(self) -> Iterator[None]:
+        token = connection_requested_at.set(self.__timer())
+        try:
+            yield
+        finally:
+            connection_requested_at.reset(token)
+
+    def __on_connect(self, dbapi_connection, connection_record):
+        with self.__lock:
+            self.connects += 1
+
+    def __on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        requested_at = connection_requested_at.get()
+        wait_time = 0.0 if requested_at is None else self.__timer() - requested_at
+        with self.__lock:
+            self.checkouts += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+    def __on_checkin(self, dbapi_connection, connection_record):
+        with self.__lock:
+            self.checkins += 1
+
+    def stats(self) -> dict[str, int | float]:
+        with self.__lock:
+            return {
+                "pool_size": self.__pool.size(),
+                "overflow": max(self.__pool.overflow(), 0),
+                "in_use": self.checkouts - self.checkins,
+                "idle": self.__pool.checkedin(),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "total_wait_time": self.total_wait_time,
+                "max_wait_time": self.max_wait_time,
+                "average_wait_time": self.total_wait_time / self.checkouts if self.checkouts != 0 else 0.0,
+            }
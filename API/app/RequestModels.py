@@ -1,15 +1,28 @@
+from datetime import datetime
 from enum import StrEnum
-from typing import Self
+from typing import Annotated, Self
 
 from pydantic import BaseModel, Field, model_validator
 
-from .DataBase import BORDER_YEAR, MAX_YEAR, MIN_FILTER_VALUE, MIN_ID, MIN_YEAR, AggregationType, AreaType, ColumnName
+from .DataBase import (
+    BORDER_YEAR,
+    MAX_BATCH_IDS,
+    MAX_YEAR,
+    MIN_FILTER_VALUE,
+    MIN_ID,
+    MIN_YEAR,
+    AggregationType,
+    AreaType,
+    ColumnName,
+)
+from .Ingestion import IngestionPhase
 
 
 class FileExtension(StrEnum):
 
     CSV = "csv"
     XLSX = "xlsx"
+    PARQUET = "parquet"
 
 
 class RegionRequest(BaseModel):
@@ -26,6 +39,22 @@ class RegionRequest(BaseModel):
     )
 
 
+class RegionsBatchRequest(BaseModel):
+
+    model_config = {"extra": "forbid"}
+
+    ids: list[Annotated[int, Field(ge=MIN_ID)]] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_IDS,
+        title="Region IDs"
+    )
+    years: list[Annotated[int, Field(ge=MIN_YEAR, le=MAX_YEAR)]] = Field(
+        min_length=1,
+        max_length=MAX_YEAR - MIN_YEAR + 1,
+        title="Years"
+    )
+
+
 class DistrictRequest(BaseModel):
 
     model_config = {"extra": "forbid"}
@@ -47,7 +76,8 @@ class DistrictResponse(BaseModel):
 
     investments: float
     grp: float | None
-    population: int | None
+    # Averaged over the regions of a district it is fractional
+    population: int | float | None
     unemployment: float | None
     average_salary: float | None = Field(
         title="Average salary"
@@ -71,6 +101,19 @@ class RegionResponse(DistrictResponse):
     region_name: str
 
 
+class RegionBatchObject(RegionResponse):
+
+    id: int = Field(
+        title="Region ID"
+    )
+    year: int
+
+
+class RegionsBatchResponse(BaseModel):
+
+    regions: list[RegionBatchObject]
+
+
 class FeatureRequest(BaseModel):
 
     model_config = {"extra": "forbid"}
@@ -164,6 +207,63 @@ class FeatureResponse(BaseModel):
     )
 
 
+class FeatureSummaryRequest(BaseModel):
+
+    model_config = {"extra": "forbid"}
+
+    feature: ColumnName
+    year: int = Field(
+        le=MAX_YEAR,
+        ge=MIN_YEAR
+    )
+    is_by_district: bool = Field(
+        default=False,
+        title="Is selection by district"
+    )
+    aggregation_type: AggregationType | None = Field(
+        default=None,
+        title="Aggregation type"
+    )
+
+    @model_validator(mode="after")
+    def validate_aggregation(self) -> Self:
+        if not self.is_by_district:
+            return self
+
+        if self.aggregation_type is None:
+            raise ValueError("Aggregation type is required, if you use selection by district.")
+
+        return self
+
+
+class FeatureSummaryResponse(BaseModel):
+
+    area_type: AreaType = Field(
+        title="Area type"
+    )
+    values_count: int = Field(
+        title="Number of areas with a value"
+    )
+    null_count: int = Field(
+        title="Number of areas without a value"
+    )
+    min_value: float | None = Field(
+        title="Min value"
+    )
+    max_value: float | None = Field(
+        title="Max value"
+    )
+    lower_quartile: float | None = Field(
+        title="Lower quartile"
+    )
+    median: float | None = Field(
+        title="Median"
+    )
+    upper_quartile: float | None = Field(
+        title="Upper quartile"
+    )
+
+
 class StaticticsRequest(BaseModel):
 
     model_config = {"extra": "forbid"}
@@ -272,6 +372,58 @@ class DownloadStatisticsRequest(StaticticsRequest):
     )
 
 
+class BulkDownloadStatisticsRequest(BaseModel):
+
+    model_config = {"extra": "forbid"}
+
+    required_columns: list[ColumnName] = Field(
+        title="Required columns"
+    )
+    start_year: int | None = Field(
+        default=None,
+        ge=MIN_YEAR,
+        le=MAX_YEAR,
+        title="First year, all years if not set"
+    )
+    end_year: int | None = Field(
+        default=None,
+        ge=MIN_YEAR,
+        le=MAX_YEAR,
+        title="Last year, all years if not set"
+    )
+    is_by_district: bool = Field(
+        default=False,
+        title="Is selection by district"
+    )
+    aggregation_type: AggregationType | None = Field(
+        default=None,
+        title="Aggregation type"
+    )
+    file_extension: FileExtension = Field(
+        title="File Extension"
+    )
+
+    @model_validator(mode="after")
+    def validate_aggregation(self) -> Self:
+        if not self.is_by_district:
+            return self
+
+        if self.aggregation_type is None:
+            raise ValueError("Aggregation type is required, if you use selection by district.")
+
+        return self
+
+    @model_validator(mode="after")
+    def validate_years(self) -> Self:
+        if self.start_year is None or self.end_year is None:
+            return self
+
+        if self.start_year > self.end_year:
+            raise ValueError("Start year must not be greater than end year.")
+
+        return self
+
+
 class FeatureGraphsRequest(BaseModel):
 
     model_config = {"extra": "forbid"}
@@ -320,6 +472,45 @@ class FeatureGraphsResponse(BaseModel):
     graphs: GraphObject
 
 
+class AreaHistoryRequest(BaseModel):
+
+    model_config = {"extra": "forbid"}
+
+    id: int = Field(
+        ge=MIN_ID,
+        title="Region or district ID"
+    )
+    is_by_district: bool = Field(
+        default=False,
+        title="Is selection by district"
+    )
+    aggregation_type: AggregationType | None = Field(
+        default=None,
+        title="Aggregation type"
+    )
+
+    @model_validator(mode="after")
+    def validate_aggregation(self) -> Self:
+        if not self.is_by_district:
+            return self
+
+        if self.aggregation_type is None:
+            raise ValueError("Aggregation type is required, if you use selection by district.")
+
+        return self
+
+
+class AreaHistoryResponse(BaseModel):
+
+    area_type: AreaType = Field(
+        title="Area type"
+    )
+    area_name: str = Field(
+        title="Area name"
+    )
+    history: GraphObject
+
+
 class AreaObject(BaseModel):
 
     id: int
@@ -352,3 +543,56 @@ class AvailableColumnsRequest(BaseModel):
 class AvailableColumnsResponse(BaseModel):
 
     columns_status: dict[ColumnName, bool]
+
+
+class PoolStatusResponse(BaseModel):
+
+    pool_size: int = Field(
+        title="Configured pool size"
+    )
+    overflow: int = Field(
+        title="Connections opened above the pool size"
+    )
+    in_use: int = Field(
+        title="Connections checked out"
+    )
+    idle: int = Field(
+        title="Connections waiting in the pool"
+    )
+    connects: int = Field(
+        title="Connections opened"
+    )
+    checkouts: int = Field(
+        title="Connection checkouts"
+    )
+    total_wait_time: float = Field(
+        title="Total checkout wait time in seconds"
+    )
+    max_wait_time: float = Field(
+        title="Max checkout wait time in seconds"
+    )
+    average_wait_time: float = Field(
+        title="Average checkout wait time in seconds"
+    )
+
+
+class IngestionStatusResponse(BaseModel):
+
+    phase: IngestionPhase = Field(
+        title="Phase of the data load"
+    )
+    path: str = Field(
+        title="Loaded data file"
+    )
+    rows: int = Field(
+        title="Rows loaded into the staging database"
+    )
+    started_at: datetime = Field(
+        title="Time the load started"
+    )
+    finished_at: datetime | None = Field(
+        title="Time the load finished or failed"
+    )
+    error: str | None = Field(
+        title="Error the load failed with"
+    )
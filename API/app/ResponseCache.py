@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from time import monotonic
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 3600.0
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses.
+
+    Entries expire after `ttl` seconds and all of them are dropped as soon as
+    a different data generation (see DataBase.generation) is requested.
+    """
+
+    def __init__(self, max_size: int=DEFAULT_CACHE_SIZE, ttl: float=DEFAULT_CACHE_TTL,
+                 timer: Callable[[], float]=monotonic):
+        if max_size < 0:
+            raise ValueError("Cache size must not be negative.")
+        if ttl <= 0:
+            raise ValueError("Cache TTL must be positive.")
+
+        self.__entries: OrderedDict[Hashable, tuple[float, bytes]] = OrderedDict()
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__timer = timer
+        self.__generation = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __sync_generation(self, generation: int):
+        if generation != self.__generation:
+            self.__entries.clear()
+            self.__generation = generation
+
+    def get(self, key: Hashable, generation: int) -> bytes | None:
+        self.__sync_generation(generation)
+
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, content = entry
+        if expires_at <= self.__timer():
+            del self.__entries[key]
+            self.misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def set(self, key: Hashable, generation: int, content: bytes):
+        # The data may have been reloaded while the response was being built
+        if generation != self.__generation or self.__max_size == 0:
+            return
+
+        self.__entries[key] = (self.__timer() + self.__ttl, content)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        self.__entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self.__entries), "hits": self.hits, "misses": self.misses}
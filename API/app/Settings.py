@@ -0,0 +1,132 @@
+from collections.abc import Mapping
+from enum import StrEnum
+from os import environ
+
+from dotenv import dotenv_values
+from pydantic import BaseModel, Field, model_validator
+
+from .AccessLog import DEFAULT_LOG_BATCH_SIZE, DEFAULT_LOG_FLUSH_INTERVAL
+from .DataBase import DEFAULT_THREAD_POOL_SIZE, LoadMode
+from .ResponseCache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL
+
+ENV_PREFIX = "API_"
+ENV_FILE_VARIABLE = ENV_PREFIX + "ENV_FILE"
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8000
+
+
+class SerializationMode(StrEnum):
+    PYDANTIC = "pydantic"
+    ORJSON = "orjson"
+
+
+class Settings(BaseModel):
+    """
+    Application settings. Every field is read from an `API_<FIELD>` environment variable,
+    e.g. `API_CACHE_SIZE`, or from the env file named by `API_ENV_FILE`; the environment wins.
+    """
+
+    sync: bool = Field(
+        default=False,
+        description="Use a temporary SQLite database instead of PostgreSQL"
+    )
+    memory: bool = Field(
+        default=False,
+        description="Use the columnar in-memory backend"
+    )
+    reset: bool = Field(
+        default=False,
+        description="Reset the database on startup; implied by path"
+    )
+    migrate: bool = Field(
+        default=False,
+        description="Create missing tables and indexes and rebuild derived tables on startup"
+    )
+    merge_duplicates: bool = Field(
+        default=False,
+        description="Let the migration delete all but the latest statistics row of a repeated region and year"
+    )
+    detail: bool = Field(
+        default=False,
+        description="Echo database queries"
+    )
+    path: str | None = Field(
+        default=None,
+        description="CSV file loaded on startup"
+    )
+    upsert: bool = Field(
+        default=False,
+        description="Merge path into the stored data instead of a reset: areas are matched by name, rows by year"
+    )
+    snapshot: str | None = Field(
+        default=None,
+        description="SQLite snapshot file: built from path, then served read-only instead of a temporary database"
+    )
+    log_path: str | None = None
+    log_batch_size: int = Field(default=DEFAULT_LOG_BATCH_SIZE, ge=1)
+    log_flush_interval: float = Field(default=DEFAULT_LOG_FLUSH_INTERVAL, gt=0)
+    thread_pool_size: int = Field(default=DEFAULT_THREAD_POOL_SIZE, ge=0)
+    load_mode: LoadMode = LoadMode.BULK
+    chunk_size: int | None = Field(default=None, ge=1)
+    cache_size: int = Field(default=DEFAULT_CACHE_SIZE, ge=0)
+    cache_ttl: float = Field(default=DEFAULT_CACHE_TTL, gt=0)
+    serialization: SerializationMode = SerializationMode.PYDANTIC
+    host: str = DEFAULT_HOST
+    port: int = DEFAULT_PORT
+    workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of worker processes serving requests"
+    )
+    read_only: bool = Field(
+        default=False,
+        description="Serve the prepared database as is: no reset, migration or data load on startup"
+    )
+
+    @model_validator(mode="after")
+    def check_workers(self):
+        if self.snapshot is not None and (not self.sync or self.memory):
+            raise ValueError("A snapshot is a SQLite file, it needs the sync backend.")
+        if self.workers > 1 and (self.memory or self.sync and self.snapshot is None):
+            raise ValueError("Several workers need PostgreSQL or a SQLite snapshot, other backends are per process.")
+        return self
+
+    @model_validator(mode="after")
+    def check_upsert(self):
+        if self.upsert and self.path is None:
+            raise ValueError("An upsert needs a data file path.")
+        return self
+
+    @property
+    def resets_database(self) -> bool:
+        return self.reset or self.path is not None and not self.upsert
+
+    @property
+    def prepares_database(self) -> bool:
+        return not self.read_only and (self.reset or self.migrate or self.path is not None)
+
+    @classmethod
+    def load(cls, environment: Mapping[str, str] | None=None, **overrides) -> "Settings":
+        environment = environ if environment is None else environment
+        values = {}
+        env_file = environment.get(ENV_FILE_VARIABLE)
+        if env_file is not None:
+            values |= cls.__from_variables(dotenv_values(env_file))
+        values |= cls.__from_variables(environment)
+        return cls.model_validate(values | overrides)
+
+    @classmethod
+    def __from_variables(cls, variables: Mapping[str, str | None]) -> dict[str, str]:
+        values = {}
+        for name in cls.model_fields:
+            value = variables.get(ENV_PREFIX + name.upper())
+            if value is not None and value != "":
+                values[name] = value
+        return values
+
+    def to_environment(self) -> dict[str, str]:
+        """Environment variables reproducing these settings in a worker process"""
+        return {
+            ENV_PREFIX + name.upper(): str(value).lower() if isinstance(value, bool) else str(value)
+            for name, value in self.model_dump().items() if value is not None
+        }
@@ -2,30 +2,50 @@ from argparse import ArgumentParser
 from asyncio import run
 from pathlib import Path
 
-from .DataBase import DataBase
+from .DataBase import DataBase, LoadMode
 
 parser = ArgumentParser("Database configuration parser")
 parser.add_argument("--reset", action="store_true")
-parser.add_argument("--file-name", nargs="?", dest="file_name", required=True)
+parser.add_argument("--migrate", action="store_true")
+parser.add_argument("--merge-duplicates", action="store_true", dest="merge_duplicates")
+parser.add_argument("--upsert", action="store_true")
+parser.add_argument("--file-name", nargs="?", dest="file_name")
+parser.add_argument("--load-mode", type=LoadMode, choices=list(LoadMode), default=LoadMode.BULK, dest="load_mode")
+parser.add_argument("--chunk-size", type=int, default=None, dest="chunk_size")
+
+
+def print_progress(loaded_rows: int):
+    print(f"Loaded {loaded_rows} rows", flush=True)
+
 
 async def main():
     args = parser.parse_args()
     reset, file_name = args.reset, args.file_name
+    if file_name is None and not args.migrate:
+        parser.error("--file-name is required unless --migrate is used")
 
-    base_path = "app/data/"
-    file_path = Path(base_path) / file_name
-    if not file_path.is_file():
-        raise ValueError(f"{file_path} is either missing or not a file.")
+    if file_name is not None:
+        base_path = "app/data/"
+        file_path = Path(base_path) / file_name
+        if not file_path.is_file():
+            raise ValueError(f"{file_path} is either missing or not a file.")
 
-    if file_path.suffix != ".csv":
-        raise ValueError("File extension is not '.csv'.")
+        if file_path.suffix != ".csv":
+            raise ValueError("File extension is not '.csv'.")
 
     db = DataBase(is_sync=False)
 
     if reset:
         await db.reset()
+    elif args.migrate:
+        await db.migrate(args.merge_duplicates)
+
+    if file_name is None:
+        return
 
-    await db.load_data(file_path)
+    await db.load_data(
+        file_path, mode=args.load_mode, chunk_size=args.chunk_size, on_progress=print_progress, upsert=args.upsert
+    )
 
 if __name__ == "__main__":
     run(main())
@@ -1,22 +1,52 @@
+import csv
 import logging
-from argparse import ArgumentParser
+from argparse import SUPPRESS, ArgumentParser
+from asyncio import run, to_thread
+from collections.abc import AsyncIterator, Callable, Mapping
 from contextlib import asynccontextmanager
-from io import BytesIO, StringIO
+from datetime import UTC, datetime
+from decimal import Decimal
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import cache, partial
+from io import StringIO
+from ipaddress import ip_address
+from itertools import repeat
+from os import environ, remove, replace
 from pathlib import Path
-from typing import Annotated
+from shutil import copyfile
+from tempfile import NamedTemporaryFile
+from types import NoneType
+from typing import Annotated, get_args, get_origin
 
-import pandas as pd
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 import uvicorn
 from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
+from openpyxl import Workbook
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
 
-from .DataBase import ColumnName, DataBase
+from .AccessLog import (
+    AccessLogMiddleware,
+    start_logging,
+    stop_logging,
+    track_serialization_time,
+)
+from .DataBase import INTEGER_COLUMNS, AggregationType, ColumnName, DataBase, LoadMode
+from .Ingestion import DEFAULT_INGESTION_CHUNK_SIZE, STAGING_SCHEMA, IngestionJob
+from .MemoryDataBase import MemoryDataBase
+from .Metrics import Metrics
 from .RequestModels import (
     BORDER_YEAR,
+    AreaHistoryRequest,
+    AreaHistoryResponse,
     AreasResponse,
     AvailableColumnsRequest,
     AvailableColumnsResponse,
+    BulkDownloadStatisticsRequest,
     DistrictRequest,
     DistrictResponse,
     DownloadStatisticsRequest,
@@ -24,15 +54,33 @@ from .RequestModels import (
     FeatureGraphsResponse,
     FeatureRequest,
     FeatureResponse,
+    FeatureSummaryRequest,
+    FeatureSummaryResponse,
     FileExtension,
+    IngestionStatusResponse,
+    PoolStatusResponse,
     RegionRequest,
     RegionResponse,
+    RegionsBatchRequest,
+    RegionsBatchResponse,
     StaticticsRequest,
     StatisticsResponse,
     YearsResponse,
 )
+from .ResponseCache import ResponseCache
+from .Settings import ENV_FILE_VARIABLE, SerializationMode, Settings
 
 V1_PREFIX = "/api/v1"
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHEET_NAME = "Regions"
+# Responses may be stored by browsers and proxies but are revalidated with the ETag on every use
+CACHE_CONTROL = "public, no-cache"
+EXPORT_MEDIA_TYPES = {
+    FileExtension.CSV: "text/csv",
+    FileExtension.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    FileExtension.PARQUET: "application/vnd.apache.parquet",
+}
 
 
 def check_file(path: str, extension: str):
@@ -44,31 +92,414 @@ def check_file(path: str, extension: str):
         raise ValueError(f"File extension is not {extension}.")
 
 
-async def get_database(request: Request) -> DataBase:
+async def get_database(request: Request) -> DataBase | MemoryDataBase:
     return request.app.state.db
 
 
+async def get_cache(request: Request) -> ResponseCache:
+    return request.app.state.cache
+
+
+def is_local_client(request: Request) -> bool:
+    if request.client is None:
+        return False
+    try:
+        return ip_address(request.client.host).is_loopback
+    except ValueError:
+        return False
+
+
+def get_cache_key(request: Request, query_params: BaseModel | None=None) -> tuple[str, str | None]:
+    return request.url.path, None if query_params is None else query_params.model_dump_json()
+
+
+def get_cached_response(cache: ResponseCache, key: tuple[str, str | None], generation: int,
+                        headers: dict[str, str] | None=None) -> Response | None:
+    content = cache.get(key, generation)
+    if content is None:
+        return None
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def get_validator_headers(dataset_info: Mapping) -> dict[str, str]:
+    return {
+        "ETag": f'W/"{dataset_info["version"]}"',
+        "Last-Modified": format_datetime(dataset_info["updated_at"].astimezone(UTC), usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+
+def is_not_modified(request: Request, etag: str, updated_at: datetime) -> bool:
+    # If-Modified-Since is only used when there is no If-None-Match (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        modified_since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if modified_since.tzinfo is None:
+        modified_since = modified_since.replace(tzinfo=UTC)
+    return updated_at.replace(microsecond=0) <= modified_since
+
+
+async def check_dataset_version(request: Request, db: Annotated[DataBase, Depends(get_database)]) -> dict[str, str]:
+    """
+    Validator headers of the loaded dataset. A matching conditional request is answered
+    with 304 here, before the endpoint runs, and the stamp itself is cached by the database.
+    """
+    dataset_info = await db.get_dataset_info()
+    if dataset_info is None:
+        return {}
+
+    headers = get_validator_headers(dataset_info)
+    if is_not_modified(request, headers["ETag"], dataset_info["updated_at"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return headers
+
+
+def orjson_default(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+@cache
+def get_converter(annotation) -> Callable | None:
+    """
+    Converter of a value to the type pydantic dumps for the annotation, None if the value is dumped as is.
+    The orjson mode skips validation, so e.g. integer populations of float columns are converted here.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return partial(coerce_response, annotation)
+    if annotation is float:
+        return float
+
+    args = [arg for arg in get_args(annotation) if arg is not NoneType]
+    if get_origin(annotation) is list:
+        item_converter = get_converter(args[0])
+        if item_converter is None:
+            return None
+        return lambda values: [None if value is None else item_converter(value) for value in values]
+    if len(args) == 1:
+        return get_converter(args[0])
+    if len(args) != 0 and all(isinstance(arg, type) and issubclass(arg, BaseModel) for arg in args):
+        # Like pydantic, which takes the first model of a union when they all match
+        return get_converter(args[0])
+    return None
+
+
+def coerce_response(response_model: type[BaseModel], data: Mapping) -> dict:
+    values = {}
+    for name, field in response_model.model_fields.items():
+        if name not in data:
+            if not field.is_required():
+                values[name] = field.get_default(call_default_factory=True)
+            continue
+
+        value = data[name]
+        converter = get_converter(field.annotation)
+        values[name] = value if value is None or converter is None else converter(value)
+    return values
+
+
+def serialize_response(mode: SerializationMode, response_model: type[BaseModel], data: dict) -> bytes:
+    if mode is SerializationMode.ORJSON:
+        return orjson.dumps(
+            coerce_response(response_model, data), default=orjson_default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return response_model.model_validate(data).model_dump_json().encode()
+
+
+def cache_response(request: Request, cache: ResponseCache, key: tuple[str, str | None], generation: int,
+                   response_model: type[BaseModel], data: dict, headers: dict[str, str] | None=None) -> Response:
+    with track_serialization_time():
+        content = serialize_response(request.app.state.serialization_mode, response_model, data)
+    cache.set(key, generation, content)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def stream_csv(first_batch: dict[str, list], batches: AsyncIterator[dict[str, list]]) -> AsyncIterator[str]:
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(first_batch.keys())
+    batch = first_batch
+    try:
+        while batch is not None:
+            with track_serialization_time():
+                writer.writerows(zip(*batch.values()))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            batch = await anext(batches, None)
+    finally:
+        await batches.aclose()
+
+
+def append_batch(workbook: Workbook, sheets: dict, batch: dict[str, list], sheet_column: str | None):
+    header = [key for key in batch.keys() if key != sheet_column]
+    sheet_names = repeat(DEFAULT_SHEET_NAME) if sheet_column is None else batch[sheet_column]
+    for sheet_name, row in zip(sheet_names, zip(*(batch[key] for key in header))):
+        sheet = sheets.get(sheet_name)
+        if sheet is None:
+            sheet = sheets[sheet_name] = workbook.create_sheet(str(sheet_name))
+            sheet.append(header)
+        sheet.append(row)
+
+
+async def write_xlsx(first_batch: dict[str, list], batches: AsyncIterator[dict[str, list]],
+                     sheet_column: str | None=None) -> str:
+    # Write-only workbooks keep rows on disk, every blocking step runs in a worker thread
+    workbook = Workbook(write_only=True)
+    sheets = {}
+    batch = first_batch
+    try:
+        while batch is not None:
+            with track_serialization_time():
+                await to_thread(append_batch, workbook, sheets, batch, sheet_column)
+            batch = await anext(batches, None)
+    finally:
+        await batches.aclose()
+
+    with NamedTemporaryFile(suffix=".xlsx", delete=False) as file:
+        file_path = file.name
+    with track_serialization_time():
+        await to_thread(workbook.save, file_path)
+    return file_path
+
+
+def get_parquet_schema(columns: list[str], aggregation_type: str | None) -> pa.Schema:
+    fields = []
+    for column in columns:
+        if column.endswith("_names"):
+            fields.append(pa.field(column, pa.string()))
+        elif column == "year" or (column in INTEGER_COLUMNS and aggregation_type != AggregationType.AVG):
+            fields.append(pa.field(column, pa.int64()))
+        else:
+            fields.append(pa.field(column, pa.float64()))
+    return pa.schema(fields)
+
+
+async def write_parquet(first_batch: dict[str, list], batches: AsyncIterator[dict[str, list]],
+                        aggregation_type: str | None) -> str:
+    schema = get_parquet_schema(list(first_batch.keys()), aggregation_type)
+    with NamedTemporaryFile(suffix=".parquet", delete=False) as file:
+        file_path = file.name
+
+    writer = pq.ParquetWriter(file_path, schema)
+    batch = first_batch
+    try:
+        while batch is not None:
+            with track_serialization_time():
+                await to_thread(writer.write_table, pa.Table.from_pydict(batch, schema=schema))
+            batch = await anext(batches, None)
+    finally:
+        await batches.aclose()
+        with track_serialization_time():
+            await to_thread(writer.close)
+    return file_path
+
+
+async def export_statistics(batches: AsyncIterator[dict[str, list]], file_extension: FileExtension,
+                            aggregation_type: str | None, sheet_column: str | None=None) -> Response:
+    first_batch = await anext(batches, None)
+    if first_batch is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="There is no data"
+        )
+
+    file_name = f"statistics.{file_extension.value}"
+    if file_extension is FileExtension.CSV:
+        return StreamingResponse(
+            stream_csv(first_batch, batches),
+            media_type=EXPORT_MEDIA_TYPES[file_extension],
+            headers={
+                "Content-Disposition": f'attachment; filename="{file_name}"'
+            }
+        )
+
+    if file_extension is FileExtension.XLSX:
+        file_path = await write_xlsx(first_batch, batches, sheet_column)
+    else:
+        file_path = await write_parquet(first_batch, batches, aggregation_type)
+
+    return FileResponse(
+        file_path,
+        media_type=EXPORT_MEDIA_TYPES[file_extension],
+        filename=file_name,
+        background=BackgroundTask(remove, file_path)
+    )
+
+
+def create_database(settings: Settings) -> DataBase | MemoryDataBase:
+    if settings.memory:
+        return MemoryDataBase()
+    return DataBase(
+        is_sync=settings.sync,
+        detail=settings.detail,
+        thread_pool_size=settings.thread_pool_size,
+        read_only=settings.read_only,
+        snapshot_path=settings.snapshot
+    )
+
+
+async def prepare_database(db: DataBase | MemoryDataBase, settings: Settings,
+                           on_progress: Callable[[int], None] | None=None):
+    """
+    Reset or migrate the database and load the data file, as requested by the settings.
+    A database created by an older version is migrated even without `--migrate`.
+    """
+    if settings.resets_database:
+        await db.reset()
+    elif settings.migrate:
+        await db.migrate(settings.merge_duplicates)
+    elif len(missing_tables := await db.get_missing_tables()) != 0:
+        logger.warning(f"Tables {', '.join(missing_tables)} are missing, migrating the database")
+        await db.migrate(settings.merge_duplicates)
+
+    if settings.path is not None:
+        check_file(settings.path, ".csv")
+        await db.load_data(
+            settings.path, mode=settings.load_mode, chunk_size=settings.chunk_size, on_progress=on_progress,
+            upsert=settings.upsert
+        )
+
+    if settings.snapshot is not None:
+        await db.optimize()
+
+
+async def check_tables(db: DataBase | MemoryDataBase):
+    """Fail on startup instead of on every request when a read-only database lacks tables"""
+    missing_tables = await db.get_missing_tables()
+    if len(missing_tables) != 0:
+        raise ValueError(
+            f"Tables {', '.join(missing_tables)} are missing, start the server once without --read-only "
+            "or with --migrate to create them."
+        )
+
+
+async def open_current_database(settings: Settings) -> DataBase | MemoryDataBase:
+    """Database serving requests while the data file is loaded in the background"""
+    if settings.snapshot is not None and Path(settings.snapshot).is_file():
+        return create_database(settings.model_copy(update={"read_only": True}))
+
+    if settings.sync or settings.memory:
+        # Nothing is kept between runs, an empty database answers until the load is done
+        db = create_database(settings.model_copy(update={"snapshot": None}))
+        await db.reset()
+        return db
+
+    # Requests are answered from the stored data until the load replaces it, so only an explicit reset empties it
+    db = create_database(settings)
+    if settings.reset:
+        await db.reset()
+    elif settings.migrate:
+        await db.migrate(settings.merge_duplicates)
+    else:
+        # The load is copied into every table, a new database or one older than some tables lacks them
+        await db.create_tables()
+    return db
+
+
+async def build_database(settings: Settings, on_progress: Callable[[int], None]) -> DataBase | MemoryDataBase:
+    """New database, or snapshot, with the data file loaded"""
+    if settings.snapshot is not None:
+        await prepare_once(settings, on_progress)
+        return create_database(settings.model_copy(update={"read_only": True}))
+
+    # A process-local database starts empty, so an upsert has nothing to keep
+    settings = settings.model_copy(update={"reset": True})
+    db = create_database(settings)
+    try:
+        await prepare_database(db, settings, on_progress)
+    except BaseException:
+        await db.dispose()
+        db.close()
+        raise
+    return db
+
+
+async def load_through_staging_schema(db: DataBase, settings: Settings, job: IngestionJob):
+    """
+    Load the data file into a staging schema of the PostgreSQL database, then copy it
+    into the served tables in one transaction.
+    """
+    staging = DataBase(is_sync=False, detail=settings.detail, schema=STAGING_SCHEMA)
+    try:
+        await staging.reset()
+        if settings.upsert:
+            await staging.copy_from(db)
+        await staging.load_data(
+            settings.path, mode=settings.load_mode, chunk_size=settings.chunk_size, on_progress=job.on_progress,
+            upsert=settings.upsert
+        )
+        job.start_switching()
+        await db.copy_from(staging)
+    finally:
+        await staging.drop()
+        await staging.dispose()
+        staging.close()
+
+
+def start_ingestion(app: FastAPI, settings: Settings) -> IngestionJob:
+    """
+    Load the data file in the background while requests are served from the current database.
+    SQLite and in-memory databases are built in a thread of their own and switched to when done.
+    """
+    # Chunks report progress, and let the event loop serve requests in between
+    settings = settings.model_copy(update={"chunk_size": settings.chunk_size or DEFAULT_INGESTION_CHUNK_SIZE})
+
+    async def load(job: IngestionJob):
+        check_file(settings.path, ".csv")
+        if not settings.sync and not settings.memory:
+            await load_through_staging_schema(app.state.db, settings, job)
+            return
+
+        db = await to_thread(run, build_database(settings, job.on_progress))
+        job.start_switching()
+        previous_db = app.state.db
+        app.state.db = db
+        job.retire(previous_db)
+
+    job = IngestionJob(settings.path)
+    job.start(load)
+    return job
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    parser = ArgumentParser("Database configuration parser")
-    parser.add_argument("--sync", action="store_true")
-    parser.add_argument("--reset", action="store_true")
-    parser.add_argument("--detail", action="store_true")
-    parser.add_argument("--path", nargs="?")
-    parser.add_argument("--log-path", nargs="?", dest="log_path")
-    args = parser.parse_args()
-    is_sync, reset, detail, path, log_path = args.sync, args.reset, args.detail, args.path, args.log_path
-    if path is not None:
-        reset = True
+    settings = Settings.load()
+    log_path = settings.log_path
+    loads_in_background = settings.path is not None and not settings.read_only
 
-    app.state.db = DataBase(is_sync=is_sync, detail=detail)
+    app.state.settings = settings
+    app.state.cache = ResponseCache(max_size=settings.cache_size, ttl=settings.cache_ttl)
+    app.state.serialization_mode = settings.serialization
+    app.state.ingestion = None
 
-    if reset:
-        await app.state.db.reset()
+    if loads_in_background:
+        check_file(settings.path, ".csv")
+        app.state.db = await open_current_database(settings)
+    else:
+        if settings.snapshot is not None:
+            # A snapshot is only written while it is built and always served read-only
+            if settings.prepares_database:
+                await prepare_once(settings)
+            settings = settings.model_copy(update={"read_only": True})
 
-    if path is not None:
-        check_file(path, ".csv")
-        await app.state.db.load_data(path)
+        app.state.db = create_database(settings)
+        if settings.read_only:
+            await check_tables(app.state.db)
+        else:
+            await prepare_database(app.state.db, settings)
 
     if log_path is not None:
         check_file(log_path, ".log")
@@ -82,17 +513,20 @@ async def lifespan(app: FastAPI):
         else:
             log_file_path = "app/data/logs.log"
 
-    logging.basicConfig(
-        filename=log_file_path,
-        level=logging.INFO,
-        encoding="utf-8",
-        format="%(asctime)s %(message)s",
-        datefmt='%d/%m/%Y %H:%M:%S'
+    log_listener = start_logging(
+        log_file_path, batch_size=settings.log_batch_size, flush_interval=settings.log_flush_interval
     )
 
+    if loads_in_background:
+        app.state.ingestion = start_ingestion(app, settings)
+
     yield
 
+    if app.state.ingestion is not None:
+        await app.state.ingestion.close()
+    await app.state.db.dispose()
     app.state.db.close()
+    stop_logging(log_listener)
 
 
 app = FastAPI(
@@ -100,6 +534,11 @@ app = FastAPI(
     docs_url=V1_PREFIX + "/docs",
     openapi_url=V1_PREFIX + "/openapi.json"
 )
+app.state.cache = ResponseCache()
+app.state.serialization_mode = SerializationMode.PYDANTIC
+app.state.metrics = Metrics()
+app.state.settings = Settings()
+app.state.ingestion = None
 
 origins = [
     "http://localhost:8000",
@@ -112,6 +551,7 @@ app.add_middleware(
     allow_methods=["GET"],
     allow_headers=["*"],
 )
+app.add_middleware(AccessLogMiddleware, metrics=app.state.metrics)
 
 
 @app.get(V1_PREFIX + '/region-info/',
@@ -120,8 +560,13 @@ app.add_middleware(
          status_code=status.HTTP_200_OK)
 async def get_region_info(request: Request,
                           query_params: Annotated[RegionRequest, Query()],
-                          db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /region-info/")
+                          db: Annotated[DataBase, Depends(get_database)],
+                          cache: Annotated[ResponseCache, Depends(get_cache)],
+                          validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     region = await db.get_region_info(
         id=query_params.id,
         year=query_params.year
@@ -131,7 +576,31 @@ async def get_region_info(request: Request,
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Region for id={query_params.id} and year={query_params.year} not found"
         )
-    return region
+    return cache_response(request, cache, cache_key, generation, RegionResponse, region, validators)
+
+@app.get(V1_PREFIX + '/batch-region-info/',
+         description="Get overview statistics about several regions for several years",
+         response_model=RegionsBatchResponse,
+         status_code=status.HTTP_200_OK)
+async def get_batch_region_info(request: Request,
+                                query_params: Annotated[RegionsBatchRequest, Query()],
+                                db: Annotated[DataBase, Depends(get_database)],
+                                cache: Annotated[ResponseCache, Depends(get_cache)],
+                                validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
+    regions = await db.get_regions_info(
+        ids=query_params.ids,
+        years=query_params.years
+    )
+    if len(regions) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No regions found for the requested ids and years"
+        )
+    return cache_response(request, cache, cache_key, generation, RegionsBatchResponse, {"regions": regions}, validators)
 
 @app.get(V1_PREFIX + '/district-info/',
          description="Get overview statistics about the district by year",
@@ -139,8 +608,13 @@ async def get_region_info(request: Request,
          status_code=status.HTTP_200_OK)
 async def get_district_info(request: Request,
                             query_params: Annotated[DistrictRequest, Query()],
-                            db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /district-info/")
+                            db: Annotated[DataBase, Depends(get_database)],
+                            cache: Annotated[ResponseCache, Depends(get_cache)],
+                            validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     district = await db.get_district_info(
         id=query_params.id,
         year=query_params.year,
@@ -151,7 +625,7 @@ async def get_district_info(request: Request,
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"District for id={query_params.id} and year={query_params.year} not found"
         )
-    return district
+    return cache_response(request, cache, cache_key, generation, DistrictResponse, district, validators)
 
 @app.get(V1_PREFIX + '/feature-info/',
          description="Get information about a specific feature by regions or districts",
@@ -159,8 +633,13 @@ async def get_district_info(request: Request,
          status_code=status.HTTP_200_OK)
 async def get_feature_info(request: Request,
                            query_params: Annotated[FeatureRequest, Query()],
-                           db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /feature-info/")
+                           db: Annotated[DataBase, Depends(get_database)],
+                           cache: Annotated[ResponseCache, Depends(get_cache)],
+                           validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     features = await db.get_feature_info(
         feature=query_params.feature,
         year=query_params.year,
@@ -176,7 +655,39 @@ async def get_feature_info(request: Request,
             detail=f"No features by {"districts" if query_params.is_by_district else "regions"} found"
         )
     area_type = "district" if query_params.is_by_district else "region"
-    return {"area_type": area_type, "features": features}
+    return cache_response(
+        request, cache, cache_key, generation, FeatureResponse, {"area_type": area_type, "features": features},
+        validators
+    )
+
+@app.get(V1_PREFIX + '/feature-summary/',
+         description="Get precomputed min, max, quartiles and null count of a feature by regions or districts",
+         response_model=FeatureSummaryResponse,
+         status_code=status.HTTP_200_OK)
+async def get_feature_summary(request: Request,
+                              query_params: Annotated[FeatureSummaryRequest, Query()],
+                              db: Annotated[DataBase, Depends(get_database)],
+                              cache: Annotated[ResponseCache, Depends(get_cache)],
+                              validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
+    summary = await db.get_feature_summary(
+        feature=query_params.feature,
+        year=query_params.year,
+        is_by_district=query_params.is_by_district,
+        aggregation_type=query_params.aggregation_type
+    )
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No summary for year={query_params.year} found"
+        )
+    area_type = "district" if query_params.is_by_district else "region"
+    return cache_response(
+        request, cache, cache_key, generation, FeatureSummaryResponse, {"area_type": area_type, **summary}, validators
+    )
 
 @app.get(V1_PREFIX + '/statistics/',
          description="Get overview statistics by regions or districts",
@@ -184,8 +695,13 @@ async def get_feature_info(request: Request,
          status_code=status.HTTP_200_OK)
 async def get_statistics(request: Request,
                          query_params: Annotated[StaticticsRequest, Query()],
-                         db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /statistics/")
+                         db: Annotated[DataBase, Depends(get_database)],
+                         cache: Annotated[ResponseCache, Depends(get_cache)],
+                         validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     data = await db.get_statistic(
         required_columns=query_params.required_columns,
         year=query_params.year,
@@ -199,12 +715,9 @@ async def get_statistics(request: Request,
         )
 
     area_type = "district" if query_params.is_by_district else "region"
-    table = {col_name: [] for col_name in data[0].keys()}
-    for elem in data:
-        for key, value in elem.items():
-            table[key].append(value)
-
-    return {"area_type": area_type, "table": table}
+    return cache_response(
+        request, cache, cache_key, generation, StatisticsResponse, {"area_type": area_type, "table": data}, validators
+    )
 
 @app.get(V1_PREFIX + '/download-statistics/',
          description="Download overview statistics by regions or districts",
@@ -212,47 +725,29 @@ async def get_statistics(request: Request,
 async def download_statistics(request: Request,
                               query_params: Annotated[DownloadStatisticsRequest, Query()],
                               db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /download-statistics/")
-    data = await db.get_statistic(
+    batches = db.stream_statistic(
         required_columns=query_params.required_columns,
         year=query_params.year,
         is_by_district=query_params.is_by_district,
         aggregation_type=query_params.aggregation_type
     )
-    if len(data) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="There is no data"
-        )
-
-    table = {col_name: [] for col_name in data[0].keys()}
-    for elem in data:
-        for key, value in elem.items():
-            table[key].append(value)
+    return await export_statistics(batches, query_params.file_extension, query_params.aggregation_type)
 
-    dataframe = pd.DataFrame(table)
-
-    if query_params.file_extension is FileExtension.CSV:
-        buffer = StringIO()
-        dataframe.to_csv(buffer, index=False, encoding="utf-8-sig")
-        media_type = "text/csv"
-        file_name = "statistics.csv"
-    else:
-        buffer = BytesIO()
-        dataframe.to_excel(buffer, sheet_name="Regions", index=False)
-        media_type = (
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        file_name = "statistics.xlsx"
-
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
-        media_type=media_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{file_name}"'
-        }
+@app.get(V1_PREFIX + '/bulk-download-statistics/',
+         description="Download overview statistics by regions or districts for a range of years or all years",
+         status_code=status.HTTP_200_OK)
+async def bulk_download_statistics(request: Request,
+                                   query_params: Annotated[BulkDownloadStatisticsRequest, Query()],
+                                   db: Annotated[DataBase, Depends(get_database)]):
+    batches = db.stream_statistics_range(
+        required_columns=query_params.required_columns,
+        start_year=query_params.start_year,
+        end_year=query_params.end_year,
+        is_by_district=query_params.is_by_district,
+        aggregation_type=query_params.aggregation_type
+    )
+    return await export_statistics(
+        batches, query_params.file_extension, query_params.aggregation_type, sheet_column="year"
     )
 
 
@@ -262,8 +757,13 @@ async def download_statistics(request: Request,
          status_code=status.HTTP_200_OK)
 async def get_feature_graphs(request: Request,
                              query_params: Annotated[FeatureGraphsRequest, Query()],
-                             db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /feature-graphs/")
+                             db: Annotated[DataBase, Depends(get_database)],
+                             cache: Annotated[ResponseCache, Depends(get_cache)],
+                             validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     data = await db.get_feature_graphs(aggregation_type=query_params.aggregation_type)
     if len(data) == 0:
         raise HTTPException(
@@ -271,19 +771,51 @@ async def get_feature_graphs(request: Request,
             detail="There is no data"
         )
 
-    graphs = {col_name: [] for col_name in data[0].keys()}
-    for elem in data:
-        for key, value in elem.items():
-            graphs[key].append(value)
+    return cache_response(request, cache, cache_key, generation, FeatureGraphsResponse, {"graphs": data}, validators)
 
-    return {"graphs": graphs}
+@app.get(V1_PREFIX + "/area-history/",
+         description="Get all features of a region or district across all years",
+         response_model=AreaHistoryResponse,
+         status_code=status.HTTP_200_OK)
+async def get_area_history(request: Request,
+                           query_params: Annotated[AreaHistoryRequest, Query()],
+                           db: Annotated[DataBase, Depends(get_database)],
+                           cache: Annotated[ResponseCache, Depends(get_cache)],
+                           validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request, query_params), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
+    history = await db.get_area_history(
+        id=query_params.id,
+        is_by_district=query_params.is_by_district,
+        aggregation_type=query_params.aggregation_type
+    )
+    area_type = "district" if query_params.is_by_district else "region"
+    if len(history) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No {area_type} for id={query_params.id} found"
+        )
+
+    area_name = history.pop("area_name")[0]
+    return cache_response(
+        request, cache, cache_key, generation, AreaHistoryResponse,
+        {"area_type": area_type, "area_name": area_name, "history": history}, validators
+    )
 
 @app.get(V1_PREFIX + "/regions/",
          description="Get region names",
          response_model=AreasResponse,
          status_code=status.HTTP_200_OK)
-async def get_region_names(request: Request, db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /regions/")
+async def get_region_names(request: Request,
+                           db: Annotated[DataBase, Depends(get_database)],
+                           cache: Annotated[ResponseCache, Depends(get_cache)],
+                           validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     areas = await db.get_areas()
     if len(areas) == 0:
         raise HTTPException(
@@ -291,14 +823,20 @@ async def get_region_names(request: Request, db: Annotated[DataBase, Depends(get
             detail="There is no regions"
         )
 
-    return {"areas": areas}
+    return cache_response(request, cache, cache_key, generation, AreasResponse, {"areas": areas}, validators)
 
 @app.get(V1_PREFIX + "/districts/",
          description="Get district names",
          response_model=AreasResponse,
          status_code=status.HTTP_200_OK)
-async def get_district_names(request: Request, db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /districts/")
+async def get_district_names(request: Request,
+                             db: Annotated[DataBase, Depends(get_database)],
+                             cache: Annotated[ResponseCache, Depends(get_cache)],
+                             validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     areas = await db.get_areas(are_districts=True)
     if len(areas) == 0:
         raise HTTPException(
@@ -306,28 +844,114 @@ async def get_district_names(request: Request, db: Annotated[DataBase, Depends(g
             detail="There is no districts"
         )
 
-    return {"areas": areas}
+    return cache_response(request, cache, cache_key, generation, AreasResponse, {"areas": areas}, validators)
 
 @app.get(V1_PREFIX + "/years/",
          description="Get existing years",
          response_model=YearsResponse,
          status_code=status.HTTP_200_OK)
-async def get_years(request: Request, db: Annotated[DataBase, Depends(get_database)]):
-    logging.info(f"User {request.client.host} requested /years/")
+async def get_years(request: Request,
+                    db: Annotated[DataBase, Depends(get_database)],
+                    cache: Annotated[ResponseCache, Depends(get_cache)],
+                    validators: Annotated[dict[str, str], Depends(check_dataset_version)]):
+    cache_key, generation = get_cache_key(request), db.generation
+    if (response := get_cached_response(cache, cache_key, generation, validators)) is not None:
+        return response
+
     years = await db.get_years()
     if len(years) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="There is no districts"
         )
-    return {"years": years}
+    return cache_response(request, cache, cache_key, generation, YearsResponse, {"years": years}, validators)
+
+@app.get(V1_PREFIX + "/pool-status/",
+         description="Get database connection pool metrics, only available from the local host",
+         response_model=PoolStatusResponse,
+         status_code=status.HTTP_200_OK,
+         include_in_schema=False)
+async def get_pool_status(request: Request, db: Annotated[DataBase, Depends(get_database)]):
+    if not is_local_client(request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Pool status is only available from the local host"
+        )
+    if db.pool_metrics is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The database has no connection pool"
+        )
+    return db.pool_metrics.stats()
+
+@app.get(V1_PREFIX + "/ingestion/",
+         description="Get the status of the last background data load",
+         response_model=IngestionStatusResponse,
+         status_code=status.HTTP_200_OK)
+async def get_ingestion_status(request: Request):
+    job = request.app.state.ingestion
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No data load has been started"
+        )
+    return job.status()
+
+@app.post(V1_PREFIX + "/ingestion/",
+          description="Reload the data file in the background, only available from the local host",
+          response_model=IngestionStatusResponse,
+          status_code=status.HTTP_202_ACCEPTED,
+          include_in_schema=False)
+async def start_ingestion_job(request: Request):
+    if not is_local_client(request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Data loads can only be started from the local host"
+        )
+
+    settings = request.app.state.settings
+    if settings.path is None or settings.read_only:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="There is no data file to load"
+        )
+
+    previous_job = request.app.state.ingestion
+    if previous_job is not None:
+        if previous_job.is_running:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A data load is already running"
+            )
+        await previous_job.close()
+
+    job = request.app.state.ingestion = start_ingestion(request.app, settings)
+    return job.status()
+
+@app.get("/metrics",
+         description="Get request metrics in the Prometheus text format, only available from the local host",
+         response_class=PlainTextResponse,
+         include_in_schema=False)
+async def get_metrics(request: Request,
+                      db: Annotated[DataBase, Depends(get_database)],
+                      cache: Annotated[ResponseCache, Depends(get_cache)]):
+    if not is_local_client(request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Metrics are only available from the local host"
+        )
+
+    pool_stats = None if db.pool_metrics is None else db.pool_metrics.stats()
+    return PlainTextResponse(
+        request.app.state.metrics.render(cache.stats(), pool_stats),
+        media_type="text/plain; version=0.0.4"
+    )
 
 @app.get(V1_PREFIX + "/available-columns/",
          description="Get available columns by year",
          response_model=AvailableColumnsResponse,
          status_code=status.HTTP_200_OK)
 async def get_available_columns(request: Request, query: Annotated[AvailableColumnsRequest, Query()]):
-    logging.info(f"User {request.client.host} requested /available-columns/")
     year = query.year
     result = {}
     for column in ColumnName:
@@ -343,5 +967,92 @@ async def get_available_columns(request: Request, query: Annotated[AvailableColu
     return {"columns_status": result}
 
 
+def get_argument_parser() -> ArgumentParser:
+    # Only passed options override the environment, see Settings.load
+    parser = ArgumentParser("API server", argument_default=SUPPRESS)
+    parser.add_argument("--env-file", dest="env_file")
+    parser.add_argument("--sync", action="store_true")
+    parser.add_argument("--memory", action="store_true")
+    parser.add_argument("--reset", action="store_true")
+    parser.add_argument("--migrate", action="store_true")
+    parser.add_argument("--merge-duplicates", action="store_true", dest="merge_duplicates")
+    parser.add_argument("--detail", action="store_true")
+    parser.add_argument("--path")
+    parser.add_argument("--upsert", action="store_true")
+    parser.add_argument("--snapshot")
+    parser.add_argument("--log-path", dest="log_path")
+    parser.add_argument("--log-batch-size", type=int, dest="log_batch_size")
+    parser.add_argument("--log-flush-interval", type=float, dest="log_flush_interval")
+    parser.add_argument("--thread-pool-size", type=int, dest="thread_pool_size")
+    parser.add_argument("--load-mode", type=LoadMode, choices=list(LoadMode), dest="load_mode")
+    parser.add_argument("--chunk-size", type=int, dest="chunk_size")
+    parser.add_argument("--cache-size", type=int, dest="cache_size")
+    parser.add_argument("--cache-ttl", type=float, dest="cache_ttl")
+    parser.add_argument("--serialization", type=SerializationMode, choices=list(SerializationMode))
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--read-only", action="store_true", dest="read_only")
+    return parser
+
+
+async def prepare_once(settings: Settings, on_progress: Callable[[int], None] | None=None):
+    """
+    Prepare the database with a connection of its own. A snapshot is built in a copy next to it
+    and moved into place when done, so processes reading the old file never see a half-written one.
+    """
+    snapshot = staging = None
+    if settings.snapshot is not None:
+        snapshot = Path(settings.snapshot)
+        staging = snapshot.with_name(snapshot.name + ".building")
+        staging.unlink(missing_ok=True)
+        if snapshot.is_file() and not settings.resets_database:
+            # A migration or an upsert keeps the data
+            copyfile(snapshot, staging)
+        settings = settings.model_copy(update={"snapshot": str(staging)})
+
+    db = create_database(settings)
+    try:
+        try:
+            await prepare_database(db, settings, on_progress)
+        finally:
+            await db.dispose()
+            db.close()
+    except BaseException:
+        if staging is not None:
+            staging.unlink(missing_ok=True)
+        raise
+
+    if snapshot is not None:
+        replace(staging, snapshot)
+
+
+def serve(argv: list[str] | None=None):
+    """
+    Start the server. With several workers the database or snapshot is reset, migrated and loaded
+    here, once, and the workers are started read-only against it.
+    """
+    parser = get_argument_parser()
+    options = vars(parser.parse_args(argv))
+    if "env_file" in options:
+        environ[ENV_FILE_VARIABLE] = options.pop("env_file")
+    try:
+        settings = Settings.load(**options)
+    except ValidationError as error:
+        parser.error(str(error))
+
+    if settings.workers == 1:
+        environ.update(settings.to_environment())
+        uvicorn.run(app, host=settings.host, port=settings.port)
+        return
+
+    # PostgreSQL created by an older version is migrated here, a snapshot is only prepared when asked to
+    if settings.prepares_database or settings.snapshot is None and not settings.read_only:
+        run(prepare_once(settings))
+    # Worker processes import the app again and read their settings from the environment
+    environ.update(settings.model_copy(update={"read_only": True}).to_environment())
+    uvicorn.run("app.main:app", host=settings.host, port=settings.port, workers=settings.workers)
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    serve()
@@ -0,0 +1,82 @@
+import json
+import logging
+from time import sleep
+
+from ..AccessLog import BatchingHandler, logger, start_logging, stop_logging
+from ..main import V1_PREFIX, app
+from .testconf import StatusCode, client, test_db
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+
+def get_access_records(caplog) -> list[dict]:
+    return [json.loads(record.getMessage()) for record in caplog.records if record.name == logger.name]
+
+
+class TestSuccessCases:
+
+    def test_access_record(self, client, caplog):
+        app.state.cache.clear()
+        caplog.set_level(logging.INFO, logger=logger.name)
+
+        response = client.get(f"{V1_PREFIX}/statistics/?required_columns=grp&required_columns=crimes&year=2020")
+        assert response.status_code == StatusCode.Success
+
+        [record] = get_access_records(caplog)
+        assert record["method"] == "GET"
+        assert record["path"] == f"{V1_PREFIX}/statistics/"
+        assert record["params"] == {"required_columns": ["grp", "crimes"], "year": ["2020"]}
+        assert record["status"] == StatusCode.Success
+        assert record["latency_ms"] >= record["db_time_ms"] > 0
+
+    def test_failed_request(self, client, caplog):
+        caplog.set_level(logging.INFO, logger=logger.name)
+
+        response = client.get(f"{V1_PREFIX}/region-info/?id=1")
+        assert response.status_code == StatusCode.ValidationError
+
+        [record] = get_access_records(caplog)
+        assert record["status"] == StatusCode.ValidationError
+        assert record["db_time_ms"] == 0
+
+    def test_batching_handler(self):
+        target = ListHandler()
+        handler = BatchingHandler(target, capacity=3, flush_interval=60)
+        for index in range(4):
+            handler.handle(logging.makeLogRecord({"msg": str(index), "levelno": logging.INFO}))
+        assert target.messages == ["0", "1", "2"]
+
+        handler.close()
+        assert target.messages == ["0", "1", "2", "3"]
+
+    def test_periodic_flush(self):
+        target = ListHandler()
+        handler = BatchingHandler(target, capacity=100, flush_interval=0.01)
+        handler.handle(logging.makeLogRecord({"msg": "record", "levelno": logging.INFO}))
+        for _ in range(100):
+            if len(target.messages) != 0:
+                break
+            sleep(0.01)
+        handler.close()
+
+        assert target.messages == ["record"]
+
+    def test_restart_logging(self, tmp_path):
+        root_handlers = list(logging.getLogger().handlers)
+        paths = [tmp_path / "first.log", tmp_path / "second.log"]
+        for path in paths:
+            listener = start_logging(str(path), flush_interval=60)
+            logger.info(path.name)
+            stop_logging(listener)
+            assert logging.getLogger().handlers == root_handlers
+
+        for path in paths:
+            [line] = path.read_text(encoding="utf-8").splitlines()
+            assert line.endswith(path.name)
@@ -0,0 +1,56 @@
+from asyncio import run
+
+from ..main import V1_PREFIX
+from ..RequestModels import AreaHistoryResponse
+from .testconf import StatusCode, client, test_db
+
+ID = 1
+AGGREGATION_TYPE = "sum"
+
+
+class TestSuccessfulCases:
+
+    def test_region_history(self, client, test_db):
+
+        response = client.get(f"{V1_PREFIX}/area-history/?id={ID}")
+
+        assert response.status_code == StatusCode.Success
+
+        data = AreaHistoryResponse(**response.json())
+        assert data.area_type == "region"
+        assert data.history.year == sorted(data.history.year)
+        for year, investments in zip(data.history.year, data.history.investments):
+            region = run(test_db.get_region_info(ID, year))
+            assert data.area_name == region["region_name"]
+            assert investments == region["investments"]
+
+    def test_district_history(self, client, test_db):
+
+        response = client.get(
+            f"{V1_PREFIX}/area-history/?id={ID}&is_by_district=true&aggregation_type={AGGREGATION_TYPE}"
+        )
+
+        assert response.status_code == StatusCode.Success
+
+        data = AreaHistoryResponse(**response.json())
+        assert data.area_type == "district"
+        for year, grp in zip(data.history.year, data.history.grp):
+            district = run(test_db.get_district_info(ID, year, AGGREGATION_TYPE))
+            assert data.area_name == district["district_name"]
+            assert grp == district["grp"]
+
+
+class TestFailureCases:
+
+    def test_data_lack(self, client):
+
+        no_data_response = client.get(f"{V1_PREFIX}/area-history/")
+        assert no_data_response.status_code == StatusCode.ValidationError
+
+        no_aggregation_response = client.get(f"{V1_PREFIX}/area-history/?id={ID}&is_by_district=true")
+        assert no_aggregation_response.status_code == StatusCode.ValidationError
+
+    def test_not_found(self, client):
+
+        response = client.get(f"{V1_PREFIX}/area-history/?id={10 ** 6}")
+        assert response.status_code == StatusCode.NotFound
@@ -0,0 +1,64 @@
+from asyncio import run
+
+from ..DataBase import MAX_BATCH_IDS, MAX_YEAR
+from ..main import V1_PREFIX
+from ..RequestModels import RegionsBatchResponse
+from .testconf import StatusCode, client, test_db
+
+IDS = [1, 2, 3]
+YEARS = [2016, 2018]
+
+
+def get_url(ids: list[int], years: list[int]) -> str:
+    params = [f"ids={id}" for id in ids] + [f"years={year}" for year in years]
+    return f"{V1_PREFIX}/batch-region-info/?" + "&".join(params)
+
+
+class TestSuccessfulCases:
+
+    def test_get_batch_region_info(self, client, test_db):
+
+        response = client.get(get_url(IDS, YEARS))
+
+        assert response.status_code == StatusCode.Success
+
+        regions = RegionsBatchResponse(**response.json()).regions
+        assert [(region.id, region.year) for region in regions] == [(id, year) for id in IDS for year in YEARS]
+        for region in regions:
+            expected = run(test_db.get_region_info(region.id, region.year))
+            assert region.region_name == expected["region_name"]
+            assert region.investments == expected["investments"]
+
+    def test_missing_pairs_are_skipped(self, client):
+
+        response = client.get(get_url([IDS[0], 10 ** 6], YEARS))
+
+        assert response.status_code == StatusCode.Success
+        assert {region["id"] for region in response.json()["regions"]} == {IDS[0]}
+
+
+class TestFailureCases:
+
+    def test_data_lack(self, client):
+
+        no_data_response = client.get(f"{V1_PREFIX}/batch-region-info/")
+        assert no_data_response.status_code == StatusCode.ValidationError
+
+        no_years_response = client.get(get_url(IDS, []))
+        assert no_years_response.status_code == StatusCode.ValidationError
+
+    def test_wrong_values(self, client):
+
+        too_big_year_response = client.get(get_url(IDS, [MAX_YEAR + 1]))
+        assert too_big_year_response.status_code == StatusCode.ValidationError
+
+        wrong_id_response = client.get(get_url([0], YEARS))
+        assert wrong_id_response.status_code == StatusCode.ValidationError
+
+        too_many_ids_response = client.get(get_url(list(range(1, MAX_BATCH_IDS + 2)), YEARS))
+        assert too_many_ids_response.status_code == StatusCode.ValidationError
+
+    def test_not_found(self, client):
+
+        response = client.get(get_url([10 ** 6], YEARS))
+        assert response.status_code == StatusCode.NotFound
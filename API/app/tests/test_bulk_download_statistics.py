@@ -0,0 +1,102 @@
+from asyncio import run
+from io import BytesIO, StringIO
+
+import pandas as pd
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from ..main import V1_PREFIX
+from .testconf import StatusCode, client, test_db
+
+REQUIRED_COLUMNS = [
+    "investments",
+    "grp",
+    "population"
+]
+START_YEAR = 2016
+END_YEAR = 2019
+AGGREGATION_TYPE = "max"
+
+
+def get_url(file_extension: str, **params) -> str:
+    url = f"{V1_PREFIX}/bulk-download-statistics/?"
+    for column in REQUIRED_COLUMNS:
+        url += f"required_columns={column}&"
+    for key, value in params.items():
+        url += f"{key}={value}&"
+    return url + f"file_extension={file_extension}"
+
+
+def get_expected(test_db, years: list[int], is_by_district: bool=False, aggregation_type: str=None) -> pd.DataFrame:
+    expected = {}
+    for year in years:
+        statistics = run(test_db.get_statistic(REQUIRED_COLUMNS, year, is_by_district, aggregation_type))
+        rows_count = len(statistics["district_names"])
+        expected.setdefault("year", []).extend([year] * rows_count)
+        for key, values in statistics.items():
+            expected.setdefault(key, []).extend(values)
+    return pd.DataFrame(expected)
+
+
+class TestSuccessCases:
+
+    def test_csv_all_years(self, client, test_db):
+        response = client.get(get_url("csv"))
+        assert response.status_code == StatusCode.Success
+        assert response.headers["Content-Type"] == "text/csv; charset=utf-8"
+
+        data = pd.read_csv(StringIO(response.text))
+        expected = get_expected(test_db, run(test_db.get_years()))
+        assert list(data.columns) == list(expected.columns)
+        assert len(data) == len(expected)
+        assert data["investments"].tolist() == expected["investments"].tolist()
+
+    def test_csv_year_range(self, client, test_db):
+        response = client.get(get_url(
+            "csv", start_year=START_YEAR, end_year=END_YEAR, is_by_district=True, aggregation_type=AGGREGATION_TYPE
+        ))
+        assert response.status_code == StatusCode.Success
+
+        data = pd.read_csv(StringIO(response.text))
+        expected = get_expected(test_db, list(range(START_YEAR, END_YEAR + 1)), True, AGGREGATION_TYPE)
+        assert data["year"].unique().tolist() == list(range(START_YEAR, END_YEAR + 1))
+        assert data.to_dict("list") == expected.to_dict("list")
+
+    def test_xlsx_sheet_per_year(self, client, test_db):
+        response = client.get(get_url("xlsx", start_year=START_YEAR, end_year=END_YEAR))
+        assert response.status_code == StatusCode.Success
+        assert 'filename="statistics.xlsx"' in response.headers["Content-Disposition"]
+
+        workbook = load_workbook(BytesIO(response.content))
+        assert workbook.sheetnames == [str(year) for year in range(START_YEAR, END_YEAR + 1)]
+
+        rows = list(workbook[str(START_YEAR)].iter_rows(values_only=True))
+        expected = run(test_db.get_statistic(REQUIRED_COLUMNS, START_YEAR))
+        assert list(rows[0]) == list(expected.keys())
+        assert [list(row) for row in rows[1:]] == [list(row) for row in zip(*expected.values())]
+
+    def test_parquet(self, client, test_db):
+        response = client.get(get_url("parquet", start_year=START_YEAR))
+        assert response.status_code == StatusCode.Success
+        assert response.headers["Content-Type"] == "application/vnd.apache.parquet"
+
+        table = pq.read_table(BytesIO(response.content))
+        assert str(table.schema.field("population").type) == "int64"
+        expected = get_expected(test_db, [year for year in run(test_db.get_years()) if year >= START_YEAR])
+        assert table.num_rows == len(expected)
+        assert table.column("region_names").to_pylist() == expected["region_names"].tolist()
+
+
+class TestFailureCases:
+
+    def test_wrong_year_range(self, client):
+        response = client.get(get_url("csv", start_year=END_YEAR, end_year=START_YEAR))
+        assert response.status_code == StatusCode.ValidationError
+
+    def test_aggregation_lack(self, client):
+        response = client.get(get_url("csv", is_by_district=True))
+        assert response.status_code == StatusCode.ValidationError
+
+    def test_wrong_extension(self, client):
+        response = client.get(get_url("json"))
+        assert response.status_code == StatusCode.ValidationError
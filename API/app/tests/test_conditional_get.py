@@ -0,0 +1,87 @@
+import json
+import logging
+from asyncio import run
+from email.utils import format_datetime
+from time import sleep
+
+from ..AccessLog import logger
+from ..DataBase import DATASET_INFO_TTL
+from ..main import V1_PREFIX, app
+from .testconf import StatusCode, client, reload_externally, shared_database, test_db
+
+URLS = [
+    f"{V1_PREFIX}/feature-info/?feature=grp&year=2020",
+    f"{V1_PREFIX}/statistics/?required_columns=investments&year=2020",
+    f"{V1_PREFIX}/feature-graphs/?aggregation_type=avg",
+    f"{V1_PREFIX}/regions/",
+    f"{V1_PREFIX}/years/",
+]
+NOT_MODIFIED = 304
+
+
+class TestSuccessCases:
+
+    def test_validator_headers(self, client, test_db):
+        dataset_info = run(test_db.get_dataset_info())
+        for url in URLS:
+            response = client.get(url)
+            assert response.status_code == StatusCode.Success
+            assert response.headers["ETag"] == f'W/"{dataset_info["version"]}"'
+            assert response.headers["Last-Modified"] == format_datetime(dataset_info["updated_at"], usegmt=True)
+            assert response.headers["Cache-Control"] == "public, no-cache"
+
+    def test_if_none_match(self, client, caplog):
+        app.state.cache.clear()
+        etag = client.get(URLS[0]).headers["ETag"]
+        caplog.set_level(logging.INFO, logger=logger.name)
+        caplog.clear()
+
+        for url in URLS:
+            response = client.get(url, headers={"If-None-Match": f'"other", {etag}'})
+            assert response.status_code == NOT_MODIFIED
+            assert response.content == b""
+            assert response.headers["ETag"] == etag
+
+        records = [json.loads(record.getMessage()) for record in caplog.records if record.name == logger.name]
+        assert [record["db_time_ms"] for record in records] == [0] * len(URLS)
+
+    def test_if_modified_since(self, client):
+        last_modified = client.get(URLS[0]).headers["Last-Modified"]
+
+        response = client.get(URLS[0], headers={"If-Modified-Since": last_modified})
+        assert response.status_code == NOT_MODIFIED
+
+        response = client.get(URLS[0], headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        assert response.status_code == StatusCode.Success
+
+    def test_new_version_after_load(self, client, test_db):
+        etag = client.get(URLS[0]).headers["ETag"]
+        run(test_db.refresh_derived_data())
+
+        response = client.get(URLS[0], headers={"If-None-Match": etag})
+        assert response.status_code == StatusCode.Success
+        assert response.headers["ETag"] != etag
+
+    def test_new_version_after_external_load(self, client, shared_database):
+        response = client.get(URLS[0])
+        etag = response.headers["ETag"]
+
+        reload_externally(*shared_database)
+        sleep(DATASET_INFO_TTL)
+
+        response = client.get(URLS[0], headers={"If-None-Match": etag})
+        assert response.status_code == StatusCode.Success
+        assert response.headers["ETag"] != etag
+
+
+class TestFailureCases:
+
+    def test_stale_etag(self, client):
+        response = client.get(URLS[0], headers={"If-None-Match": 'W/"stale"'})
+        assert response.status_code == StatusCode.Success
+        assert len(response.json()["features"]) != 0
+
+    def test_not_found_has_no_etag(self, client):
+        response = client.get(f"{V1_PREFIX}/region-info/?id=100000&year=2020")
+        assert response.status_code == StatusCode.NotFound
+        assert "ETag" not in response.headers
@@ -1,3 +1,9 @@
+from asyncio import run
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+
 from ..DataBase import BORDER_YEAR
 from ..main import V1_PREFIX
 from .testconf import StatusCode, client, test_db
@@ -36,9 +42,43 @@ class TestSuccessfulCases:
         assert "attachment" in response.headers["Content-Disposition"]
         assert response.headers["Content-Type"] == "text/csv; charset=utf-8"
 
+    def test_download_xlsx(self, client, test_db):
+        url = f"{V1_PREFIX}/download-statistics/?"
+        for column in REQUIRED_COLUMNS:
+            url += f"required_columns={column}&"
+        url += f"year={YEAR}&file_extension=xlsx"
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert 'filename="statistics.xlsx"' in response.headers["Content-Disposition"]
+
+        sheet = load_workbook(BytesIO(response.content))["Regions"]
+        rows = list(sheet.iter_rows(values_only=True))
+        statistics = run(test_db.get_statistic(REQUIRED_COLUMNS, YEAR))
+        assert list(rows[0]) == list(statistics.keys())
+        assert len(rows) - 1 == len(statistics["region_names"])
+
+    @pytest.mark.parametrize("batch_size", [1, 3, 1000])
+    def test_stream_batches(self, test_db, batch_size):
+        async def collect():
+            return [
+                batch async for batch in test_db.stream_statistic(
+                    REQUIRED_COLUMNS, YEAR, IS_BY_DISTRICT, AGGREGATION_TYPE, batch_size=batch_size
+                )
+            ]
+
+        batches = run(collect())
+        statistics = run(test_db.get_statistic(REQUIRED_COLUMNS, YEAR, IS_BY_DISTRICT, AGGREGATION_TYPE))
+        assert all(len(batch["district_names"]) <= batch_size for batch in batches)
+        assert {key: sum((batch[key] for batch in batches), []) for key in statistics} == statistics
+
 
 class TestFailureCases:
 
+    def test_wrong_batch_size(self, test_db):
+        with pytest.raises(ValueError):
+            run(anext(test_db.stream_statistic(REQUIRED_COLUMNS, YEAR, batch_size=0)))
+
     def test_data_lack(self, client):
 
         no_data_response = client.get(f"{V1_PREFIX}/download-statistics/")
@@ -0,0 +1,76 @@
+from asyncio import run
+
+from ..DataBase import MAX_YEAR
+from ..main import V1_PREFIX
+from ..RequestModels import FeatureSummaryResponse
+from .testconf import StatusCode, client, test_db
+
+FEATURE = "grp"
+YEAR = 2018
+AGGREGATION_TYPE = "avg"
+
+
+class TestSuccessfulCases:
+
+    def test_region_summary(self, client, test_db):
+
+        response = client.get(f"{V1_PREFIX}/feature-summary/?feature={FEATURE}&year={YEAR}")
+
+        assert response.status_code == StatusCode.Success
+
+        summary = FeatureSummaryResponse(**response.json())
+        values = sorted(run(test_db.get_statistic([FEATURE], YEAR))[FEATURE])
+        assert summary.area_type == "region"
+        assert summary.values_count == len(values)
+        assert summary.null_count == 0
+        assert summary.min_value == values[0]
+        assert summary.max_value == values[-1]
+        assert summary.median == values[(len(values) - 1) // 2]
+        assert summary.min_value <= summary.lower_quartile <= summary.median <= summary.upper_quartile
+
+    def test_district_summary(self, client, test_db):
+
+        response = client.get(
+            f"{V1_PREFIX}/feature-summary/?feature={FEATURE}&year={YEAR}"
+            f"&is_by_district=true&aggregation_type={AGGREGATION_TYPE}"
+        )
+
+        assert response.status_code == StatusCode.Success
+
+        summary = FeatureSummaryResponse(**response.json())
+        values = run(test_db.get_statistic([FEATURE], YEAR, True, AGGREGATION_TYPE))[FEATURE]
+        assert summary.area_type == "district"
+        assert summary.values_count == len(values)
+        assert summary.max_value == max(values)
+
+    def test_missing_values_are_counted(self, client):
+
+        response = client.get(f"{V1_PREFIX}/feature-summary/?feature={FEATURE}&year=2024")
+
+        assert response.status_code == StatusCode.Success
+
+        summary = response.json()
+        assert summary["values_count"] == 0
+        assert summary["null_count"] > 0
+        assert summary["median"] is None
+
+
+class TestFailureCases:
+
+    def test_data_lack(self, client):
+
+        no_data_response = client.get(f"{V1_PREFIX}/feature-summary/")
+        assert no_data_response.status_code == StatusCode.ValidationError
+
+        no_aggregation_response = client.get(
+            f"{V1_PREFIX}/feature-summary/?feature={FEATURE}&year={YEAR}&is_by_district=true"
+        )
+        assert no_aggregation_response.status_code == StatusCode.ValidationError
+
+    def test_wrong_values(self, client):
+
+        wrong_feature_response = client.get(f"{V1_PREFIX}/feature-summary/?feature=unknown&year={YEAR}")
+        assert wrong_feature_response.status_code == StatusCode.ValidationError
+
+        wrong_year_response = client.get(f"{V1_PREFIX}/feature-summary/?feature={FEATURE}&year={MAX_YEAR + 1}")
+        assert wrong_year_response.status_code == StatusCode.ValidationError
@@ -0,0 +1,192 @@
+from asyncio import run, sleep
+from os import getenv
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..DataBase import ColumnName, DataBase
+from ..Ingestion import IngestionJob, IngestionPhase
+from ..main import V1_PREFIX, app, start_ingestion
+from ..MemoryDataBase import MemoryDataBase
+from ..Settings import Settings
+from .testconf import StatusCode, client, test_db
+
+DATA_PATH = "app/tests/test_data.csv"
+LOCAL_CLIENT = ("127.0.0.1", 50000)
+YEAR = 2018
+SERVED_SCHEMA = "served_test"
+REGION_IDS = [1, 2, 3]
+
+
+class FakeDataBase:
+
+    def __init__(self):
+        self.closed = False
+
+    async def dispose(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+async def wait_for(job: IngestionJob):
+    while job.is_running:
+        await sleep(0.01)
+
+
+async def ingest(settings: Settings):
+    """Load in the background and return the switched database along with the replaced one"""
+    previous_db = MemoryDataBase()
+    state = SimpleNamespace(db=previous_db)
+    job = start_ingestion(SimpleNamespace(state=state), settings)
+    try:
+        assert state.db is previous_db
+        await wait_for(job)
+        assert job.phase is IngestionPhase.DONE
+        assert job.rows != 0
+        statistics = await state.db.get_statistic([col.value for col in ColumnName], YEAR)
+        return state.db, statistics
+    finally:
+        await job.close()
+        await state.db.dispose()
+        state.db.close()
+
+
+class TestSuccessCases:
+
+    def test_job_phases(self):
+
+        async def load(job):
+            assert job.phase is IngestionPhase.STAGING
+            job.on_progress(10)
+            assert (job.phase, job.rows) == (IngestionPhase.LOADING, 10)
+            job.start_switching()
+            job.retire(retired_db)
+
+        async def run_job():
+            job = IngestionJob(DATA_PATH, drain_time=0)
+            job.start(load)
+            await wait_for(job)
+            await sleep(0.01)
+            return job
+
+        retired_db = FakeDataBase()
+        job = run(run_job())
+        assert job.status()["phase"] is IngestionPhase.DONE
+        assert job.finished_at >= job.started_at
+        assert retired_db.closed
+
+    @pytest.mark.parametrize("settings", [
+        Settings(memory=True, path=DATA_PATH),
+        Settings(sync=True, path=DATA_PATH, chunk_size=50),
+    ])
+    def test_switch(self, test_db, settings):
+        db, statistics = run(ingest(settings))
+        assert type(db) is (MemoryDataBase if settings.memory else DataBase)
+        assert statistics == run(test_db.get_statistic([col.value for col in ColumnName], YEAR))
+
+    def test_switch_to_snapshot(self, test_db, tmp_path):
+        settings = Settings(sync=True, snapshot=str(tmp_path / "data.db"), path=DATA_PATH)
+        _, statistics = run(ingest(settings))
+        assert statistics == run(test_db.get_statistic([col.value for col in ColumnName], YEAR))
+        assert [path.name for path in tmp_path.iterdir()] == ["data.db"]
+
+    @pytest.mark.skipif(getenv("POSTGRES_HOST") is None, reason="PostgreSQL is not configured")
+    @pytest.mark.parametrize("upsert", [False, True])
+    def test_switch_through_staging_schema(self, test_db, upsert):
+
+        async def ingest_into_new_database():
+            # A database without tables, as on the first start
+            db = DataBase(is_sync=False, schema=SERVED_SCHEMA)
+            await db.drop()
+            await db.create_tables()
+            state = SimpleNamespace(db=db)
+            try:
+                job = start_ingestion(SimpleNamespace(state=state), Settings(path=DATA_PATH, upsert=upsert))
+                await wait_for(job)
+                await job.close()
+                assert state.db is db
+                return job, await db.get_regions_info(REGION_IDS, [YEAR])
+            finally:
+                await db.drop()
+                await db.dispose()
+
+        job, regions = run(ingest_into_new_database())
+        assert job.phase is IngestionPhase.DONE, job.error
+        assert regions == run(test_db.get_regions_info(REGION_IDS, [YEAR]))
+
+    def test_status(self, client):
+        job = IngestionJob(DATA_PATH)
+        job.on_progress(5)
+        app.state.ingestion = job
+        try:
+            response = client.get(f"{V1_PREFIX}/ingestion/")
+        finally:
+            app.state.ingestion = None
+
+        assert response.status_code == StatusCode.Success
+        assert response.json() | {"started_at": None} == {
+            "phase": "loading", "path": DATA_PATH, "rows": 5, "started_at": None, "finished_at": None, "error": None
+        }
+
+
+class TestFailureCases:
+
+    def test_failed_job(self):
+
+        async def run_job():
+            previous_db = FakeDataBase()
+            state = SimpleNamespace(db=previous_db)
+            job = start_ingestion(SimpleNamespace(state=state), Settings(memory=True, path="missing.csv"))
+            await wait_for(job)
+            await job.close()
+            return job, state.db is previous_db and not previous_db.closed
+
+        job, is_served = run(run_job())
+        assert job.phase is IngestionPhase.FAILED
+        assert job.error is not None
+        assert is_served
+
+    @pytest.mark.parametrize("snapshot", [False, True])
+    def test_close_while_loading(self, tmp_path, snapshot):
+        settings = Settings(
+            sync=True, snapshot=str(tmp_path / "data.db") if snapshot else None, path=DATA_PATH, chunk_size=10
+        )
+
+        async def close_job():
+            previous_db = FakeDataBase()
+            state = SimpleNamespace(db=previous_db)
+            job = start_ingestion(SimpleNamespace(state=state), settings)
+            await job.close()
+            return job, state.db is previous_db
+
+        job, is_served = run(close_job())
+        assert job.phase is IngestionPhase.FAILED
+        assert job.rows == 0
+        assert is_served
+        # Neither a snapshot nor its staging copy is left behind
+        assert list(tmp_path.iterdir()) == []
+
+    def test_no_status(self, client):
+        response = client.get(f"{V1_PREFIX}/ingestion/")
+        assert response.status_code == StatusCode.NotFound
+
+    def test_remote_client(self, client):
+        response = client.post(f"{V1_PREFIX}/ingestion/")
+        assert response.status_code == StatusCode.Forbidden
+
+    def test_no_data_file(self, client):
+        response = TestClient(app, client=LOCAL_CLIENT).post(f"{V1_PREFIX}/ingestion/")
+        assert response.status_code == StatusCode.Conflict
+
+    def test_running_job(self, client):
+        app.state.settings = Settings(memory=True, path=DATA_PATH)
+        app.state.ingestion = IngestionJob(DATA_PATH)
+        try:
+            response = TestClient(app, client=LOCAL_CLIENT).post(f"{V1_PREFIX}/ingestion/")
+        finally:
+            app.state.settings = Settings()
+            app.state.ingestion = None
+        assert response.status_code == StatusCode.Conflict
@@ -0,0 +1,201 @@
+import sqlite3
+from asyncio import run
+
+import pandas as pd
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from ..DataBase import AggregationType, ColumnName, DataBase, LoadMode
+from ..MemoryDataBase import MemoryDataBase
+
+DATA_PATH = "app/tests/test_data.csv"
+YEAR = 2018
+UPSERT_YEARS = [2018, 2019]
+
+
+CHUNK_SIZE = 7
+
+
+async def load_snapshot(mode: LoadMode, chunk_size: int | None=None, progress: list[int] | None=None):
+    db = DataBase(is_sync=True)
+    try:
+        await db.reset()
+        await db.load_data(DATA_PATH, mode=mode, chunk_size=chunk_size,
+                           on_progress=None if progress is None else progress.append)
+
+        regions = await db.get_areas()
+        districts = await db.get_areas(are_districts=True)
+        statistics = await db.get_statistic([col.value for col in ColumnName], YEAR)
+        return [dict(row) for row in (*regions, *districts)], statistics
+    finally:
+        db.close()
+
+
+def write_upsert_files(tmp_path) -> tuple[str, str, str]:
+    """
+    Stored data without the last year, the file upserting new investments of some years along with
+    the last year, and the file with the same final data.
+    """
+    data = pd.read_csv(DATA_PATH)
+    last_year = data["Год"].max()
+    updated = data.copy()
+    updated.loc[updated["Год"].isin(UPSERT_YEARS), "Инвестиции"] *= 2
+
+    paths = [str(tmp_path / name) for name in ("stored.csv", "upsert.csv", "expected.csv")]
+    data[data["Год"] != last_year].to_csv(paths[0], index=False)
+    updated[updated["Год"].isin([*UPSERT_YEARS, last_year])].to_csv(paths[1], index=False)
+    updated.to_csv(paths[2], index=False)
+    return paths
+
+
+async def load_derived_data(db: DataBase | MemoryDataBase, paths: list[str], upsert: bool=False):
+    try:
+        await db.reset()
+        for path in paths:
+            await db.load_data(path, upsert=upsert)
+
+        feature = ColumnName.INVESTMENTS.value
+        result = [await db.get_areas(), await db.get_areas(are_districts=True), await db.get_years()]
+        # The year after the upserted ones has new ratios too
+        for year in (UPSERT_YEARS[0] - 1, *UPSERT_YEARS, UPSERT_YEARS[-1] + 1, *(await db.get_years())[-2:]):
+            result.append(await db.get_statistic([feature], year, True, AggregationType.SUM))
+            result.append(await db.get_feature_info(feature, year, False, None, False, None, None))
+            result.append(await db.get_feature_info(feature, year, True, AggregationType.AVG, False, None, None))
+            result.append(await db.get_feature_summary(feature, year, True, AggregationType.MAX))
+        result.append(await db.get_feature_graphs(AggregationType.SUM))
+        return result
+    finally:
+        await db.dispose()
+        db.close()
+
+
+class TestSuccessCases:
+
+    def test_load_modes_are_equal(self):
+
+        orm_rows = run(load_snapshot(LoadMode.ORM))
+        bulk_rows = run(load_snapshot(LoadMode.BULK))
+
+        assert len(bulk_rows[0]) != 0
+        assert orm_rows == bulk_rows
+
+    def test_chunked_load_is_equal(self):
+        progress = []
+
+        whole_rows = run(load_snapshot(LoadMode.BULK))
+        chunked_bulk_rows = run(load_snapshot(LoadMode.BULK, CHUNK_SIZE, progress))
+        chunked_orm_rows = run(load_snapshot(LoadMode.ORM, CHUNK_SIZE))
+
+        assert whole_rows == chunked_bulk_rows == chunked_orm_rows
+        assert progress == sorted(progress)
+        assert progress[0] == CHUNK_SIZE
+        assert all(step <= CHUNK_SIZE for step in (b - a for a, b in zip(progress, progress[1:])))
+
+
+    def test_generation_changes(self):
+
+        async def get_generations():
+            db = DataBase(is_sync=True)
+            try:
+                generations = [db.generation]
+                await db.reset()
+                generations.append(db.generation)
+                await db.load_data(DATA_PATH)
+                generations.append(db.generation)
+                return generations
+            finally:
+                db.close()
+
+        generations = run(get_generations())
+        assert len(set(generations)) == len(generations)
+
+
+    @pytest.mark.parametrize("backend", [DataBase, MemoryDataBase])
+    def test_upsert_is_equal(self, tmp_path, backend):
+        stored_path, upsert_path, expected_path = write_upsert_files(tmp_path)
+
+        expected = run(load_derived_data(backend(), [expected_path]))
+        upserted = run(load_derived_data(backend(), [stored_path, upsert_path], upsert=True))
+        assert upserted == expected
+
+    def test_upsert_keeps_area_ids(self, tmp_path):
+        stored_path, upsert_path, _ = write_upsert_files(tmp_path)
+
+        async def get_areas():
+            db = DataBase(is_sync=True)
+            try:
+                await db.reset()
+                await db.load_data(upsert_path)
+                before = await db.get_areas()
+                await db.load_data(stored_path, upsert=True)
+                return before, await db.get_areas()
+            finally:
+                db.close()
+
+        before, after = run(get_areas())
+        assert [dict(row) for row in before] == [dict(row) for row in after]
+
+
+    @pytest.mark.parametrize("mode", list(LoadMode))
+    def test_load_after_id_gap(self, tmp_path, mode):
+        data = pd.read_csv(DATA_PATH)
+        region_names = list(data["Регион"].unique())
+        stored_path, loaded_path = str(tmp_path / "stored.csv"), str(tmp_path / "loaded.csv")
+        data[data["Регион"].isin(region_names[:3])].to_csv(stored_path, index=False)
+        data[data["Регион"].isin(region_names[3:])].to_csv(loaded_path, index=False)
+        db_path = tmp_path / "data.db"
+
+        db = DataBase(is_sync=True, snapshot_path=str(db_path))
+        run(db.reset())
+        run(db.load_data(stored_path))
+        with sqlite3.connect(db_path) as conn:
+            # The first region is deleted, the ids left are no longer 1..count
+            conn.execute("DELETE FROM statistics WHERE region_id = 1")
+            conn.execute("DELETE FROM regions WHERE id = 1")
+        run(db.load_data(loaded_path, mode=mode))
+        db.close()
+
+        with sqlite3.connect(db_path) as conn:
+            stored = conn.execute(
+                "SELECT region_name, year, investments FROM statistics "
+                "JOIN regions ON regions.id = statistics.region_id ORDER BY region_name, year"
+            ).fetchall()
+        expected = data[data["Регион"] != region_names[0]].sort_values(["Регион", "Год"])
+        assert stored == list(expected[["Регион", "Год", "Инвестиции"]].itertuples(index=False, name=None))
+
+
+class TestFailureCases:
+
+    def test_wrong_chunk_size(self):
+
+        with pytest.raises(ValueError):
+            run(load_snapshot(LoadMode.BULK, chunk_size=0))
+
+    def test_orm_upsert(self):
+
+        with pytest.raises(ValueError):
+            run(DataBase(is_sync=True).load_data(DATA_PATH, mode=LoadMode.ORM, upsert=True))
+
+    def test_duplicate_rows(self):
+
+        async def load_twice():
+            db = DataBase(is_sync=True)
+            try:
+                await db.reset()
+                await db.load_data(DATA_PATH)
+                await db.load_data(DATA_PATH)
+            finally:
+                db.close()
+
+        with pytest.raises(IntegrityError):
+            run(load_twice())
+
+    def test_memory_duplicate_rows(self):
+        db = MemoryDataBase()
+        run(db.load_data(DATA_PATH))
+        years = run(db.get_years())
+        regions = run(db.get_regions_info([1], years))
+
+        with pytest.raises(ValueError):
+            run(db.load_data(DATA_PATH))
+        assert run(db.get_regions_info([1], years)) == regions
@@ -0,0 +1,97 @@
+from asyncio import run
+
+import pytest
+
+from ..DataBase import AggregationType, ColumnName
+from ..MemoryDataBase import MemoryDataBase
+from .testconf import test_db
+
+DATA_PATH = "app/tests/test_data.csv"
+YEARS = [2013, 2014, 2018, 2024]
+IDS = [0, 1, 3, 99]
+MIN_FILTER_VALUE = 10005
+MAX_FILTER_VALUE = 20100
+COLUMNS = [col.value for col in ColumnName]
+
+
+@pytest.fixture(scope="module")
+def memory_db():
+
+    db = MemoryDataBase()
+    run(db.load_data(DATA_PATH))
+    yield db
+    db.close()
+
+
+def to_plain(value):
+    if isinstance(value, list):
+        return [to_plain(elem) for elem in value]
+    if hasattr(value, "keys"):
+        return {key: to_plain(value[key]) for key in value.keys()}
+    if isinstance(value, float):
+        return pytest.approx(value)
+    return value
+
+
+def assert_same(test_db, memory_db, method: str, *args):
+    expected = run(getattr(test_db, method)(*args))
+    actual = run(getattr(memory_db, method)(*args))
+    assert to_plain(actual) == to_plain(expected)
+
+
+class TestSuccessCases:
+
+    @pytest.mark.parametrize("year", YEARS)
+    def test_area_info(self, test_db, memory_db, year):
+
+        for id in IDS:
+            assert_same(test_db, memory_db, "get_region_info", id, year)
+            for aggregation_type in AggregationType:
+                assert_same(test_db, memory_db, "get_district_info", id, year, aggregation_type)
+
+    @pytest.mark.parametrize("year", YEARS)
+    def test_feature_info(self, test_db, memory_db, year):
+
+        for feature in ColumnName:
+            assert_same(test_db, memory_db, "get_feature_info", feature, year, False, None, False, None, None)
+            assert_same(test_db, memory_db, "get_feature_info", feature, year, False, None,
+                        True, MIN_FILTER_VALUE, None)
+            for aggregation_type in AggregationType:
+                assert_same(test_db, memory_db, "get_feature_info", feature, year, True, aggregation_type,
+                            True, None, MAX_FILTER_VALUE)
+
+    @pytest.mark.parametrize("year", YEARS)
+    def test_statistic(self, test_db, memory_db, year):
+
+        assert_same(test_db, memory_db, "get_statistic", COLUMNS, year)
+        for aggregation_type in AggregationType:
+            assert_same(test_db, memory_db, "get_statistic", COLUMNS, year, True, aggregation_type)
+
+    @pytest.mark.parametrize("year", YEARS)
+    def test_feature_summary(self, test_db, memory_db, year):
+
+        for feature in ColumnName:
+            assert_same(test_db, memory_db, "get_feature_summary", feature, year)
+            for aggregation_type in AggregationType:
+                assert_same(test_db, memory_db, "get_feature_summary", feature, year, True, aggregation_type)
+
+    def test_other_queries(self, test_db, memory_db):
+
+        for aggregation_type in AggregationType:
+            assert_same(test_db, memory_db, "get_feature_graphs", aggregation_type)
+
+        assert_same(test_db, memory_db, "get_regions_info", IDS, YEARS)
+        for id in IDS:
+            assert_same(test_db, memory_db, "get_area_history", id)
+            for aggregation_type in AggregationType:
+                assert_same(test_db, memory_db, "get_area_history", id, True, aggregation_type)
+        assert_same(test_db, memory_db, "get_areas")
+        assert_same(test_db, memory_db, "get_areas", True)
+        assert_same(test_db, memory_db, "get_years")
+
+    def test_dataset_info(self, test_db, memory_db):
+
+        for db in (test_db, memory_db):
+            dataset_info = run(db.get_dataset_info())
+            assert set(dataset_info.keys()) == {"version", "updated_at"}
+            assert dataset_info["updated_at"].utcoffset().total_seconds() == 0
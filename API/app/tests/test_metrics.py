@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+
+from ..AccessLog import AccessRecord
+from ..main import V1_PREFIX, app
+from ..Metrics import Histogram, Metrics
+from .testconf import StatusCode, client, test_db
+
+LOCAL_CLIENT = ("127.0.0.1", 50000)
+LABELS = 'endpoint="/api/v1/statistics/",is_by_district="true",aggregation_type="max"'
+
+
+def get_metrics(client) -> str:
+    response = TestClient(app, client=LOCAL_CLIENT).get("/metrics")
+    assert response.status_code == StatusCode.Success
+    assert response.headers["Content-Type"].startswith("text/plain")
+    return response.text
+
+
+def get_sample(text: str, name: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split(" ")[-1])
+    raise KeyError(name)
+
+
+class TestSuccessCases:
+
+    def test_request_metrics(self, client):
+        app.state.cache.clear()
+        url = f"{V1_PREFIX}/statistics/?required_columns=grp&year=2020&is_by_district=true&aggregation_type=max"
+        before = get_metrics(client)
+        assert client.get(url).status_code == StatusCode.Success
+        after = get_metrics(client)
+
+        count_name = f"api_request_duration_seconds_count{{{LABELS}}}"
+        previous_count = get_sample(before, count_name) if count_name in before else 0
+        assert get_sample(after, count_name) == previous_count + 1
+        assert get_sample(after, f"api_database_duration_seconds_sum{{{LABELS}}}") > 0
+        assert get_sample(after, f"api_database_rows_sum{{{LABELS}}}") > 0
+        assert get_sample(after, f"api_serialization_duration_seconds_sum{{{LABELS}}}") > 0
+        assert "api_response_cache_size" in after
+        assert "api_database_pool_checkouts" in after
+
+    def test_unknown_labels_are_collapsed(self, client):
+        client.get(f"{V1_PREFIX}/years/?aggregation_type=unknown&is_by_district=yes")
+        client.get("/unknown-path/")
+
+        text = get_metrics(client)
+        assert 'endpoint="/api/v1/years/",is_by_district="true",aggregation_type=""' in text
+        assert 'endpoint="unmatched"' in text
+        assert "unknown" not in text
+
+    def test_histogram_buckets(self):
+        histogram = Histogram("test_rows", "Test rows.", (1, 10, 100), ("endpoint",))
+        for value in (0, 1, 5, 1000):
+            histogram.observe(("/test/",), value)
+
+        assert histogram.render()[2:] == [
+            'test_rows_bucket{endpoint="/test/",le="1"} 2',
+            'test_rows_bucket{endpoint="/test/",le="10"} 3',
+            'test_rows_bucket{endpoint="/test/",le="100"} 3',
+            'test_rows_bucket{endpoint="/test/",le="+Inf"} 4',
+            'test_rows_sum{endpoint="/test/"} 1006',
+            'test_rows_count{endpoint="/test/"} 4',
+        ]
+
+    def test_observe_record(self):
+        metrics = Metrics()
+        record = AccessRecord()
+        record.rows = 3
+        metrics.observe({"query_string": b""}, StatusCode.Success, 0.5, record)
+
+        text = metrics.render()
+        labels = 'endpoint="unmatched",is_by_district="false",aggregation_type=""'
+        assert f"api_request_duration_seconds_sum{{{labels}}} 0.5" in text
+        assert "api_response_cache" not in text
+
+
+class TestFailureCases:
+
+    def test_remote_client(self, client):
+        response = client.get("/metrics")
+        assert response.status_code == StatusCode.Forbidden
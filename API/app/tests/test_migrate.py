@@ -0,0 +1,149 @@
+import sqlite3
+from asyncio import run
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from ..DataBase import OBSOLETE_INDEXES, AggregationType, ColumnName, DataBase
+from ..DataBaseModels import Base
+from ..main import check_tables, prepare_database
+from ..Settings import Settings
+from .testconf import test_db
+
+DATA_PATH = "app/tests/test_data.csv"
+COLUMNS = [col.value for col in ColumnName]
+# Tables and indexes of the schema before derived data, dataset versions and the unique statistics key
+OLD_TABLES = ("statistics", "regions", "districts")
+OLD_INDEX = "ix_statistics_year_region_id"
+YEAR = 2018
+
+
+def read_rows(path) -> dict[str, list[tuple]]:
+    with sqlite3.connect(path) as conn:
+        return {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+            for table in OLD_TABLES
+        }
+
+
+def read_indexes(path) -> dict[str, set[str]]:
+    engine = create_engine(f"sqlite:///{path}")
+    inspector = inspect(engine)
+    indexes = {
+        table: {index["name"] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+    engine.dispose()
+    return indexes
+
+
+def repeat_rows(path):
+    """Rows loaded twice before the unique key existed, the second time with new values"""
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO statistics (district_id, region_id, year, investments) "
+            "SELECT district_id, region_id, year, investments + 1 FROM statistics WHERE year = ?",
+            (YEAR,)
+        )
+
+
+@pytest.fixture
+def old_database(tmp_path):
+    path = tmp_path / "data.db"
+    db = DataBase(is_sync=True, snapshot_path=str(path))
+    run(db.reset())
+    run(db.load_data(DATA_PATH))
+    db.close()
+
+    with sqlite3.connect(path) as conn:
+        query = "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        for (name,) in conn.execute(query).fetchall():
+            conn.execute(f"DROP INDEX {name}")
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in OLD_TABLES:
+                conn.execute(f"DROP TABLE {table.name}")
+        conn.execute(f"CREATE INDEX {OLD_INDEX} ON statistics (year, region_id)")
+    return path
+
+
+class TestSuccessCases:
+
+    def test_migrate_old_schema(self, old_database, test_db):
+        rows = read_rows(old_database)
+        assert read_indexes(old_database) == {
+            "statistics": {OLD_INDEX}, "regions": set(), "districts": set(),
+        }
+
+        db = DataBase(is_sync=True, snapshot_path=str(old_database))
+        run(db.migrate())
+        indexes = read_indexes(old_database)
+        run(db.migrate())
+        assert read_indexes(old_database) == indexes
+
+        expected = {
+            table.name: {index.name for index in table.indexes}
+            for table in Base.metadata.sorted_tables
+        }
+        assert indexes == expected
+        assert all(name not in names for names in indexes.values() for name in OBSOLETE_INDEXES)
+        assert read_rows(old_database) == rows
+
+        # Derived tables are rebuilt from the kept data
+        assert run(db.get_statistic(COLUMNS, 2020, True, AggregationType.SUM)) == \
+            run(test_db.get_statistic(COLUMNS, 2020, True, AggregationType.SUM))
+        assert run(db.get_area_history(1, True, AggregationType.MAX)) == \
+            run(test_db.get_area_history(1, True, AggregationType.MAX))
+        db.close()
+
+    def test_migrate_on_startup(self, old_database, test_db):
+        db = DataBase(is_sync=True, snapshot_path=str(old_database))
+        assert len(run(db.get_missing_tables())) != 0
+
+        # No --migrate, as in the container command
+        run(prepare_database(db, Settings(sync=True)))
+        assert run(db.get_missing_tables()) == []
+        run(check_tables(db))
+        assert run(db.get_feature_summary(ColumnName.GRP.value, 2020)) == \
+            run(test_db.get_feature_summary(ColumnName.GRP.value, 2020))
+        db.close()
+
+    def test_merge_repeated_rows(self, old_database):
+        with sqlite3.connect(old_database) as conn:
+            rows = conn.execute("SELECT count(*) FROM statistics").fetchone()[0]
+            last_id = conn.execute("SELECT max(id) FROM statistics").fetchone()[0]
+        repeat_rows(old_database)
+        with sqlite3.connect(old_database) as conn:
+            [(investments,)] = conn.execute(
+                "SELECT investments FROM statistics WHERE region_id = 1 AND year = ? AND id > ?", (YEAR, last_id)
+            ).fetchall()
+
+        db = DataBase(is_sync=True, snapshot_path=str(old_database))
+        run(db.migrate(merge_duplicates=True))
+        with sqlite3.connect(old_database) as conn:
+            assert conn.execute("SELECT count(*) FROM statistics").fetchone()[0] == rows
+            assert conn.execute("SELECT min(id) FROM statistics WHERE year = ?", (YEAR,)).fetchone()[0] > last_id
+        assert OLD_INDEX not in read_indexes(old_database)["statistics"]
+
+        # Derived data follows the kept rows
+        [region_info] = run(db.get_regions_info([1], [YEAR]))
+        assert region_info["investments"] == investments
+        db.close()
+
+
+class TestFailureCases:
+
+    def test_repeated_rows(self, old_database):
+        repeat_rows(old_database)
+        rows = read_rows(old_database)
+
+        db = DataBase(is_sync=True, snapshot_path=str(old_database))
+        with pytest.raises(ValueError, match="merge_duplicates"):
+            run(db.migrate())
+        db.close()
+        assert read_rows(old_database) == rows
+
+    def test_read_only_old_schema(self, old_database):
+        db = DataBase(is_sync=True, read_only=True, snapshot_path=str(old_database))
+        with pytest.raises(ValueError):
+            run(check_tables(db))
+        db.close()
@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from ..main import V1_PREFIX, app
+from ..PoolMetrics import PoolMetrics
+from ..RequestModels import PoolStatusResponse
+from .testconf import StatusCode, client, test_db
+
+LOCAL_CLIENT = ("127.0.0.1", 50000)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSuccessCases:
+
+    def test_pool_status(self, client):
+        client.get(f"{V1_PREFIX}/years/")
+
+        response = TestClient(app, client=LOCAL_CLIENT).get(f"{V1_PREFIX}/pool-status/")
+        assert response.status_code == StatusCode.Success
+
+        status = PoolStatusResponse(**response.json())
+        assert status.checkouts > 0
+        assert status.in_use == 0
+        assert status.connects <= status.checkouts
+
+    def test_wait_time(self):
+        timer = FakeTimer()
+        engine = create_engine("sqlite://", poolclass=QueuePool)
+        metrics = PoolMetrics(engine, timer=timer)
+
+        with metrics.track_wait():
+            timer.now = 0.5
+            with engine.connect():
+                stats = metrics.stats()
+        engine.dispose()
+
+        assert stats["checkouts"] == 1
+        assert stats["in_use"] == 1
+        assert stats["max_wait_time"] == 0.5
+        assert metrics.stats()["in_use"] == 0
+
+
+class TestFailureCases:
+
+    def test_remote_client(self, client):
+        response = client.get(f"{V1_PREFIX}/pool-status/")
+        assert response.status_code == StatusCode.Forbidden
+
+    def test_not_in_schema(self, client):
+        response = TestClient(app, client=LOCAL_CLIENT).get(f"{V1_PREFIX}/openapi.json")
+        assert f"{V1_PREFIX}/pool-status/" not in response.json()["paths"]
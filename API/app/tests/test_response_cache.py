@@ -0,0 +1,102 @@
+from time import sleep
+
+import pytest
+
+from ..DataBase import DATASET_INFO_TTL
+from ..main import V1_PREFIX, app
+from ..RequestModels import YearsResponse
+from ..ResponseCache import ResponseCache
+from .testconf import StatusCode, client, reload_externally, shared_database, test_db
+
+GENERATION = 1
+TTL = 10.0
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSuccessCases:
+
+    def test_hit_and_miss(self):
+        cache = ResponseCache(max_size=2, ttl=TTL)
+
+        assert cache.get("key", GENERATION) is None
+        cache.set("key", GENERATION, b"content")
+        assert cache.get("key", GENERATION) == b"content"
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_size_eviction(self):
+        cache = ResponseCache(max_size=2, ttl=TTL)
+        cache.get("first", GENERATION)
+
+        cache.set("first", GENERATION, b"1")
+        cache.set("second", GENERATION, b"2")
+        cache.get("first", GENERATION)
+        cache.set("third", GENERATION, b"3")
+
+        assert len(cache) == 2
+        assert cache.get("second", GENERATION) is None
+        assert cache.get("first", GENERATION) == b"1"
+
+    def test_ttl_eviction(self):
+        timer = FakeTimer()
+        cache = ResponseCache(ttl=TTL, timer=timer)
+        cache.get("key", GENERATION)
+        cache.set("key", GENERATION, b"content")
+
+        timer.now = TTL - 1
+        assert cache.get("key", GENERATION) == b"content"
+
+        timer.now = TTL
+        assert cache.get("key", GENERATION) is None
+
+    def test_generation_invalidation(self):
+        cache = ResponseCache()
+        cache.get("key", GENERATION)
+        cache.set("key", GENERATION, b"content")
+
+        assert cache.get("key", GENERATION + 1) is None
+        assert len(cache) == 0
+
+        cache.set("key", GENERATION, b"stale content")
+        assert len(cache) == 0
+
+    def test_endpoint_hit(self, client):
+        cache = app.state.cache
+        hits = cache.hits
+
+        first_response = client.get(f"{V1_PREFIX}/years/")
+        second_response = client.get(f"{V1_PREFIX}/years/")
+        assert second_response.status_code == StatusCode.Success
+        assert first_response.content == second_response.content
+        assert cache.hits > hits
+
+        YearsResponse(**second_response.json())
+
+    def test_external_load_invalidation(self, client, shared_database):
+        url = f"{V1_PREFIX}/feature-info/?feature=grp&year=2020"
+        response = client.get(url)
+        assert client.get(url).content == response.content
+
+        reload_externally(*shared_database)
+        sleep(DATASET_INFO_TTL)
+
+        new_response = client.get(url)
+        assert new_response.status_code == StatusCode.Success
+        assert new_response.content != response.content
+
+
+class TestFailureCases:
+
+    def test_wrong_settings(self):
+
+        with pytest.raises(ValueError):
+            ResponseCache(max_size=-1)
+
+        with pytest.raises(ValueError):
+            ResponseCache(ttl=0)
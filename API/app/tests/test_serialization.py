@@ -0,0 +1,49 @@
+import pytest
+
+from ..DataBase import ColumnName
+from ..main import V1_PREFIX, SerializationMode, app
+from .testconf import StatusCode, client, test_db
+
+YEAR = 2020
+URLS = [
+    f"{V1_PREFIX}/region-info/?id=1&year={YEAR}",
+    f"{V1_PREFIX}/batch-region-info/?ids=1&ids=2&years={YEAR}&years=2018",
+    f"{V1_PREFIX}/district-info/?id=1&year={YEAR}&aggregation_type=max",
+    f"{V1_PREFIX}/district-info/?id=1&year={YEAR}&aggregation_type=avg",
+    f"{V1_PREFIX}/feature-info/?feature=grp&year={YEAR}",
+    f"{V1_PREFIX}/feature-info/?feature=grp&year={YEAR}&is_by_district=true&aggregation_type=sum",
+    f"{V1_PREFIX}/statistics/?{"&".join(f"required_columns={column.value}" for column in ColumnName)}&year={YEAR}",
+    f"{V1_PREFIX}/statistics/?required_columns=investments&year={YEAR}&is_by_district=true&aggregation_type=min",
+    f"{V1_PREFIX}/statistics/?required_columns=population&year={YEAR}&is_by_district=true&aggregation_type=avg",
+    f"{V1_PREFIX}/feature-info/?feature=population&year={YEAR}&is_by_district=true&aggregation_type=avg",
+    f"{V1_PREFIX}/feature-summary/?feature=population&year={YEAR}",
+    f"{V1_PREFIX}/feature-graphs/?aggregation_type=avg",
+    f"{V1_PREFIX}/feature-graphs/?aggregation_type=sum",
+    f"{V1_PREFIX}/area-history/?id=1",
+    f"{V1_PREFIX}/regions/",
+    f"{V1_PREFIX}/districts/",
+    f"{V1_PREFIX}/years/",
+]
+
+
+def get_response(client, url: str, mode: SerializationMode):
+    app.state.cache.clear()
+    app.state.serialization_mode = mode
+    try:
+        return client.get(url)
+    finally:
+        app.state.serialization_mode = SerializationMode.PYDANTIC
+        app.state.cache.clear()
+
+
+class TestSuccessCases:
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_orjson_is_equal(self, client, url):
+        pydantic_response = get_response(client, url, SerializationMode.PYDANTIC)
+        orjson_response = get_response(client, url, SerializationMode.ORJSON)
+
+        assert pydantic_response.status_code == orjson_response.status_code == StatusCode.Success
+        assert orjson_response.headers["content-type"] == "application/json"
+        # Same bytes, so also the same number types: 13666.0 in float fields, 13666 in integer ones
+        assert orjson_response.content == pydantic_response.content
@@ -0,0 +1,83 @@
+import pytest
+from pydantic import ValidationError
+
+from ..DataBase import LoadMode
+from ..main import get_argument_parser
+from ..Settings import ENV_FILE_VARIABLE, SerializationMode, Settings
+
+
+class TestSuccessCases:
+
+    def test_defaults(self):
+        settings = Settings.load({})
+        assert settings == Settings()
+        assert settings.workers == 1
+        assert not settings.prepares_database
+
+    def test_environment(self):
+        settings = Settings.load({
+            "API_SYNC": "true",
+            "API_PATH": "data.csv",
+            "API_CACHE_SIZE": "10",
+            "API_LOAD_MODE": "orm",
+            "API_SERIALIZATION": "orjson",
+            "API_LOG_PATH": "",
+            "OTHER": "value",
+        })
+        assert settings.sync
+        assert settings.path == "data.csv"
+        assert settings.cache_size == 10
+        assert settings.load_mode is LoadMode.ORM
+        assert settings.serialization is SerializationMode.ORJSON
+        assert settings.log_path is None
+        assert settings.prepares_database
+
+    def test_env_file(self, tmp_path):
+        env_file = tmp_path / "api.env"
+        env_file.write_text("API_CACHE_SIZE=10\nAPI_CACHE_TTL=5\n")
+
+        settings = Settings.load({ENV_FILE_VARIABLE: str(env_file), "API_CACHE_SIZE": "20"}, cache_ttl=1)
+        # Overrides win over the environment, the environment over the file
+        assert settings.cache_size == 20
+        assert settings.cache_ttl == 1
+
+    def test_worker_environment(self):
+        settings = Settings(workers=4, path="data.csv", migrate=True, chunk_size=100)
+        worker_settings = settings.model_copy(update={"read_only": True})
+
+        loaded = Settings.load(worker_settings.to_environment())
+        assert loaded == worker_settings
+        assert not loaded.prepares_database
+
+    def test_upsert(self):
+        settings = Settings.load({"API_PATH": "data.csv", "API_UPSERT": "true"})
+        assert settings.prepares_database
+        assert not settings.resets_database
+        assert Settings(path="data.csv").resets_database
+
+    def test_snapshot_workers(self):
+        settings = Settings.load({"API_SYNC": "true", "API_SNAPSHOT": "data.db", "API_WORKERS": "2"})
+        assert settings.snapshot == "data.db"
+        assert settings.workers == 2
+
+    def test_argument_parser(self):
+        options = vars(get_argument_parser().parse_args(["--sync", "--cache-size", "5", "--load-mode", "orm"]))
+        assert options == {"sync": True, "cache_size": 5, "load_mode": LoadMode.ORM}
+        assert Settings.load({"API_CACHE_SIZE": "10"}, **options).cache_size == 5
+
+
+class TestFailureCases:
+
+    @pytest.mark.parametrize("environment", [
+        {"API_WORKERS": "2", "API_SYNC": "true"},
+        {"API_WORKERS": "2", "API_MEMORY": "true"},
+        {"API_WORKERS": "0"},
+        {"API_SNAPSHOT": "data.db"},
+        {"API_UPSERT": "true"},
+        {"API_SNAPSHOT": "data.db", "API_SYNC": "true", "API_MEMORY": "true"},
+        {"API_CACHE_SIZE": "-1"},
+        {"API_SERIALIZATION": "xml"},
+    ])
+    def test_wrong_settings(self, environment):
+        with pytest.raises(ValidationError):
+            Settings.load(environment)
@@ -0,0 +1,71 @@
+from asyncio import run
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from ..DataBase import AggregationType, ColumnName, DataBase
+from ..main import create_database, prepare_once
+from ..Settings import Settings
+from .testconf import test_db
+
+DATA_PATH = "app/tests/test_data.csv"
+COLUMNS = [col.value for col in ColumnName]
+
+
+@pytest.fixture(scope="module")
+def snapshot_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "data.db"
+    run(prepare_once(Settings(sync=True, snapshot=str(path), path=DATA_PATH)))
+    return path
+
+
+@pytest.fixture(scope="module")
+def snapshot_db(snapshot_path):
+    db = create_database(Settings(sync=True, snapshot=str(snapshot_path), read_only=True))
+    yield db
+    db.close()
+
+
+class TestSuccessCases:
+
+    @pytest.mark.parametrize("method, args", [
+        ("get_areas", ()),
+        ("get_regions_info", ([1, 2, 3], [2018, 2024])),
+        ("get_years", ()),
+        ("get_statistic", (COLUMNS, 2020, True, AggregationType.SUM)),
+        ("get_feature_info", (ColumnName.INVESTMENTS.value, 2018, False, AggregationType.AVG, False, 0, 0)),
+        ("get_area_history", (1, True, AggregationType.MAX)),
+    ])
+    def test_same_results(self, test_db, snapshot_db, method, args):
+        expected = run(getattr(test_db, method)(*args))
+        assert run(getattr(snapshot_db, method)(*args)) == expected
+
+    def test_built_in_place(self, snapshot_path):
+        assert snapshot_path.is_file()
+        assert not snapshot_path.with_name(snapshot_path.name + ".building").exists()
+
+    def test_migrate_keeps_data(self, tmp_path, snapshot_path):
+        path = tmp_path / "data.db"
+        path.write_bytes(snapshot_path.read_bytes())
+        run(prepare_once(Settings(sync=True, snapshot=str(path), migrate=True)))
+
+        db = DataBase(is_sync=True, read_only=True, snapshot_path=str(path))
+        assert len(run(db.get_years())) != 0
+        db.close()
+
+
+class TestFailureCases:
+
+    def test_write(self, snapshot_db):
+        with pytest.raises(OperationalError):
+            run(snapshot_db.reset())
+
+    def test_missing_snapshot(self, tmp_path):
+        with pytest.raises(ValueError):
+            DataBase(is_sync=True, read_only=True, snapshot_path=str(tmp_path / "missing.db"))
+
+    def test_failed_build(self, tmp_path):
+        path = tmp_path / "data.db"
+        with pytest.raises(Exception):
+            run(prepare_once(Settings(sync=True, snapshot=str(path), path=str(tmp_path / "missing.csv"))))
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,57 @@
+from asyncio import gather, run
+from threading import current_thread
+
+import pytest
+from sqlalchemy import Engine, event
+
+from ..DataBase import DataBase
+
+DATA_PATH = "app/tests/test_data.csv"
+THREAD_POOL_SIZE = 2
+YEARS = [2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021]
+
+
+@pytest.fixture
+def query_threads():
+    threads = []
+
+    def record_thread(*args):
+        threads.append(current_thread().name)
+
+    event.listen(Engine, "before_cursor_execute", record_thread)
+    yield threads
+    event.remove(Engine, "before_cursor_execute", record_thread)
+
+
+async def query_concurrently(thread_pool_size: int) -> list[dict]:
+    db = DataBase(is_sync=True, thread_pool_size=thread_pool_size)
+    try:
+        await db.reset()
+        await db.load_data(DATA_PATH)
+        return await gather(*(db.get_region_info(1, year) for year in YEARS))
+    finally:
+        db.close()
+
+
+class TestSuccessCases:
+
+    def test_worker_threads(self, query_threads):
+        results = run(query_concurrently(THREAD_POOL_SIZE))
+        assert all(result is not None for result in results)
+
+        # The last queries are the region info ones, the data load runs partly on the event loop
+        worker_threads = set(query_threads[-len(YEARS):])
+        assert all(name.startswith("sqlite") for name in worker_threads)
+        assert len(worker_threads) <= THREAD_POOL_SIZE
+
+    def test_inline_queries(self, query_threads):
+        results = run(query_concurrently(0))
+        assert set(query_threads) == {current_thread().name}
+        assert results == run(query_concurrently(THREAD_POOL_SIZE))
+
+
+class TestFailureCases:
+
+    def test_negative_thread_pool_size(self):
+        with pytest.raises(ValueError):
+            DataBase(is_sync=True, thread_pool_size=-1)
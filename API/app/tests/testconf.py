@@ -1,16 +1,21 @@
 from asyncio import run
 from enum import IntEnum
 
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
 
 from app.DataBase import DataBase
 from app.main import app, get_database
 
+DATA_PATH = "app/tests/test_data.csv"
+
 
 class StatusCode(IntEnum):
     Success = 200
+    Forbidden = 403
     NotFound = 404
+    Conflict = 409
     ValidationError = 422
 
 
@@ -19,7 +24,7 @@ class FakeDataBase:
 
         self.db = DataBase(is_sync=True)
         run(self.db.reset())
-        run(self.db.load_data("app/tests/test_data.csv"))
+        run(self.db.load_data(DATA_PATH))
 
 
 @pytest.fixture(scope="session")
@@ -41,3 +46,30 @@ def client(test_db):
     yield TestClient(app)
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def shared_database(client, test_db, tmp_path):
+    """Database file served by the app, along with a CSV file changing its data"""
+    path = tmp_path / "data.db"
+    db = DataBase(is_sync=True, snapshot_path=str(path))
+    run(db.reset())
+    run(db.load_data(DATA_PATH))
+
+    data = pd.read_csv(DATA_PATH)
+    data["ВРП"] *= 2
+    data.to_csv(tmp_path / "changed.csv", index=False)
+
+    app.state.cache.clear()
+    app.dependency_overrides[get_database] = lambda: db
+    yield path, str(tmp_path / "changed.csv")
+    app.dependency_overrides[get_database] = lambda: test_db
+    app.state.cache.clear()
+    db.close()
+
+
+def reload_externally(path, data_path: str):
+    """Load data like another process does, through a database instance of its own"""
+    db = DataBase(is_sync=True, snapshot_path=str(path))
+    run(db.load_data(data_path, upsert=True))
+    db.close()
@@ -0,0 +1,209 @@
+import json
+import platform
+from argparse import ArgumentParser
+from asyncio import gather, run
+from collections.abc import Callable
+from datetime import UTC, datetime
+from enum import StrEnum
+from itertools import count
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+from httpx import ASGITransport, AsyncClient
+
+from app.DataBase import BORDER_YEAR, ColumnName, DataBase
+from app.main import V1_PREFIX, app
+from app.MemoryDataBase import MemoryDataBase
+from app.ResponseCache import ResponseCache
+
+from .synthetic_data import write_dataset
+
+PERCENTILES = (50, 95, 99)
+
+
+class Backend(StrEnum):
+    SQLITE = "sqlite"
+    POSTGRES = "postgres"
+    MEMORY = "memory"
+
+
+parser = ArgumentParser("API endpoints load benchmark")
+parser.add_argument(
+    "--backend", type=Backend, choices=list(Backend), nargs="+", default=[Backend.SQLITE], dest="backends"
+)
+parser.add_argument("--path", nargs="?", help="Existing CSV file; a synthetic one is generated otherwise")
+parser.add_argument("--regions", type=int, default=2000)
+parser.add_argument("--districts", type=int, default=8)
+parser.add_argument("--years", type=int, default=13)
+parser.add_argument("--concurrency", type=int, default=16)
+parser.add_argument("--requests", type=int, default=500, help="Measured requests per endpoint")
+parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per endpoint")
+parser.add_argument("--cache-size", type=int, default=0, dest="cache_size",
+                    help="Response cache size; 0 (default) measures the backend on every request")
+parser.add_argument("--endpoint", action="append", dest="endpoints", help="Only run cases with this name")
+parser.add_argument("--output", nargs="?", help="JSON file the results are written to")
+
+
+def create_backend(backend: Backend) -> DataBase | MemoryDataBase:
+    if backend is Backend.MEMORY:
+        return MemoryDataBase()
+    return DataBase(is_sync=backend is Backend.SQLITE)
+
+
+def get_cases(region_ids: list[int], district_ids: list[int], years: list[int]) -> dict[str, Callable[[int], str]]:
+    """
+    URL builders for every benchmarked endpoint, the request number selects the area and year.
+    """
+    columns = "&".join(f"required_columns={column.value}" for column in ColumnName)
+    # Only investments are available starting from BORDER_YEAR
+    full_years = [year for year in years if year < BORDER_YEAR] or years
+
+    def region(number: int) -> int:
+        return region_ids[number % len(region_ids)]
+
+    def district(number: int) -> int:
+        return district_ids[number % len(district_ids)]
+
+    def year(number: int) -> int:
+        return years[number % len(years)]
+
+    def full_year(number: int) -> int:
+        return full_years[number % len(full_years)]
+
+    return {
+        "region-info": lambda n: f"/region-info/?id={region(n)}&year={year(n)}",
+        "batch-region-info": lambda n: (
+            f"/batch-region-info/?{"&".join(f"ids={region(n + i)}" for i in range(10))}&years={year(n)}"
+        ),
+        "district-info": lambda n: f"/district-info/?id={district(n)}&year={year(n)}&aggregation_type=sum",
+        "feature-info": lambda n: f"/feature-info/?feature=investments&year={year(n)}",
+        "feature-info-district": lambda n: (
+            f"/feature-info/?feature=investments&year={year(n)}&is_by_district=true&aggregation_type=avg"
+        ),
+        "feature-info-filter": lambda n: (
+            f"/feature-info/?feature=investments&year={year(n)}&use_filter=true"
+            "&min_filter_value=25000&max_filter_value=75000"
+        ),
+        "feature-summary": lambda n: f"/feature-summary/?feature=investments&year={year(n)}",
+        "statistics": lambda n: f"/statistics/?{columns}&year={full_year(n)}",
+        "statistics-district": lambda n: (
+            f"/statistics/?{columns}&year={full_year(n)}&is_by_district=true&aggregation_type=max"
+        ),
+        "download-statistics": lambda n: f"/download-statistics/?{columns}&year={full_year(n)}&file_extension=csv",
+        "bulk-download-statistics": lambda n: (
+            f"/bulk-download-statistics/?required_columns=investments&start_year={year(n)}"
+            f"&end_year={years[-1]}&file_extension=csv"
+        ),
+        "feature-graphs": lambda n: f"/feature-graphs/?aggregation_type={("avg", "sum", "min", "max")[n % 4]}",
+        "area-history": lambda n: f"/area-history/?id={region(n)}",
+        "area-history-district": lambda n: f"/area-history/?id={district(n)}&is_by_district=true&aggregation_type=sum",
+        "regions": lambda n: "/regions/",
+        "districts": lambda n: "/districts/",
+        "years": lambda n: "/years/",
+        "available-columns": lambda n: f"/available-columns/?year={year(n)}",
+    }
+
+
+async def measure(client: AsyncClient, build_url: Callable[[int], str], requests: int, warmup: int,
+                  concurrency: int) -> dict[str, float | int]:
+    """
+    Send `requests` requests from `concurrency` workers and summarize their latencies.
+    """
+    for number in range(warmup):
+        await client.get(V1_PREFIX + build_url(number))
+
+    numbers = count()
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while (number := next(numbers)) < requests:
+            start = perf_counter()
+            response = await client.get(V1_PREFIX + build_url(number))
+            latencies.append(perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = perf_counter()
+    await gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+
+    milliseconds = np.array(latencies) * 1000
+    result = {"requests": requests, "errors": errors}
+    for percentile, value in zip(PERCENTILES, np.percentile(milliseconds, PERCENTILES)):
+        result[f"p{percentile}_ms"] = round(float(value), 3)
+    result["mean_ms"] = round(float(milliseconds.mean()), 3)
+    result["throughput_rps"] = round(requests / elapsed, 1)
+    return result
+
+
+async def run_backend(backend: Backend, path: Path, args) -> list[dict]:
+    db = create_backend(backend)
+    try:
+        await db.reset()
+        await db.load_data(path)
+        app.state.db = db
+        app.state.cache = ResponseCache(max_size=args.cache_size)
+
+        region_ids = [area["id"] for area in await db.get_areas()]
+        district_ids = [area["id"] for area in await db.get_areas(are_districts=True)]
+        cases = get_cases(region_ids, district_ids, list(await db.get_years()))
+
+        results = []
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, build_url in cases.items():
+                if args.endpoints is not None and name not in args.endpoints:
+                    continue
+
+                result = await measure(client, build_url, args.requests, args.warmup, args.concurrency)
+                results.append({"backend": backend.value, "endpoint": name, **result})
+                print(
+                    f"{backend.value:>8} {name:<26} p50 {result["p50_ms"]:9.3f} ms  p95 {result["p95_ms"]:9.3f} ms  "
+                    f"p99 {result["p99_ms"]:9.3f} ms  {result["throughput_rps"]:9.1f} req/s"
+                    + (f"  errors: {result["errors"]}" if result["errors"] != 0 else "")
+                )
+        return results
+    finally:
+        await db.dispose()
+        db.close()
+
+
+async def main():
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as temp_dir:
+        if args.path is None:
+            path = Path(temp_dir) / "data.csv"
+            rows = write_dataset(path, districts=args.districts, regions=args.regions, years=args.years)
+        else:
+            path = Path(args.path)
+            with open(path, encoding="utf-8") as file:
+                rows = sum(1 for _ in file) - 1
+
+        print(f"Rows: {rows}, concurrency: {args.concurrency}, requests per endpoint: {args.requests}")
+        results = []
+        for backend in args.backends:
+            results += await run_backend(backend, path, args)
+
+    if args.output is not None:
+        report = {
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "rows": rows,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "cache_size": args.cache_size,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    run(main())
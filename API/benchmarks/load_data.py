@@ -0,0 +1,62 @@
+from argparse import ArgumentParser
+from asyncio import run
+from pathlib import Path
+from resource import RUSAGE_SELF, getrusage
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from app.DataBase import DataBase, LoadMode
+
+from .synthetic_data import write_dataset
+
+parser = ArgumentParser("DataBase.load_data benchmark")
+parser.add_argument("--postgres", action="store_true")
+parser.add_argument("--path", nargs="?", help="Existing CSV file; a synthetic one is generated otherwise")
+parser.add_argument("--regions", type=int, default=2000)
+parser.add_argument("--districts", type=int, default=8)
+parser.add_argument("--years", type=int, default=13)
+parser.add_argument("--repeat", type=int, default=3)
+parser.add_argument("--chunk-size", type=int, default=None, dest="chunk_size")
+parser.add_argument("--mode", type=LoadMode, choices=list(LoadMode), default=None)
+
+
+async def measure(db: DataBase, path: Path, mode: LoadMode, repeat: int, chunk_size: int | None) -> float:
+    best = None
+    for _ in range(repeat):
+        await db.reset()
+
+        start = perf_counter()
+        await db.load_data(path, mode=mode, chunk_size=chunk_size)
+        elapsed = perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def main():
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as temp_dir:
+        if args.path is None:
+            path = Path(temp_dir) / "data.csv"
+            rows = write_dataset(path, districts=args.districts, regions=args.regions, years=args.years)
+        else:
+            path = Path(args.path)
+            with open(path, encoding="utf-8") as file:
+                rows = sum(1 for _ in file) - 1
+
+        db = DataBase(is_sync=not args.postgres)
+        try:
+            print(f"Backend: {"postgres" if args.postgres else "sqlite"}, rows: {rows}, chunk size: {args.chunk_size}")
+            for mode in LoadMode if args.mode is None else [args.mode]:
+                elapsed = await measure(db, path, mode, args.repeat, args.chunk_size)
+                print(f"{mode.value:>6}: {elapsed:8.3f} s {rows / elapsed:12.0f} rows/s")
+            # ru_maxrss is in kilobytes on Linux; run modes separately (--mode) to compare their peaks
+            print(f"Peak RSS: {getrusage(RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+        finally:
+            await db.dispose()
+            db.close()
+
+
+if __name__ == "__main__":
+    run(main())
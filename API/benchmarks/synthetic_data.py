@@ -0,0 +1,61 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.DataBase import BORDER_YEAR, CSV_COLUMNS, MIN_YEAR, ColumnName
+
+parser = ArgumentParser("Synthetic dataset generator")
+parser.add_argument("--output", required=True)
+parser.add_argument("--districts", type=int, default=8)
+parser.add_argument("--regions", type=int, default=85)
+parser.add_argument("--years", type=int, default=13)
+parser.add_argument("--seed", type=int, default=0)
+
+
+def generate_dataset(districts: int=8, regions: int=85, years: int=13, seed: int=0) -> pd.DataFrame:
+    """
+    Generate a dataset in the format accepted by DataBase.load_data.
+
+    Regions are spread evenly across districts; every region has one row per year.
+    Starting from BORDER_YEAR only the investments column is filled, like in the real data.
+
+    Args:
+        districts (int): Number of districts
+        regions (int): Number of regions
+        years (int): Number of years starting from MIN_YEAR
+        seed (int): Random generator seed
+    """
+    rng = np.random.default_rng(seed)
+    row_count = regions * years
+
+    region_numbers = np.repeat(np.arange(regions), years)
+    year_values = np.tile(np.arange(MIN_YEAR, MIN_YEAR + years), regions)
+
+    frame = pd.DataFrame({
+        "district_name": [f"District {number % districts + 1}" for number in region_numbers],
+        "region_name": [f"Region {number + 1}" for number in region_numbers],
+        "year": year_values,
+    })
+    for column in ColumnName:
+        values = rng.uniform(1, 100000, row_count).round(2)
+        if column is ColumnName.POPULATION:
+            values = values.astype(np.int64).astype(object)
+        if column is not ColumnName.INVESTMENTS:
+            values = np.where(year_values < BORDER_YEAR, values, None)
+        frame[column.value] = values
+
+    return frame.rename(columns={value: key for key, value in CSV_COLUMNS.items()})
+
+
+def write_dataset(path: str | Path, **kwargs) -> int:
+    frame = generate_dataset(**kwargs)
+    frame.to_csv(path, index=False)
+    return len(frame)
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    rows = write_dataset(args.output, districts=args.districts, regions=args.regions, years=args.years, seed=args.seed)
+    print(f"{rows} rows written to {args.output}")